@@ -0,0 +1,132 @@
+# type: ignore
+"""Benchmark: what an uploaded image costs to send, before and after image_pipeline.py.
+
+Makes a phone-sized JPEG photo and a PNG screenshot with transparency, then
+compares, per upload:
+
+- as uploaded: the original file base64-encoded into the request
+- full decode: decode at full size, downscale, re-encode
+- pipeline: prepare_upload() (reduced-size JPEG decode), then a cache hit
+
+and the tool icons re-opened on every rerun vs circular_icon(). Streamlit
+and a model aren't needed; the numbers are for the code each rerun runs.
+
+    uv run bench_images.py
+    uv run bench_images.py --max-edge 768 --repeat 20
+"""
+import argparse
+import base64
+import io
+import os
+import tempfile
+import time
+
+from PIL import Image, ImageDraw, ImageFilter, ImageOps
+
+import image_pipeline
+
+
+def photo(size) -> bytes:
+    """Blurred noise: compresses about like a real photo, unlike a flat fill."""
+    bands = [Image.effect_noise(size, 60).filter(ImageFilter.GaussianBlur(2)) for _ in range(3)]
+    out = io.BytesIO()
+    Image.merge("RGB", bands).save(out, "JPEG", quality=92)
+    return out.getvalue()
+
+
+def screenshot(size) -> bytes:
+    image = Image.new("RGBA", size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(image)
+    for i in range(0, size[1], 24):
+        draw.rectangle((40, i, size[0] - 40, i + 16), fill=(30 + i % 200, 90, 160, 255))
+        draw.text((60, i + 2), f"row {i} " * 20, fill=(255, 255, 255, 255))
+    out = io.BytesIO()
+    image.save(out, "PNG")
+    return out.getvalue()
+
+
+def full_decode(data: bytes, max_edge: int, quality: int) -> tuple[bytes, tuple]:
+    image = Image.open(io.BytesIO(data))
+    decoded = image.size
+    image = ImageOps.exif_transpose(image)
+    image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS)
+    out = io.BytesIO()
+    if image.mode == "RGBA":
+        image.save(out, "PNG")
+    else:
+        image.convert("RGB").save(out, "JPEG", quality=quality, optimize=True, progressive=True)
+    return out.getvalue(), decoded
+
+
+def timed_ms(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--max-edge", type=int, default=image_pipeline.MAX_EDGE)
+    parser.add_argument("--quality", type=int, default=image_pipeline.QUALITY)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    uploads = {"photo 4032x3024 JPEG": photo((4032, 3024)), "screenshot 2560x1440 PNG": screenshot((2560, 1440))}
+    print(f"max edge {args.max_edge}, JPEG quality {args.quality}, mean of {args.repeat}")
+    print(f"{'':<26} {'':<18} {'sent KB':>9} {'ms':>8} {'decoded':>11}")
+    for name, data in uploads.items():
+        as_is_ms, as_is = timed_ms(lambda: base64.b64encode(data), args.repeat)
+        full_ms, (full, decoded) = timed_ms(lambda: full_decode(data, args.max_edge, args.quality), args.repeat)
+
+        def fresh():
+            image_pipeline.cache = image_pipeline.ImageCache()
+            return image_pipeline.prepare_upload(io.BytesIO(data), args.max_edge, args.quality)
+
+        fresh_ms, prepared = timed_ms(fresh, args.repeat)
+        draft = Image.open(io.BytesIO(data))
+        draft.draft("RGB", (args.max_edge, args.max_edge))
+        upload = io.BytesIO(data)
+        hit_ms, _ = timed_ms(lambda: image_pipeline.prepare_upload(upload, args.max_edge, args.quality), args.repeat)
+
+        sent = len(prepared.data_url)
+        rows = [
+            ("as uploaded", len(as_is), as_is_ms, "-"),
+            ("full decode", len(base64.b64encode(full)), full_ms, "{}x{}".format(*decoded)),
+            ("pipeline", sent, fresh_ms, "{}x{}".format(*draft.size)),
+            ("pipeline, cached", sent, hit_ms, "-"),
+        ]
+        for i, (mode, size, ms, dec) in enumerate(rows):
+            print(f"{name if i == 0 else '':<26} {mode:<18} {size / 1024:>9.1f} {ms:>8.2f} {dec:>11}")
+        pixels = Image.open(io.BytesIO(data)).size
+        print(f"{'':<26} sent {prepared.width}x{prepared.height} {prepared.mime}: "
+              f"{sent / len(as_is):.2f}x the bytes and "
+              f"{prepared.width * prepared.height / (pixels[0] * pixels[1]):.2f}x the pixels of the upload")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i in range(2):
+            path = os.path.join(tmp, f"icon{i}.png")
+            Image.open(io.BytesIO(photo((512, 512)))).save(path)
+            paths.append(path)
+
+        def reopen():
+            for path in paths:
+                img = Image.open(path).convert("RGBA").resize((60, 60))
+                mask = Image.new("L", (60, 60), 0)
+                ImageDraw.Draw(mask).ellipse((0, 0, 60, 60), fill=255)
+                img.putalpha(mask)
+
+        def cached():
+            for path in paths:
+                image_pipeline.circular_icon(path)
+
+        cached()
+        reopen_ms, _ = timed_ms(reopen, args.repeat * 10)
+        cached_ms, _ = timed_ms(cached, args.repeat * 10)
+    print(f"icons per rerun (ms)      re-opened {reopen_ms:.3f}   content-hashed cache {cached_ms:.3f}")
+    print("cache:", image_pipeline.cache.stats())
+
+
+if __name__ == "__main__":
+    main()
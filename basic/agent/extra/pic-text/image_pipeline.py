@@ -0,0 +1,213 @@
+# type: ignore
+"""Image preprocessing for the ImageClassifier tool, with a content-hashed cache.
+
+prepare_upload() turns an uploaded photo into what's sent to the model: at
+most IMAGE_MAX_EDGE pixels on the long edge, EXIF rotation applied,
+re-encoded as JPEG (or PNG when the image has transparency). A file that
+already fits and wouldn't shrink by re-encoding is sent as it is. Decoding
+reads straight from the upload's buffer, and for JPEGs asks the decoder for
+a reduced-size image (Image.draft), so a full-size bitmap is never built.
+
+Icons, thumbnails and prepared uploads are cached by the SHA-256 of their
+bytes plus the processing settings, in one LRU capped at IMAGE_CACHE_MB.
+The same picture uploaded again, or by another session, is processed once.
+
+    IMAGE_MAX_EDGE   long edge sent to the model, in pixels   (1024)
+    IMAGE_QUALITY    JPEG quality                              (85)
+    IMAGE_CACHE_MB   memory for cached images                  (64)
+"""
+import base64
+import hashlib
+import io
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from PIL import Image, ImageDraw, ImageOps
+
+MAX_EDGE = int(os.getenv("IMAGE_MAX_EDGE", "1024"))
+QUALITY = int(os.getenv("IMAGE_QUALITY", "85"))
+CACHE_BYTES = int(float(os.getenv("IMAGE_CACHE_MB", "64")) * 1024 * 1024)
+ORIENTATION = 0x0112  # EXIF tag
+MIME = {"JPEG": "image/jpeg", "PNG": "image/png"}
+
+
+class ImageCache:
+    """LRU bounded by the total size of its values, shared by all sessions."""
+
+    def __init__(self, max_bytes=CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, tuple] = OrderedDict()  # key -> (value, size)
+        self._size = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, size: int):
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= old[1]
+            self._entries[key] = (value, size)
+            self._size += size
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._size -= evicted
+
+    def stats(self) -> dict:
+        return {"entries": len(self._entries), "bytes": self._size, "hits": self.hits, "misses": self.misses}
+
+
+cache = ImageCache()
+
+
+def content_hash(source) -> str:
+    """SHA-256 of a path, bytes or file object, without copying an in-memory upload."""
+    digest = hashlib.sha256()
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        digest.update(source)
+    elif isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    elif hasattr(source, "getbuffer"):
+        # BytesIO, and Streamlit's UploadedFile: hash its buffer in place
+        with source.getbuffer() as view:
+            digest.update(view)
+    else:
+        position = source.tell()
+        for chunk in iter(lambda: source.read(1 << 20), b""):
+            digest.update(chunk)
+        source.seek(position)
+    return digest.hexdigest()
+
+
+def _open(source, max_edge: int) -> tuple[Image.Image, bool]:
+    """The image scaled to fit max_edge, and whether it differs from the file's pixels."""
+    if isinstance(source, (bytes, bytearray)):
+        source = io.BytesIO(source)
+    elif hasattr(source, "seek"):
+        source.seek(0)
+    image = Image.open(source)
+    changed = max(image.size) > max_edge
+    # JPEG only: decode at 1/2, 1/4 or 1/8 scale while staying >= max_edge
+    image.draft("RGB", (max_edge, max_edge))
+    if image.getexif().get(ORIENTATION, 1) != 1:
+        image = ImageOps.exif_transpose(image)
+        changed = True
+    image.thumbnail((max_edge, max_edge), Image.Resampling.LANCZOS, reducing_gap=2.0)
+    return image, changed
+
+
+@dataclass(frozen=True)
+class PreparedImage:
+    data: bytes
+    mime: str
+    width: int
+    height: int
+    original_bytes: int
+    seconds: float
+
+    @property
+    def data_url(self) -> str:
+        return f"data:{self.mime};base64,{base64.b64encode(self.data).decode()}"
+
+
+def _size_of(source) -> int:
+    if isinstance(source, (bytes, bytearray)):
+        return len(source)
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    if hasattr(source, "getbuffer"):
+        return source.getbuffer().nbytes
+    position = source.tell()
+    size = source.seek(0, io.SEEK_END)
+    source.seek(position)
+    return size
+
+
+def _read(source) -> bytes:
+    if isinstance(source, (bytes, bytearray)):
+        return bytes(source)
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return f.read()
+    source.seek(0)
+    return source.read()
+
+
+def prepare_upload(source, max_edge=MAX_EDGE, quality=QUALITY) -> PreparedImage:
+    """Downscale and re-encode an uploaded image for the model (cached by content)."""
+    key = ("upload", content_hash(source), max_edge, quality)
+    prepared = cache.get(key)
+    if prepared is not None:
+        return prepared
+    start = time.perf_counter()
+    image, changed = _open(source, max_edge)
+    out = io.BytesIO()
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        image.save(out, "PNG")
+        mime = "image/png"
+    else:
+        image.convert("RGB").save(out, "JPEG", quality=quality, optimize=True, progressive=True)
+        mime = "image/jpeg"
+    data, original_bytes = out.getvalue(), _size_of(source)
+    if not changed and original_bytes <= len(data) and image.format in MIME:
+        # already small enough and no bigger than a re-encode: send the file as it is
+        data, mime = _read(source), MIME[image.format]
+    prepared = PreparedImage(data, mime, image.width, image.height, original_bytes, time.perf_counter() - start)
+    cache.put(key, prepared, len(prepared.data))
+    return prepared
+
+
+def thumbnail(source, max_edge=200) -> Image.Image:
+    """A small preview for st.image instead of sending the full upload to the browser."""
+    key = ("thumbnail", content_hash(source), max_edge)
+    image = cache.get(key)
+    if image is None:
+        image, _ = _open(source, max_edge)
+        image.load()
+        cache.put(key, image, image.width * image.height * len(image.getbands()))
+    return image
+
+
+def circular_icon(path, size=(60, 60)) -> Image.Image | None:
+    """A round RGBA icon, or None if the file is missing or unreadable."""
+    try:
+        key = ("icon", content_hash(path), size)
+    except OSError:
+        return None
+    icon = cache.get(key)
+    if icon is None:
+        try:
+            icon = Image.open(path).convert("RGBA").resize(size)
+        except OSError:
+            return None
+        mask = Image.new("L", size, 0)
+        ImageDraw.Draw(mask).ellipse((0, 0) + size, fill=255)
+        icon.putalpha(mask)
+        cache.put(key, icon, size[0] * size[1] * 4)
+    return icon
+
+
+def image_input(prepared: PreparedImage, prompt: str) -> list:
+    """Runner input: one user message with the prompt and the image."""
+    return [{
+        "role": "user",
+        "content": [
+            {"type": "input_text", "text": prompt},
+            {"type": "input_image", "image_url": prepared.data_url, "detail": "auto"},
+        ],
+    }]
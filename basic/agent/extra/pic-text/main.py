@@ -2,11 +2,11 @@
 # type: ignore
 import streamlit as st
 from dotenv import load_dotenv
-from agents import OpenAIChatCompletionsModel, Agent as BaseAgent, Runner, AsyncOpenAI, set_tracing_disabled
+from agents import set_tracing_disabled
+from agent_runtime import AgentRuntime
 from dataclasses import dataclass
 from typing import List
-import os
-from PIL import Image, ImageDraw
+from image_pipeline import circular_icon, image_input, prepare_upload, thumbnail
 
 # --- Models ---
 @dataclass
@@ -26,11 +26,13 @@ class Agent:
 load_dotenv()
 set_tracing_disabled(disabled=True)
 
-API_KEY = os.getenv("GEMINI_API_KEY")
-client = AsyncOpenAI(api_key=API_KEY, base_url='https://generativelanguage.googleapis.com/v1beta/openai/')
+# --- Client, Model, Agents ---
+# Built once per server process and shared by every session and rerun, see agent_runtime.py
+@st.cache_resource
+def get_runtime():
+    return AgentRuntime(model_name="gemini-2.0-flash")
 
-# --- Model ---
-model = OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=client)
+runtime = get_runtime()
 
 # --- Tools ---
 tools = [
@@ -47,18 +49,6 @@ agent_config = Agent(
     active=True
 )
 
-# --- Utility for Circular Icon ---
-def load_circular_icon(img_path, size=(60, 60)):
-    try:
-        img = Image.open(img_path).convert("RGBA").resize(size)
-        mask = Image.new("L", size, 0)
-        draw = ImageDraw.Draw(mask)
-        draw.ellipse((0, 0) + size, fill=255)
-        img.putalpha(mask)
-        return img
-    except:
-        return None
-
 # --- UI ---
 st.set_page_config(layout="centered", page_title="AI Agent Dashboard")
 st.title("🤖 AI Agent Dashboard")
@@ -73,7 +63,8 @@ st.subheader("🧰 Tools Equipped")
 for tool in agent_config.tools:
     cols = st.columns([1, 6])
     with cols[0]:
-        img = load_circular_icon(f"icons/{tool.name.lower()}.png")
+        # Cached by file content in image_pipeline, so reruns don't re-open the icons
+        img = circular_icon(f"icons/{tool.name.lower()}.png")
         if img:
             st.image(img)
         else:
@@ -85,28 +76,44 @@ st.divider()
 st.subheader("🧪 Try a Tool")
 
 tool_choice = st.selectbox("Choose Tool", [t.name for t in tools])
+agent = runtime.agent(agent_config.name, agent_config.instructions)
+
+def show_job(key, title):
+    """Stream a run kept in session_state; a rerun mid-run picks it up again."""
+    job = st.session_state.get(key)
+    if job is None:
+        return
+    if not job.done:
+        st.success(title)
+        st.write_stream(job.stream())
+    elif job.error is None:
+        st.success(title)
+        st.write(job.final_output)
+    if job.error is not None:
+        st.error(f"❌ Error: {job.error}")
 
 if tool_choice == "Summarizer":
     text = st.text_area("📄 Enter text to summarize")
     if st.button("Run Summarizer") and text:
-        with st.spinner("Summarizing..."):
-            agent = BaseAgent(name=agent_config.name, instructions=agent_config.instructions, model=model)
-            try:
-                result = Runner.run_sync(agent, input=text)
-                st.success("🧠 Summary:")
-                st.write(result.final_output)
-            except Exception as e:
-                st.error(f"❌ Error: {e}")
+        # Runs on the shared background loop; this session's script thread isn't held by it
+        st.session_state.summary_job = runtime.start(agent, text)
+    show_job("summary_job", "🧠 Summary:")
 
 elif tool_choice == "ImageClassifier":
     uploaded_image = st.file_uploader("📷 Upload Image", type=["png", "jpg", "jpeg"])
     if st.button("Run Image Classifier") and uploaded_image:
-        st.image(uploaded_image, width=200, caption="Uploaded Image")
-        with st.spinner("Classifying..."):
-            agent = BaseAgent(name=agent_config.name, instructions=agent_config.instructions, model=model)
-            try:
-                result = Runner.run_sync(agent, input="Classify this image")
-                st.success("🔍 Classification Result:")
-                st.write(result.final_output)
-            except Exception as e:
-                st.error(f"❌ Error: {e}")
+        try:
+            # Downscaled and re-encoded before sending, see image_pipeline.py
+            prepared = prepare_upload(uploaded_image)
+        except OSError as e:
+            st.error(f"❌ Couldn't read the image: {e}")
+        else:
+            st.session_state.classify_job = runtime.start(agent, image_input(prepared, "Classify this image"))
+            st.caption(f"Sent {prepared.width}×{prepared.height}, {len(prepared.data) // 1024} KB "
+                       f"(uploaded {prepared.original_bytes // 1024} KB)")
+    if uploaded_image:
+        try:
+            st.image(thumbnail(uploaded_image), caption="Uploaded Image")
+        except OSError:
+            st.warning("Couldn't preview this image.")
+    show_job("classify_job", "🔍 Classification Result:")
@@ -0,0 +1,121 @@
+# type: ignore
+"""Agent client, model and runs shared by every Streamlit session.
+
+Streamlit re-executes main.py on every widget interaction, so anything built
+at module level is rebuilt each time. main.py keeps one AgentRuntime per
+server process with st.cache_resource instead. It owns:
+
+- one AsyncOpenAI client (one connection pool) and one chat-completions model
+- agents, built once per (name, instructions)
+- an event loop on a background thread that every session's runs share
+
+start() hands a run to that loop and returns a Job at once, so the script
+thread isn't held for the model call. The page keeps the Job in
+st.session_state and streams its text as it arrives, and a rerun in the
+middle picks the same Job up again.
+"""
+import asyncio
+import os
+import threading
+import time
+
+import httpx
+from agents import Agent, OpenAIChatCompletionsModel, Runner
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from openai.types.responses import ResponseTextDeltaEvent
+
+BASE_URL = os.getenv("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com/v1beta/openai/")
+
+
+class Job:
+    """One agent run. Written by the runtime's loop, read from script threads."""
+
+    def __init__(self):
+        self.parts: list[str] = []
+        self.final_output = None
+        self.error: Exception | None = None
+        self.done = False
+        self.started = time.perf_counter()
+        self.elapsed = None
+        self.future = None  # concurrent.futures.Future of the run on the runtime's loop
+
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+
+    def stream(self, poll=0.05):
+        """Yield text as it arrives (for st.write_stream), then return when the run ends."""
+        sent = 0
+        while True:
+            count = len(self.parts)
+            if count > sent:
+                yield "".join(self.parts[sent:count])
+                sent = count
+            elif self.done:
+                return
+            else:
+                time.sleep(poll)
+
+
+class AgentRuntime:
+    def __init__(self, model_name="gemini-2.0-flash", api_key=None, base_url=BASE_URL):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="agent-runtime", daemon=True)
+        self._thread.start()
+        self.client = AsyncOpenAI(
+            api_key=api_key or os.getenv("GEMINI_API_KEY"),
+            base_url=base_url,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+            ),
+        )
+        self.model = OpenAIChatCompletionsModel(model=model_name, openai_client=self.client)
+        self._agents: dict[tuple, Agent] = {}
+        self._lock = threading.Lock()
+        self.runs = 0
+
+    def agent(self, name: str, instructions: str) -> Agent:
+        key = (name, instructions)
+        with self._lock:
+            agent = self._agents.get(key)
+            if agent is None:
+                agent = self._agents[key] = Agent(name=name, instructions=instructions, model=self.model)
+        return agent
+
+    def start(self, agent: Agent, input, stream=True) -> Job:
+        """Run `agent` on the shared loop; returns without waiting."""
+        job = Job()
+        self.runs += 1
+        job.future = asyncio.run_coroutine_threadsafe(self._run(job, agent, input, stream), self.loop)
+        return job
+
+    def run(self, agent: Agent, input, timeout=None):
+        """Blocking convenience for scripts: the final output, or the run's exception."""
+        job = self.start(agent, input, stream=False)
+        job.future.result(timeout=timeout)
+        if job.error is not None:
+            raise job.error
+        return job.final_output
+
+    async def _run(self, job: Job, agent: Agent, input, stream: bool):
+        try:
+            if stream:
+                result = Runner.run_streamed(agent, input=input)
+                async for event in result.stream_events():
+                    if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                        job.parts.append(event.data.delta)
+            else:
+                result = await Runner.run(agent, input=input)
+            job.final_output = result.final_output
+            if not job.parts:
+                job.parts.append(str(result.final_output))
+        except Exception as e:
+            job.error = e
+        finally:
+            job.elapsed = time.perf_counter() - job.started
+            job.done = True
+
+    def close(self):
+        asyncio.run_coroutine_threadsafe(self.client.close(), self.loop).result(timeout=5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
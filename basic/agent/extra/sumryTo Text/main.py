@@ -2,10 +2,11 @@
 # type: ignore
 import streamlit as st
 from dotenv import load_dotenv
-from agents import OpenAIChatCompletionsModel, Agent as BaseAgent, Runner, AsyncOpenAI, set_tracing_disabled
+from agents import set_tracing_disabled
+from agent_runtime import AgentRuntime
+from summarizer import Summarizer, count_tokens
 from dataclasses import dataclass
 from typing import List
-import os
 
 # --- Basic Models ---
 @dataclass
@@ -25,11 +26,19 @@ class Agent:
 load_dotenv()
 set_tracing_disabled(disabled=True)
 
-API_KEY = os.getenv('GEMINI_API_KEY')
-client = AsyncOpenAI(api_key=API_KEY, base_url='https://generativelanguage.googleapis.com/v1beta/openai/')
+# --- Client, Language Model, Agents ---
+# Built once per server process and shared by every session and rerun, see agent_runtime.py
+@st.cache_resource
+def get_runtime():
+    return AgentRuntime(model_name='gemini-2.0-flash')
 
-# --- Language Model ---
-model = OpenAIChatCompletionsModel(model='gemini-2.0-flash', openai_client=client)
+@st.cache_resource
+def get_summarizer():
+    # Long texts are summarized in chunks, concurrently, see summarizer.py
+    return Summarizer(get_runtime())
+
+runtime = get_runtime()
+summarizer = get_summarizer()
 
 # --- Tools ---
 tool1 = Tool("ImageClassifier", "Classifies objects in images")
@@ -60,16 +69,21 @@ st.divider()
 user_input = st.text_input("🗨️ Ask the Agent Something")
 
 if user_input and agent_config.active:
-    with st.spinner("⏳ Thinking..."):
-        try:
-            # Your custom agent logic
-            agent = BaseAgent(
-                name=agent_config.name,
-                instructions=agent_config.instructions,
-                model=model
-            )
-            result = Runner.run_sync(agent, input=user_input)
-            st.success("✅ Response:")
-            st.write(result.final_output)
-        except Exception as e:
-            st.error(f"❌ Error: {str(e)}")
+    # Start a run only for a new question; other reruns show the one in progress
+    if st.session_state.get("job_input") != user_input:
+        if count_tokens(user_input) > summarizer.chunk_tokens:
+            # Too long for one call: summarize it part by part instead
+            st.session_state.job = summarizer.start(user_input)
+        else:
+            agent = runtime.agent(agent_config.name, agent_config.instructions)
+            st.session_state.job = runtime.start(agent, user_input)
+        st.session_state.job_input = user_input
+    job = st.session_state.job
+    if not job.done:
+        st.success("✅ Response:")
+        st.write_stream(job.stream())
+    elif job.error is None:
+        st.success("✅ Response:")
+        st.write(job.final_output)
+    if job.error is not None:
+        st.error(f"❌ Error: {str(job.error)}")
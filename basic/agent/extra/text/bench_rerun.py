@@ -0,0 +1,136 @@
+# type: ignore
+"""Benchmark: what a Streamlit rerun costs before and after agent_runtime.py.
+
+Before, every rerun built a new AsyncOpenAI client, chat-completions model
+and Agent, and a run held the script thread until the model answered.
+After, reruns look up the cached runtime, and runs go to its shared loop.
+Model calls go to ../../../../mock-server (started here with --latency), so
+no API key or network is needed. Streamlit itself isn't needed either; the
+numbers are for the code each rerun executes.
+
+    uv run bench_rerun.py
+    uv run bench_rerun.py --latency fixed:800 --sessions 50
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+from agents import Agent, OpenAIChatCompletionsModel, Runner, set_tracing_disabled
+from openai import AsyncOpenAI
+
+from agent_runtime import AgentRuntime
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+MOCK_SERVER = os.path.join(HERE, "..", "..", "..", "..", "mock-server", "mock_server.py")
+INSTRUCTIONS = "Use ImageClassifier for visual inputs and Summarizer for text."
+
+
+def build_per_rerun(base_url):
+    client = AsyncOpenAI(api_key="mock", base_url=base_url)
+    model = OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=client)
+    return Agent(name="SmartBot", instructions=INSTRUCTIONS, model=model)
+
+
+def timed_us(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1e6
+
+
+def sessions_before(base_url, count) -> tuple[float, list]:
+    """Each session's script thread builds its own client and blocks on its own loop."""
+    held = []
+
+    def session():
+        start = time.perf_counter()
+        agent = build_per_rerun(base_url)
+        asyncio.run(Runner.run(agent, input="Summarize: the quick brown fox."))
+        held.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=session) for _ in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start, held
+
+
+def sessions_after(runtime, count) -> tuple[float, list]:
+    """Each session hands its run to the shared loop and is free again at once."""
+    held, jobs = [], []
+    lock = threading.Lock()
+
+    def session():
+        start = time.perf_counter()
+        job = runtime.start(runtime.agent("SmartBot", INSTRUCTIONS), "Summarize: the quick brown fox.")
+        held.append(time.perf_counter() - start)
+        with lock:
+            jobs.append(job)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=session) for _ in range(count)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    for job in jobs:
+        job.future.result()
+    errors = sum(job.error is not None for job in jobs)
+    if errors:
+        raise RuntimeError(f"{errors} runs failed, e.g. {next(j.error for j in jobs if j.error)}")
+    return time.perf_counter() - start, held
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--latency", default="fixed:300", help="mock model latency")
+    parser.add_argument("--sessions", type=int, default=20, help="sessions running an agent at once")
+    parser.add_argument("--reruns", type=int, default=200)
+    args = parser.parse_args()
+    set_tracing_disabled(True)
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    mock = subprocess.Popen([sys.executable, MOCK_SERVER, "--port", str(port), "--latency", args.latency],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}/v1/"
+    try:
+        deadline = time.time() + 10
+        while time.time() < deadline:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+                break
+            except OSError:
+                time.sleep(0.05)
+
+        runtime = AgentRuntime(api_key="mock", base_url=base_url)
+        build_before = timed_us(lambda: build_per_rerun(base_url), args.reruns)
+        build_after = timed_us(lambda: runtime.agent("SmartBot", INSTRUCTIONS), args.reruns)
+
+        runtime.run(runtime.agent("SmartBot", INSTRUCTIONS), "warm up")
+        wall_before, held_before = sessions_before(base_url, args.sessions)
+        wall_after, held_after = sessions_after(runtime, args.sessions)
+        runtime.close()
+    finally:
+        mock.terminate()
+        mock.wait()
+
+    print(f"mock latency {args.latency}, {args.sessions} concurrent sessions")
+    print(f"{'':<34} {'before':>10} {'after':>10}")
+    print(f"{'client+model+agent per rerun (us)':<34} {build_before:>10.1f} {build_after:>10.1f}")
+    print(f"{'script thread held per run (ms)':<34} {statistics.fmean(held_before) * 1000:>10.1f}"
+          f" {statistics.fmean(held_after) * 1000:>10.3f}")
+    print(f"{'all sessions answered (ms)':<34} {wall_before * 1000:>10.1f} {wall_after * 1000:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
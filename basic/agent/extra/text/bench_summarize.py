@@ -0,0 +1,130 @@
+# type: ignore
+"""Benchmark: summarizing a long document in one call vs summarizer.py's map-reduce.
+
+Generates --pages pages of text (~750 tokens a page) and summarizes it
+against ../../../../mock-server, started here with a time to first token,
+a generation rate, a prompt processing rate (so a long prompt costs what
+it would on a real model) and a context limit. No API key or network is
+needed. Reports wall time, time until the first text reached the page, and
+model calls, for one call with the whole document and for map-reduce at
+several concurrency levels.
+
+    uv run bench_summarize.py
+    uv run bench_summarize.py --pages 300 --context-tokens 128000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+from agents import set_tracing_disabled
+
+from agent_runtime import AgentRuntime
+from summarizer import Summarizer, count_tokens, split_text
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+MOCK_SERVER = os.path.join(HERE, "..", "..", "..", "..", "mock-server", "mock_server.py")
+WORDS = ("revenue", "quarter", "board", "approved", "plan", "team", "market", "growth", "risk", "supplier",
+         "contract", "review", "target", "budget", "customer", "launch", "delay", "policy", "report", "region")
+
+
+def document(pages: int) -> str:
+    rng = random.Random(7)
+    out = []
+    for page in range(1, pages + 1):
+        for paragraph in range(5):
+            sentences = (" ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 20))).capitalize()
+                         + f" in {1990 + page % 30}." for _ in range(6))
+            out.append(f"[p{page}.{paragraph}] " + " ".join(sentences))
+    return "\n\n".join(out)
+
+
+def mock_stats(base_url) -> dict:
+    with urllib.request.urlopen(base_url + "mock/stats") as response:
+        return json.load(response)
+
+
+async def measure(run) -> tuple[float, float | None, str, str | None]:
+    """(wall s, first summary text s, output, error) for run(emit)."""
+    start = time.perf_counter()
+    first = None
+
+    def emit(text):
+        nonlocal first
+        if first is None and text.strip() and not text.startswith("_Summarizing"):
+            first = time.perf_counter() - start
+
+    try:
+        output, error = await run(emit), None
+    except Exception as e:
+        output, error = "", f"{type(e).__name__}: {str(e)[:60]}"
+    return time.perf_counter() - start, first, output, error
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--latency", default="fixed:300", help="mock time to first token")
+    parser.add_argument("--tokens-per-s", type=float, default=150, help="mock generation rate")
+    parser.add_argument("--prefill-tokens-per-s", type=float, default=8000, help="mock prompt processing rate")
+    parser.add_argument("--context-tokens", type=int, default=128000)
+    parser.add_argument("--reply-tokens", type=int, default=120, help="length of each mock summary")
+    parser.add_argument("--concurrency", default="1,4,8,16")
+    args = parser.parse_args()
+    set_tracing_disabled(True)
+
+    text = document(args.pages)
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    mock = subprocess.Popen([sys.executable, MOCK_SERVER, "--port", str(port), "--latency", args.latency,
+                             "--tokens-per-s", str(args.tokens_per_s),
+                             "--prefill-tokens-per-s", str(args.prefill_tokens_per_s),
+                             "--context-tokens", str(args.context_tokens), "--reply-tokens", str(args.reply_tokens)],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}/v1/"
+    rows = []
+    try:
+        deadline = time.time() + 10
+        while time.time() < deadline:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+                break
+            except OSError:
+                time.sleep(0.05)
+
+        runtime = AgentRuntime(api_key="mock", base_url=base_url)
+
+        def run_case(name, summarizer, whole):
+            before = mock_stats(base_url)["requests"]
+            call = summarizer._call if whole else summarizer.summarize
+            future = asyncio.run_coroutine_threadsafe(measure(lambda emit: call(text, emit)), runtime.loop)
+            wall, first, output, error = future.result()
+            rows.append((name, wall, first, mock_stats(base_url)["requests"] - before, error or f"{len(output)} chars"))
+
+        runtime.run(runtime.agent("warm", "warm up"), "warm up")
+        run_case("one call, whole document", Summarizer(runtime), whole=True)
+        for concurrency in [int(c) for c in args.concurrency.split(",")]:
+            run_case(f"map-reduce, {concurrency} at a time", Summarizer(runtime, concurrency=concurrency), whole=False)
+        runtime.close()
+    finally:
+        mock.terminate()
+        mock.wait()
+
+    print(f"{args.pages} pages, ~{count_tokens(text)} tokens, {len(split_text(text))} chunks; "
+          f"mock: first token {args.latency}, {args.prefill_tokens_per_s:.0f} prompt tokens/s, {args.tokens_per_s:.0f} tokens/s, "
+          f"context {args.context_tokens}")
+    print(f"{'':<28} {'wall s':>8} {'first text s':>13} {'calls':>6}  result")
+    for name, wall, first, calls, result in rows:
+        first = f"{first:.2f}" if first is not None else "-"
+        print(f"{name:<28} {wall:>8.2f} {first:>13} {calls:>6}  {result}")
+
+
+if __name__ == "__main__":
+    main()
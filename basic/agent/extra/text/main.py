@@ -2,10 +2,11 @@
 # type: ignore
 import streamlit as st
 from dotenv import load_dotenv
-from agents import OpenAIChatCompletionsModel, Agent as BaseAgent, Runner, AsyncOpenAI, set_tracing_disabled
+from agents import set_tracing_disabled
+from agent_runtime import AgentRuntime
+from summarizer import Summarizer
 from dataclasses import dataclass
 from typing import List
-import os
 from PIL import Image, ImageDraw
 
 # --- Models ---
@@ -26,11 +27,19 @@ class Agent:
 load_dotenv()
 set_tracing_disabled(disabled=True)
 
-API_KEY = os.getenv("GEMINI_API_KEY")
-client = AsyncOpenAI(api_key=API_KEY, base_url='https://generativelanguage.googleapis.com/v1beta/openai/')
+# --- Client, Model, Agents ---
+# Built once per server process and shared by every session and rerun, see agent_runtime.py
+@st.cache_resource
+def get_runtime():
+    return AgentRuntime(model_name="gemini-2.0-flash")
 
-# --- Model ---
-model = OpenAIChatCompletionsModel(model="gemini-2.0-flash", openai_client=client)
+@st.cache_resource
+def get_summarizer():
+    # Long texts are summarized in chunks, concurrently, see summarizer.py
+    return Summarizer(get_runtime())
+
+runtime = get_runtime()
+summarizer = get_summarizer()
 
 # --- Tools ---
 tools = [
@@ -48,6 +57,7 @@ agent_config = Agent(
 )
 
 # --- Utility for Circular Icon ---
+@st.cache_resource
 def load_circular_icon(img_path, size=(60, 60)):
     try:
         img = Image.open(img_path).convert("RGBA").resize(size)
@@ -85,28 +95,33 @@ st.divider()
 st.subheader("🧪 Try a Tool")
 
 tool_choice = st.selectbox("Choose Tool", [t.name for t in tools])
+agent = runtime.agent(agent_config.name, agent_config.instructions)
+
+def show_job(key, title):
+    """Stream a run kept in session_state; a rerun mid-run picks it up again."""
+    job = st.session_state.get(key)
+    if job is None:
+        return
+    if not job.done:
+        st.success(title)
+        st.write_stream(job.stream())
+    elif job.error is None:
+        st.success(title)
+        st.write(job.final_output)
+    if job.error is not None:
+        st.error(f"❌ Error: {job.error}")
 
 if tool_choice == "Summarizer":
     text = st.text_area("📄 Enter text to summarize")
     if st.button("Run Summarizer") and text:
-        with st.spinner("Summarizing..."):
-            agent = BaseAgent(name=agent_config.name, instructions=agent_config.instructions, model=model)
-            try:
-                result = Runner.run_sync(agent, input=text)
-                st.success("🧠 Summary:")
-                st.write(result.final_output)
-            except Exception as e:
-                st.error(f"❌ Error: {e}")
+        # Runs on the shared background loop; this session's script thread isn't held by it
+        st.session_state.summary_job = summarizer.start(text)
+    show_job("summary_job", "🧠 Summary:")
 
 elif tool_choice == "ImageClassifier":
     uploaded_image = st.file_uploader("📷 Upload Image", type=["png", "jpg", "jpeg"])
     if st.button("Run Image Classifier") and uploaded_image:
+        st.session_state.classify_job = runtime.start(agent, "Classify this image")
+    if uploaded_image:
         st.image(uploaded_image, width=200, caption="Uploaded Image")
-        with st.spinner("Classifying..."):
-            agent = BaseAgent(name=agent_config.name, instructions=agent_config.instructions, model=model)
-            try:
-                result = Runner.run_sync(agent, input="Classify this image")
-                st.success("🔍 Classification Result:")
-                st.write(result.final_output)
-            except Exception as e:
-                st.error(f"❌ Error: {e}")
+    show_job("classify_job", "🔍 Classification Result:")
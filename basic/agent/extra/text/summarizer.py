@@ -0,0 +1,221 @@
+# type: ignore
+"""Map-reduce summarization for documents too long for one model call.
+
+One call with a whole document is slow (the model reads all of it before
+the first word comes back), can overflow the context, and loses everything
+if it fails. Summarizer.start() instead:
+
+1. splits the text into chunks of at most SUMMARY_CHUNK_TOKENS, at
+   paragraph, then sentence, then word boundaries; each chunk repeats the
+   last ~SUMMARY_OVERLAP_TOKENS of the one before, so nothing is cut off
+   mid-thought
+2. summarizes the chunks concurrently, at most SUMMARY_CONCURRENCY at a
+   time, streaming each part's summary to the page as it lands
+3. merges neighbouring summaries in groups that fit one chunk, round after
+   round, and streams the last merge as the final summary
+
+A part that still fails after the client's retries is reported and left
+out, and the rest of the document is still summarized; summaries whose
+merge fails are kept unmerged. Text that fits one chunk is a single
+streamed call, as before. Runs go to the AgentRuntime's
+shared loop, like every other run on the page.
+
+    SUMMARY_CHUNK_TOKENS     tokens per chunk                (3000)
+    SUMMARY_OVERLAP_TOKENS   tokens repeated between chunks  (150)
+    SUMMARY_CONCURRENCY      chunk calls in flight at once   (8)
+"""
+import asyncio
+import os
+import re
+import time
+
+from agents import Runner
+from openai.types.responses import ResponseTextDeltaEvent
+
+from agent_runtime import Job
+
+CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", "3000"))
+OVERLAP_TOKENS = int(os.getenv("SUMMARY_OVERLAP_TOKENS", "150"))
+CONCURRENCY = int(os.getenv("SUMMARY_CONCURRENCY", "8"))
+
+INSTRUCTIONS = ("You summarize text into concise bullet points. Keep names, numbers and decisions, "
+                "and don't add an introduction.")
+PART_PROMPT = "This is part {index} of {total} of a longer document. Summarize it.\n\n{text}"
+MERGE_PROMPT = ("These are summaries of consecutive parts of one document. Merge them into one "
+                "summary, in document order, without repeating points.\n\n{text}")
+
+_PARAGRAPH = re.compile(r"\n\s*\n")
+_SENTENCE = re.compile(r"(?<=[.!?])\s+")
+
+
+def count_tokens(text: str) -> int:
+    """Rough estimate (~4 characters per token), close enough for budgeting."""
+    return len(text) // 4 + 1
+
+
+def _pieces(text: str, limit: int):
+    """(separator, piece) pairs, each piece at most `limit` tokens."""
+    for paragraph in _PARAGRAPH.split(text):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+        if count_tokens(paragraph) <= limit:
+            yield "\n\n", paragraph
+            continue
+        separator = "\n\n"
+        for sentence in _SENTENCE.split(paragraph):
+            while count_tokens(sentence) > limit:
+                cut = sentence.rfind(" ", 0, limit * 4)
+                cut = cut if cut > 0 else limit * 4
+                yield separator, sentence[:cut]
+                separator, sentence = " ", sentence[cut:].lstrip()
+            if sentence:
+                yield separator, sentence
+                separator = " "
+
+
+def _check_sizes(chunk_tokens: int, overlap_tokens: int):
+    if chunk_tokens <= 0:
+        raise ValueError(f"chunk_tokens must be positive, got {chunk_tokens}")
+    if not 0 <= overlap_tokens < chunk_tokens:
+        raise ValueError(f"overlap_tokens must be in [0, chunk_tokens), got {overlap_tokens} "
+                         f"with chunk_tokens {chunk_tokens}")
+
+
+def split_text(text: str, chunk_tokens=CHUNK_TOKENS, overlap_tokens=OVERLAP_TOKENS) -> list[str]:
+    """Chunks of at most chunk_tokens; each starts with the last ~overlap_tokens of the one before."""
+    _check_sizes(chunk_tokens, overlap_tokens)
+    chunks, current, size = [], [], 0
+    for separator, piece in _pieces(text, chunk_tokens - overlap_tokens):
+        tokens = count_tokens(piece)
+        if current and size + tokens > chunk_tokens:
+            chunks.append(_join(current))
+            tail = _tail(chunks[-1], overlap_tokens)
+            current, size = ([("", tail, count_tokens(tail))], count_tokens(tail)) if tail else ([], 0)
+        current.append((separator, piece, tokens))
+        size += tokens
+    if current:
+        chunks.append(_join(current))
+    return chunks
+
+
+def _join(entries) -> str:
+    return "".join(separator + piece for separator, piece, _ in entries)[len(entries[0][0]):]
+
+
+def _tail(chunk: str, tokens: int) -> str:
+    """The end of `chunk`, about `tokens` long, starting at a sentence (or else a word)."""
+    start = len(chunk) - tokens * 4
+    if tokens <= 0 or start <= 0:
+        return ""
+    sentence = _SENTENCE.search(chunk, start)
+    if sentence and sentence.end() < len(chunk):
+        return chunk[sentence.end():]
+    space = chunk.find(" ", start)
+    return chunk[space + 1:] if space >= 0 else ""
+
+
+class Summarizer:
+    def __init__(self, runtime, chunk_tokens=CHUNK_TOKENS, overlap_tokens=OVERLAP_TOKENS,
+                 concurrency=CONCURRENCY):
+        _check_sizes(chunk_tokens, overlap_tokens)
+        if concurrency < 1:
+            raise ValueError(f"concurrency must be at least 1, got {concurrency}")
+        self.runtime = runtime
+        self.agent = runtime.agent("Summarizer", INSTRUCTIONS)
+        self.chunk_tokens = chunk_tokens
+        self.overlap_tokens = overlap_tokens
+        self.concurrency = concurrency
+
+    def start(self, text: str) -> Job:
+        """Summarize on the runtime's loop; returns at once with a Job the page can stream."""
+        job = Job()
+        self.runtime.runs += 1
+        job.future = asyncio.run_coroutine_threadsafe(self._run(job, text), self.runtime.loop)
+        return job
+
+    async def _run(self, job: Job, text: str):
+        try:
+            job.final_output = await self.summarize(text, job.parts.append)
+        except Exception as e:
+            job.error = e
+        finally:
+            job.elapsed = time.perf_counter() - job.started
+            job.done = True
+
+    async def summarize(self, text: str, emit=None) -> str:
+        """The summary of `text`; partial results go to `emit(str)` as they arrive."""
+        emit = emit or (lambda _: None)
+        chunks = split_text(text, self.chunk_tokens, self.overlap_tokens)
+        if len(chunks) <= 1:
+            return await self._call(text, emit)
+
+        limit = asyncio.Semaphore(self.concurrency)
+        total = len(chunks)
+        emit(f"_Summarizing {total} parts…_\n\n")
+
+        async def part(index, chunk):
+            try:
+                async with limit:
+                    summary = await self._call(PART_PROMPT.format(index=index, total=total, text=chunk))
+            except Exception as e:
+                emit(f"**Part {index}/{total}** couldn't be summarized: {e}\n\n")
+                return e
+            emit(f"**Part {index}/{total}**\n\n{summary}\n\n")
+            return summary
+
+        results = await asyncio.gather(*(part(i, chunk) for i, chunk in enumerate(chunks, 1)))
+        summaries = [r for r in results if not isinstance(r, Exception)]
+        if not summaries:
+            raise results[0]
+        failed = total - len(summaries)
+
+        async def merge(group):
+            try:
+                async with limit:
+                    return await self._call(MERGE_PROMPT.format(text="\n\n".join(group)))
+            except Exception:
+                return "\n\n".join(group)  # keep the parts unmerged rather than lose them
+
+        groups = self._groups(summaries)
+        while len(groups) > 1:
+            summaries = await asyncio.gather(*(merge(group) for group in groups))
+            groups = self._groups(summaries)
+        emit("---\n\n")
+        try:
+            summary = await self._call(MERGE_PROMPT.format(text="\n\n".join(groups[0])), emit)
+        except Exception as e:
+            summary = "\n\n".join(groups[0])
+            emit(f"_Couldn't merge the parts ({e}), here they are as they are:_\n\n{summary}")
+        if failed:
+            note = f"\n\n_{failed} of {total} parts couldn't be summarized and are left out._"
+            emit(note)
+            summary += note
+        return summary
+
+    def _groups(self, summaries: list[str]) -> list[list[str]]:
+        """Consecutive summaries grouped to fit one chunk, at least two to a group."""
+        groups, size = [], 0
+        for summary in summaries:
+            tokens = count_tokens(summary)
+            if groups and (size + tokens <= self.chunk_tokens or len(groups[-1]) < 2):
+                groups[-1].append(summary)
+                size += tokens
+            else:
+                groups.append([summary])
+                size = tokens
+        return groups
+
+    async def _call(self, prompt: str, emit=None) -> str:
+        if emit is None:
+            result = await Runner.run(self.agent, input=prompt)
+            return str(result.final_output)
+        result = Runner.run_streamed(self.agent, input=prompt)
+        streamed = False
+        async for event in result.stream_events():
+            if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+                emit(event.data.delta)
+                streamed = True
+        if not streamed:
+            emit(str(result.final_output))
+        return str(result.final_output)
@@ -0,0 +1,25 @@
+# type: ignore
+import pytest
+
+from summarizer import Summarizer, count_tokens, split_text
+
+
+class Runtime:
+    def agent(self, name, instructions):
+        return None
+
+
+def test_chunks_fit_and_overlap():
+    text = "\n\n".join(" ".join(f"Sentence {p}.{i} of paragraph {p}." for i in range(40)) for p in range(50))
+    chunks = split_text(text, chunk_tokens=1000, overlap_tokens=100)
+    assert len(chunks) > 1
+    assert all(count_tokens(chunk) <= 1000 for chunk in chunks)
+    assert chunks[1].split(".")[0] in chunks[0]
+
+
+@pytest.mark.parametrize("chunk_tokens, overlap_tokens", [(100, 100), (100, 150), (0, 0), (-5, 0), (100, -1)])
+def test_bad_sizes_raise(chunk_tokens, overlap_tokens):
+    with pytest.raises(ValueError):
+        split_text("word " * 1000, chunk_tokens, overlap_tokens)
+    with pytest.raises(ValueError):
+        Summarizer(Runtime(), chunk_tokens=chunk_tokens, overlap_tokens=overlap_tokens)
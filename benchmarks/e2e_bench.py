@@ -0,0 +1,298 @@
+"""End-to-end latency/throughput benchmarks for the agent flows, against the local mock server.
+
+    python e2e_bench.py                       # run everything, compare with baselines.json
+    python e2e_bench.py --scenario guard      # just one
+    python e2e_bench.py --update-baseline     # accept the current numbers
+
+Scenarios (each runs in its own process, inside its project folder):
+
+    simple       simple-agent chatbot.myAgent, one agent
+    multi        multi-agent-system agent.myAgent, manager + handoff to a specialist
+    guard        quickstart/guard.py, input guardrail + triage handoff
+    goutput      quickstart/goutput.py, output guardrail
+    calculator   shaitani-calculator-02 add agent, one tool call round trip
+
+For each: p50/p95/p99 latency and throughput with --users concurrent users
+each doing --runs runs, then a few sequential runs under tracemalloc for
+the peak memory allocated per run and the blocks still held afterwards.
+Each scenario is run --repeat times. The run with the median mean latency
+(which moves with the tail as well as the middle) is the one reported and
+gated, all of its metrics together, so every number comes from a run that
+really happened. The range of p50 and throughput across the repeats is
+printed next to it to show how noisy the machine was.
+
+The mock server answers after a fixed --latency, so the numbers mostly
+measure our own overhead (SDK, limiter, guardrails, handoffs) on top of a
+constant model time. A metric more than --threshold worse than its
+baseline fails the run (exit code 1); p95 and p99, which move most between
+runs, get --tail-threshold instead. A baseline recorded with a different
+number of users or runs isn't comparable, so that scenario's gate is
+skipped with a note rather than reporting made-up regressions.
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HERE = os.path.dirname(os.path.abspath(__file__))
+MOCK_SERVER = os.path.join(ROOT, "mock-server", "mock_server.py")
+RULES = os.path.join(HERE, "bench_rules.json")
+BASELINES = os.path.join(HERE, "baselines.json")
+
+SCENARIOS = {
+    "simple": "simple-agent",
+    "multi": "multi-agent-system",
+    "guard": "quickstart",
+    "goutput": "quickstart",
+    "calculator": "shaitani-calculator-02",
+}
+
+# metric -> +1 if bigger is worse, -1 if smaller is worse
+GATED = {"p50_ms": 1, "p95_ms": 1, "p99_ms": 1, "throughput_rps": -1, "alloc_peak_kib": 1}
+TAIL = {"p95_ms", "p99_ms"}
+# what a baseline was measured with; a result measured differently isn't compared
+SETUP = ("users", "runs")
+
+
+# ---------- worker side: runs inside the project folder ----------
+
+def build_scenario(name):
+    """async fn(i) doing one run of the flow."""
+    from agents import Runner
+
+    if name == "simple":
+        import chatbot
+        return lambda i: chatbot.myAgent(f"question {i}: what is an AI agent?")
+    if name == "multi":
+        import agent
+        return lambda i: agent.myAgent(f"request {i}: build a react website for my shop")
+    if name == "guard":
+        import guard
+        from optimistic_guardrails import run_optimistic
+        # a different question each run, so the guardrail verdict cache doesn't answer it
+        return lambda i: run_optimistic(guard.triage_agent, f"homework {i}: who was the first president?",
+                                        run_config=guard.config)
+    if name == "goutput":
+        import goutput
+        return lambda i: Runner.run(goutput.agent, f"ticket {i}: where is my order?", run_config=goutput.config)
+    if name == "calculator":
+        import main
+        return lambda i: Runner.run(main.add_agent, f"please add {i} and 3", run_config=main.config)
+    raise ValueError(f"unknown scenario {name}")
+
+
+def percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+
+async def measure(run_once, users, runs, alloc_runs):
+    for i in range(2):  # warm-up: imports, pools, schema caches
+        await run_once(-1 - i)
+
+    latencies = []
+
+    async def user(u):
+        for r in range(runs):
+            start = time.perf_counter()
+            await run_once(u * runs + r)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(user(u) for u in range(users)))
+    wall = time.perf_counter() - start
+
+    tracemalloc.start()
+    peaks, retained = [], []
+    for i in range(alloc_runs):
+        before_size, _ = tracemalloc.get_traced_memory()
+        before_blocks = len(tracemalloc.take_snapshot().traces)
+        tracemalloc.reset_peak()
+        await run_once(10_000 + i)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append((peak - before_size) / 1024)
+        retained.append(len(tracemalloc.take_snapshot().traces) - before_blocks)
+    tracemalloc.stop()
+
+    return {
+        "runs": len(latencies),
+        "users": users,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000,
+        "throughput_rps": len(latencies) / wall,
+        "alloc_peak_kib": statistics.median(peaks),
+        "retained_blocks": statistics.median(retained),
+    }
+
+
+def worker(args):
+    sys.path.insert(0, os.getcwd())
+    # the app modules print and log; keep stdout for the result line
+    real_stdout = sys.stdout
+    sys.stdout = open(os.devnull, "w")
+    try:
+        run_once = build_scenario(args.worker)
+        result = asyncio.run(measure(run_once, args.users, args.runs, args.alloc_runs))
+    finally:
+        sys.stdout = real_stdout
+    print(json.dumps(result))
+
+
+# ---------- driver side ----------
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_mock(latency: str):
+    port = free_port()
+    proc = subprocess.Popen(
+        [sys.executable, MOCK_SERVER, "--port", str(port), "--latency", latency,
+         "--script", RULES, "--auto-tools", "--seed", "1"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+            return proc, f"http://127.0.0.1:{port}/v1/"
+        except OSError:
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError("mock server did not start")
+
+
+def median_run(results: list[dict]) -> dict:
+    """The repeat with the median mean latency (the lower one for an even count), kept whole."""
+    ordered = sorted(results, key=lambda r: r["mean_ms"])
+    return ordered[(len(ordered) - 1) // 2]
+
+
+def spread(results: list[dict], metric: str) -> str:
+    values = [r[metric] for r in results]
+    return f"{min(values):.1f}-{max(values):.1f}"
+
+
+def run_scenario(name, base_url, args) -> dict:
+    env = dict(
+        os.environ,
+        GEMINI_BASE_URL=base_url,
+        GEMINI_API_KEY="mock",
+        # the limiter stays in the path, but with limits the benchmark never reaches
+        RATE_LIMIT_RPM="100000000",
+        RATE_LIMIT_TPM="100000000000",
+        RESPONSE_CACHE="0",
+        STREAMING="0",
+        # the trace sink stays on too, writing outside the project folder
+        TRACE_FILE=os.path.join(tempfile.gettempdir(), f"e2e_{name}_traces.bin"),
+    )
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--worker", name,
+         "--users", str(args.users), "--runs", str(args.runs), "--alloc-runs", str(args.alloc_runs)],
+        cwd=os.path.join(ROOT, SCENARIOS[name]), env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{name} failed:\n{proc.stderr[-2000:]}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def mismatch(result, baseline) -> str | None:
+    """Why result and baseline can't be compared, or None if they can."""
+    differs = [f"{key} {result[key]:g} vs {baseline[key]:g}" for key in SETUP
+               if key in baseline and baseline[key] != result[key]]
+    return ", ".join(differs) or None
+
+
+def compare(name, result, baseline, threshold, tail_threshold) -> list[str]:
+    failures = []
+    for metric, direction in GATED.items():
+        if metric not in baseline or not baseline[metric]:
+            continue
+        change = (result[metric] - baseline[metric]) / baseline[metric] * direction
+        if change > (tail_threshold if metric in TAIL else threshold):
+            failures.append(f"{name}.{metric}: {result[metric]:.1f} vs baseline {baseline[metric]:.1f} "
+                            f"({change:+.0%} worse)")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS), help="repeatable; default all")
+    parser.add_argument("--users", type=int, default=10, help="concurrent users")
+    parser.add_argument("--runs", type=int, default=20, help="runs per user")
+    parser.add_argument("--alloc-runs", type=int, default=5, help="sequential runs under tracemalloc")
+    parser.add_argument("--repeat", type=int, default=5, help="trials per scenario, the median one is kept")
+    parser.add_argument("--latency", default="fixed:20", help="mock server time to first token")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed regression, 0.25 = 25%%")
+    parser.add_argument("--tail-threshold", type=float, default=0.6, help="allowed p95/p99 regression")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        return worker(args)
+
+    baselines = {}
+    if os.path.exists(BASELINES):
+        with open(BASELINES, encoding="utf-8") as f:
+            baselines = json.load(f)
+
+    proc, base_url = start_mock(args.latency)
+    results, failures, skipped = {}, [], []
+    try:
+        print(f"{'scenario':<11} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'runs/s':>8} {'peak KiB':>9} "
+              f"{'retained':>9}  {'p50 range':>12} {'runs/s range':>13}")
+        for name in args.scenario or SCENARIOS:
+            repeats = [run_scenario(name, base_url, args) for _ in range(args.repeat)]
+            result = results[name] = median_run(repeats)
+            print(f"{name:<11} {result['p50_ms']:8.1f} {result['p95_ms']:8.1f} {result['p99_ms']:8.1f} "
+                  f"{result['throughput_rps']:8.1f} {result['alloc_peak_kib']:9.0f} {result['retained_blocks']:9.0f}  "
+                  f"{spread(repeats, 'p50_ms'):>12} {spread(repeats, 'throughput_rps'):>13}")
+            if not args.update_baseline and name in baselines:
+                reason = mismatch(result, baselines[name])
+                if reason:
+                    skipped.append(f"{name}: measured with {reason} in the baseline")
+                else:
+                    failures += compare(name, result, baselines[name], args.threshold, args.tail_threshold)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    if args.update_baseline:
+        baselines.update({name: {k: round(v, 2) for k, v in r.items()} for name, r in results.items()})
+        with open(BASELINES, "w", encoding="utf-8") as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write("\n")
+        print(f"\nbaselines written to {BASELINES}")
+        return 0
+
+    if skipped:
+        print("\nNOT COMPARED (rerun with the baseline's settings, or --update-baseline):")
+        for note in skipped:
+            print("  " + note)
+    if failures:
+        print("\nREGRESSIONS:")
+        for failure in failures:
+            print("  " + failure)
+        return 1
+    if not baselines:
+        print("\nno baselines yet, run with --update-baseline")
+    elif len(skipped) < len(results):
+        print("\nno regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,439 @@
+"""Offline OpenAI-compatible chat-completions server for benchmarks and load tests.
+
+Point any of the apps at it through the same base_url seam they use for
+Gemini (provider.py reads GEMINI_BASE_URL):
+
+    python mock_server.py --port 8808 --profile flash
+    GEMINI_BASE_URL=http://127.0.0.1:8808/v1/ GEMINI_API_KEY=mock uv run main.py
+
+Only the standard library is needed, so it runs from any project's venv.
+
+What it answers, for the last message of each request:
+- a user message: the first --script rule that matches, otherwise (with
+  --auto-tools) a call to the first function tool the agent has, otherwise
+  JSON for the agent's output_type, otherwise a plain text reply
+- a tool result: a short text (or JSON) answer quoting the result
+- the result of a handoff (transfer_to_...): treated like the user message
+  that led to it, so the new agent answers it
+
+Script rules (JSON file, {"rules": [...]}, first match wins):
+
+    {"match": "homework", "json": {"is_math_homework": true, "reasoning": "x"}}
+    {"match": "math|\\\\d", "agent": "determine which agent", "handoff": "Math Tutor"}
+    {"match": "lock", "tool": "kia_api_lock_vehicle", "arguments": {"vehicle_id": "1"}}
+    {"match": "boom", "error": 503}
+    {"content": "Hello!"}
+
+"match" is a regex on the user message and "agent" one on the system
+prompt (the agent's instructions); both are optional. A tool or handoff rule
+only fires if the request offers that tool.
+
+Timing is time to first token from --latency (or the --profile preset) plus
+--tokens-per-s for the rest. Streams go out token by token at that rate.
+--prefill-tokens-per-s adds prompt processing time in proportion to the
+prompt, and a prompt over --context-tokens gets a 400 context-length error.
+--error-rate answers a share of requests with one of --error-statuses (429s
+carry Retry-After), and --disconnect-rate cuts a share of streams halfway.
+GET /mock/stats returns request and error counts.
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import time
+import uuid
+from dataclasses import dataclass, field
+
+PRESETS = {
+    # time to first token, tokens/s, error rate
+    "instant": ("none", 0.0, 0.0),
+    "flash": ("lognormal:350,0.4", 180.0, 0.0),
+    "pro": ("lognormal:900,0.5", 70.0, 0.0),
+    "degraded": ("heavy:600,1.3", 40.0, 0.05),
+}
+
+_FILLER = ("the", "answer", "depends", "on", "context", "and", "here", "is", "a", "short", "summary")
+
+
+class Latency:
+    """Time to first token, in seconds. Spec: none | fixed:MS | lognormal:MEDIAN_MS,SIGMA | heavy:MIN_MS,ALPHA."""
+
+    def __init__(self, spec: str):
+        self.spec = spec
+        kind, _, params = spec.partition(":")
+        self.kind = kind
+        self.params = [float(p) for p in params.split(",")] if params else []
+        if kind not in ("none", "fixed", "lognormal", "heavy"):
+            raise ValueError(f"unknown latency spec {spec!r}")
+
+    def sample(self) -> float:
+        if self.kind == "fixed":
+            return self.params[0] / 1000
+        if self.kind == "lognormal":
+            median, sigma = self.params
+            return random.lognormvariate(math.log(median / 1000), sigma)
+        if self.kind == "heavy":
+            # Pareto: most calls near MIN_MS, a long tail of slow ones (lower ALPHA = heavier tail)
+            minimum, alpha = self.params
+            return minimum / 1000 * random.paretovariate(alpha)
+        return 0.0
+
+
+@dataclass
+class MockConfig:
+    latency: Latency = field(default_factory=lambda: Latency("none"))
+    tokens_per_s: float = 0.0  # 0 = no generation delay
+    prefill_tokens_per_s: float = 0.0  # 0 = prompt length doesn't add latency
+    context_tokens: int = 0  # 0 = no context limit
+    reply_tokens: int = 40
+    error_rate: float = 0.0
+    error_statuses: tuple = (429, 500, 503)
+    disconnect_rate: float = 0.0
+    auto_tools: bool = False
+    rules: list = field(default_factory=list)
+    seed: int | None = None
+
+    @classmethod
+    def from_profile(cls, name: str, **overrides) -> "MockConfig":
+        latency, tokens_per_s, error_rate = PRESETS[name]
+        values = {"latency": Latency(latency), "tokens_per_s": tokens_per_s, "error_rate": error_rate}
+        values.update({k: v for k, v in overrides.items() if v is not None})
+        return cls(**values)
+
+
+def count_tokens(text: str) -> int:
+    return max(1, len(text) // 4)
+
+
+def tool_name_for_agent(agent_name: str) -> str:
+    """The function name the Agents SDK gives a handoff to `agent_name`."""
+    return "transfer_to_" + re.sub(r"[^a-zA-Z0-9]", "_", agent_name.replace(" ", "_")).lower()
+
+
+def example_for_schema(schema: dict, root: dict | None = None, numbers=()):
+    """A small value that validates against a JSON schema (for output_type and tool arguments)."""
+    root = root or schema
+    if "$ref" in schema:
+        name = schema["$ref"].rsplit("/", 1)[-1]
+        return example_for_schema(root.get("$defs", root.get("definitions", {})).get(name, {}), root, numbers)
+    for key in ("anyOf", "oneOf", "allOf"):
+        if key in schema:
+            return example_for_schema(schema[key][0], root, numbers)
+    if "enum" in schema:
+        return schema["enum"][0]
+    if "const" in schema:
+        return schema["const"]
+    kind = schema.get("type")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "null")
+    if kind == "object":
+        numbers = list(numbers)
+        value = {}
+        for name, prop in schema.get("properties", {}).items():
+            if prop.get("type") in ("integer", "number") and numbers:
+                value[name] = numbers.pop(0)  # "add 2 and 3" -> a=2, b=3
+            else:
+                value[name] = example_for_schema(prop, root)
+        return value
+    if kind == "array":
+        return []
+    if kind == "boolean":
+        return False
+    if kind in ("integer", "number"):
+        return 0
+    if kind == "null":
+        return None
+    return "mock"
+
+
+def _numbers(text: str) -> list:
+    return [float(n) if "." in n else int(n) for n in re.findall(r"-?\d+(?:\.\d+)?", text)]
+
+
+def _text(content) -> str:
+    if isinstance(content, list):
+        return " ".join(part.get("text", "") for part in content if isinstance(part, dict))
+    return content or ""
+
+
+class Reply:
+    def __init__(self, content=None, tool_calls=None, error=None):
+        self.content = content
+        self.tool_calls = tool_calls or []
+        self.error = error
+
+
+class Responder:
+    """Decides what a request gets back."""
+
+    def __init__(self, config: MockConfig):
+        self.config = config
+
+    def _turn(self, messages):
+        """(system prompt, user text, tool result or None) for the request."""
+        system = " ".join(_text(m.get("content")) for m in messages if m.get("role") in ("system", "developer"))
+        user = next((_text(m.get("content")) for m in reversed(messages) if m.get("role") == "user"), "")
+        last = messages[-1] if messages else {}
+        if last.get("role") != "tool":
+            return system, user, None
+        calls = {c["id"]: c["function"]["name"] for m in messages for c in (m.get("tool_calls") or [])}
+        if calls.get(last.get("tool_call_id"), "").startswith("transfer_to_"):
+            return system, user, None  # the agent we handed off to answers the user
+        return system, user, _text(last.get("content"))
+
+    def _call(self, name, arguments):
+        return {"id": "call_" + uuid.uuid4().hex[:12], "type": "function",
+                "function": {"name": name, "arguments": json.dumps(arguments)}}
+
+    def _json_or(self, body, text):
+        response_format = body.get("response_format") or {}
+        if response_format.get("type") == "json_schema":
+            return json.dumps(example_for_schema(response_format["json_schema"]["schema"]))
+        return text
+
+    def reply(self, body: dict) -> Reply:
+        messages = body.get("messages", [])
+        tools = {t["function"]["name"]: t["function"] for t in body.get("tools") or [] if t.get("type") == "function"}
+        system, user, tool_result = self._turn(messages)
+
+        if tool_result is not None:
+            return Reply(self._json_or(body, f"The result is {tool_result}."))
+
+        for rule in self.config.rules:
+            if "match" in rule and not re.search(rule["match"], user, re.IGNORECASE):
+                continue
+            if "agent" in rule and not re.search(rule["agent"], system, re.IGNORECASE):
+                continue
+            if "error" in rule:
+                return Reply(error=int(rule["error"]))
+            if "handoff" in rule:
+                name = tool_name_for_agent(rule["handoff"])
+                if name in tools:
+                    return Reply(tool_calls=[self._call(name, {})])
+                continue
+            if "tool" in rule:
+                if rule["tool"] in tools:
+                    return Reply(tool_calls=[self._call(rule["tool"], rule.get("arguments", {}))])
+                continue
+            if "json" in rule:
+                return Reply(json.dumps(rule["json"]))
+            if "content" in rule:
+                return Reply(rule["content"])
+
+        if self.config.auto_tools:
+            for name, fn in tools.items():
+                if not name.startswith("transfer_to_"):
+                    args = example_for_schema(fn.get("parameters") or {"type": "object"}, numbers=_numbers(user))
+                    return Reply(tool_calls=[self._call(name, args)])
+
+        words = [f"Mock answer to: {user[:80]}".strip()]
+        while len(" ".join(words)) // 4 < self.config.reply_tokens:
+            words.append(random.choice(_FILLER))
+        return Reply(self._json_or(body, " ".join(words) + "."))
+
+
+def _chunk(completion_id, model, created, delta=None, finish_reason=None, usage=None):
+    payload = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+               "choices": [] if usage else [{"index": 0, "delta": delta or {}, "finish_reason": finish_reason}]}
+    if usage:
+        payload["usage"] = usage
+    return b"data: " + json.dumps(payload).encode() + b"\n\n"
+
+
+class MockServer:
+    """The HTTP side. Use from asyncio (`async with MockServer(config) as base_url`) or via the CLI."""
+
+    def __init__(self, config: MockConfig | None = None):
+        self.config = config or MockConfig()
+        self.responder = Responder(self.config)
+        self.stats = {"requests": 0, "streamed": 0, "tool_calls": 0, "errors": {}, "disconnects": 0}
+        self._server = None
+        if self.config.seed is not None:
+            random.seed(self.config.seed)
+
+    async def start(self, host="127.0.0.1", port=0) -> str:
+        self._server = await asyncio.start_server(self._handle, host, port)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"http://{host}:{port}/v1/"
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def __aenter__(self) -> str:
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                method, path, _ = request_line.split(" ", 2)
+                headers = {}
+                for line in header_lines:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                if not await self._route(method, path.split("?", 1)[0], body, writer):
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _send_json(self, writer, status, payload, extra_headers=b""):
+        data = json.dumps(payload).encode()
+        reason = {200: b"OK", 400: b"Bad Request", 404: b"Not Found", 429: b"Too Many Requests"}.get(status, b"Error")
+        writer.write(b"HTTP/1.1 %d %s\r\nContent-Type: application/json\r\n%sContent-Length: %d\r\n\r\n%s"
+                     % (status, reason, extra_headers, len(data), data))
+        await writer.drain()
+
+    async def _send_error(self, writer, status, message="injected by mock server"):
+        self.stats["errors"][status] = self.stats["errors"].get(status, 0) + 1
+        extra = b"Retry-After: 1\r\n" if status == 429 else b""
+        await self._send_json(writer, status, {"error": {"message": message, "code": status}}, extra)
+
+    async def _route(self, method, path, body, writer) -> bool:
+        """Answer one request. False closes the connection."""
+        if path.endswith("/mock/stats"):
+            await self._send_json(writer, 200, self.stats)
+        elif method == "GET" and path.endswith("/models"):
+            await self._send_json(writer, 200, {"object": "list", "data": [{"id": "mock", "object": "model"}]})
+        elif method == "POST" and path.endswith("/chat/completions"):
+            return await self._completion(json.loads(body or b"{}"), writer)
+        else:
+            await self._send_json(writer, 404, {"error": {"message": f"no route for {method} {path}"}})
+        return True
+
+    async def _completion(self, request, writer) -> bool:
+        config = self.config
+        self.stats["requests"] += 1
+        reply = self.responder.reply(request)
+        prompt_tokens = count_tokens(json.dumps(request.get("messages", [])))
+        if config.context_tokens and prompt_tokens > config.context_tokens:
+            await self._send_error(writer, 400, f"prompt is {prompt_tokens} tokens, the context "
+                                                f"length is {config.context_tokens}")
+            return True
+        prefill = prompt_tokens / config.prefill_tokens_per_s if config.prefill_tokens_per_s else 0.0
+        await asyncio.sleep(config.latency.sample() + prefill)
+
+        if reply.error is None and random.random() < config.error_rate:
+            reply.error = random.choice(config.error_statuses)
+        if reply.error is not None:
+            await self._send_error(writer, reply.error)
+            return True
+
+        if reply.tool_calls:
+            self.stats["tool_calls"] += 1
+        model = request.get("model", "mock")
+        completion_id = "chatcmpl-" + uuid.uuid4().hex[:12]
+        created = int(time.time())
+        text = reply.content or ""
+        tokens = re.findall(r"\S+\s*", text) or [text]
+        completion_tokens = count_tokens(text) + sum(count_tokens(c["function"]["arguments"]) for c in reply.tool_calls)
+        usage = {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+                 "total_tokens": prompt_tokens + completion_tokens}
+        finish_reason = "tool_calls" if reply.tool_calls else "stop"
+        per_token = 1 / config.tokens_per_s if config.tokens_per_s else 0.0
+
+        if not request.get("stream"):
+            await asyncio.sleep(per_token * completion_tokens)
+            message = {"role": "assistant", "content": reply.content}
+            if reply.tool_calls:
+                message["tool_calls"] = reply.tool_calls
+            await self._send_json(writer, 200, {
+                "id": completion_id, "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+                "usage": usage,
+            })
+            return True
+
+        self.stats["streamed"] += 1
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\nTransfer-Encoding: chunked\r\n\r\n")
+
+        async def send(data: bytes):
+            writer.write(b"%x\r\n%s\r\n" % (len(data), data))
+            await writer.drain()
+
+        await send(_chunk(completion_id, model, created, {"role": "assistant", "content": ""}))
+        cut_at = len(tokens) // 2 if random.random() < config.disconnect_rate else None
+        for i, token in enumerate(tokens if reply.content else []):
+            if i == cut_at:
+                self.stats["disconnects"] += 1
+                return False  # drop the connection mid-stream
+            await asyncio.sleep(per_token)
+            await send(_chunk(completion_id, model, created, {"content": token}))
+        for index, call in enumerate(reply.tool_calls):
+            await asyncio.sleep(per_token * count_tokens(call["function"]["arguments"]))
+            await send(_chunk(completion_id, model, created, {"tool_calls": [dict(call, index=index)]}))
+        await send(_chunk(completion_id, model, created, {}, finish_reason))
+        if (request.get("stream_options") or {}).get("include_usage"):
+            await send(_chunk(completion_id, model, created, usage=usage))
+        await send(b"data: [DONE]\n\n")
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+        return True
+
+
+def load_rules(path: str | None) -> list:
+    if not path:
+        return []
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["rules"]
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8808)
+    parser.add_argument("--profile", choices=sorted(PRESETS), default="instant")
+    parser.add_argument("--latency", help="none | fixed:MS | lognormal:MEDIAN_MS,SIGMA | heavy:MIN_MS,ALPHA")
+    parser.add_argument("--tokens-per-s", type=float)
+    parser.add_argument("--prefill-tokens-per-s", type=float, help="prompt tokens processed per second")
+    parser.add_argument("--context-tokens", type=int, help="reject prompts longer than this")
+    parser.add_argument("--reply-tokens", type=int, default=40, help="length of default text replies")
+    parser.add_argument("--error-rate", type=float)
+    parser.add_argument("--error-statuses", default="429,500,503")
+    parser.add_argument("--disconnect-rate", type=float, default=0.0)
+    parser.add_argument("--auto-tools", action="store_true", help="call the agent's first tool on user turns")
+    parser.add_argument("--script", help="JSON file of reply rules")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    config = MockConfig.from_profile(
+        args.profile,
+        latency=Latency(args.latency) if args.latency else None,
+        tokens_per_s=args.tokens_per_s,
+        prefill_tokens_per_s=args.prefill_tokens_per_s,
+        context_tokens=args.context_tokens,
+        error_rate=args.error_rate,
+        error_statuses=tuple(int(s) for s in args.error_statuses.split(",")),
+        reply_tokens=args.reply_tokens,
+        disconnect_rate=args.disconnect_rate,
+        auto_tools=args.auto_tools,
+        rules=load_rules(args.script),
+        seed=args.seed,
+    )
+    server = MockServer(config)
+    base_url = await server.start(args.host, args.port)
+    print(f"mock server on {base_url} (profile {args.profile}, latency {config.latency.spec}, "
+          f"{config.tokens_per_s or 'unlimited'} tokens/s, error rate {config.error_rate})")
+    print(f"GEMINI_BASE_URL={base_url} GEMINI_API_KEY=mock")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,146 @@
+#type:ignore
+"""A local stand-in for Redis: enough of RESP2 for session_store.py, stdlib only.
+
+Keys live in one dict per process with optional expiry; nothing is written
+to disk. Supports PING, GET, SET (EX/PX/NX/XX), DEL, EXISTS, EXPIRE, TTL,
+DBSIZE, FLUSHALL, SELECT, AUTH and QUIT. Commands on one connection are
+answered in order, so pipelining works as with the real server.
+
+    python redis_standin.py --port 6379
+    SESSION_STORE=redis://127.0.0.1:6379/0 uv run chainlit run main.py
+"""
+import argparse
+import asyncio
+import time
+
+
+class RedisStandin:
+    """Use from asyncio (`async with RedisStandin() as url`) or via the CLI."""
+
+    def __init__(self):
+        self.data: dict[bytes, bytes] = {}
+        self.expires: dict[bytes, float] = {}
+        self.commands = 0
+        self._server = None
+
+    async def start(self, host="127.0.0.1", port=0) -> str:
+        self._server = await asyncio.start_server(self._handle, host, port)
+        port = self._server.sockets[0].getsockname()[1]
+        return f"redis://{host}:{port}/0"
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def __aenter__(self) -> str:
+        return await self.start()
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def _alive(self, key: bytes) -> bool:
+        expires = self.expires.get(key)
+        if expires is not None and expires <= time.time():
+            self.data.pop(key, None)
+            del self.expires[key]
+        return key in self.data
+
+    def execute(self, args: list) -> bytes:
+        self.commands += 1
+        name = args[0].upper()
+        if name == b"PING":
+            return b"+PONG\r\n"
+        if name in (b"SELECT", b"AUTH"):
+            return b"+OK\r\n"
+        if name == b"GET":
+            if not self._alive(args[1]):
+                return b"$-1\r\n"
+            value = self.data[args[1]]
+            return b"$%d\r\n%s\r\n" % (len(value), value)
+        if name == b"SET":
+            key, value, options = args[1], args[2], [a.upper() for a in args[3:]]
+            exists = self._alive(key)
+            if (b"NX" in options and exists) or (b"XX" in options and not exists):
+                return b"$-1\r\n"
+            self.data[key] = value
+            self.expires.pop(key, None)
+            for unit, scale in ((b"EX", 1.0), (b"PX", 0.001)):
+                if unit in options:
+                    self.expires[key] = time.time() + int(args[3 + options.index(unit) + 1]) * scale
+            return b"+OK\r\n"
+        if name == b"DEL":
+            removed = 0
+            for key in args[1:]:
+                if self._alive(key):
+                    del self.data[key]
+                    self.expires.pop(key, None)
+                    removed += 1
+            return b":%d\r\n" % removed
+        if name == b"EXISTS":
+            return b":%d\r\n" % sum(self._alive(key) for key in args[1:])
+        if name == b"EXPIRE":
+            if not self._alive(args[1]):
+                return b":0\r\n"
+            self.expires[args[1]] = time.time() + int(args[2])
+            return b":1\r\n"
+        if name == b"TTL":
+            if not self._alive(args[1]):
+                return b":-2\r\n"
+            expires = self.expires.get(args[1])
+            return b":%d\r\n" % (-1 if expires is None else max(0, int(expires - time.time())))
+        if name == b"DBSIZE":
+            return b":%d\r\n" % sum(self._alive(key) for key in list(self.data))
+        if name == b"FLUSHALL":
+            self.data.clear()
+            self.expires.clear()
+            return b"+OK\r\n"
+        return b"-ERR unknown command '%s'\r\n" % args[0]
+
+    async def _read_command(self, reader) -> list | None:
+        line = await reader.readline()
+        if not line:
+            return None
+        if not line.startswith(b"*"):
+            return line.split()  # inline command, e.g. from `nc`
+        args = []
+        for _ in range(int(line[1:-2])):
+            length = int((await reader.readline())[1:-2])
+            args.append((await reader.readexactly(length + 2))[:-2])
+        return args
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                args = await self._read_command(reader)
+                if not args:
+                    if args is None:
+                        break
+                    continue
+                if args[0].upper() == b"QUIT":
+                    writer.write(b"+OK\r\n")
+                    break
+                writer.write(self.execute(args))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+    standin = RedisStandin()
+    url = await standin.start(args.host, args.port)
+    print(f"redis stand-in on {url}")
+    await standin._server.serve_forever()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -1,53 +1,78 @@
 from dotenv import load_dotenv
-from openai import AsyncOpenAI
-from agents import Agent, Runner, OpenAIChatCompletionsModel, set_tracing_disabled
+from agents import Runner
+from provider import get_model
+from agent_registry import AgentRegistry, AgentSpec
+from streaming import stream_events
+from memory import ConversationMemory
+from metrics import install as install_metrics
+from trace_sink import install as install_trace_sink
 import os
 
 
 load_dotenv()
 
-set_tracing_disabled(True)
+# Spans stay in this process and only feed the /metrics histograms, see metrics.py
+install_metrics(serve=False)
+# ...and are also kept in a local append-only file (TRACE_SINK=0 turns it off), see trace_sink.py
+install_trace_sink()
 
-provider = AsyncOpenAI(
-    api_key=os.getenv("GEMINI_API_KEY"),
-    
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash-exp",
-    openai_client=provider,
-)
+# Shared pooled client, see provider.py
+model = get_model("gemini-2.0-flash-exp")
 
-web_dev = Agent(
- name="Web Developer Expert",
- instructions="Build responsive and performant websites using modern frameworks.",
- model=model,
- handoff_description="handoff to web developer if the task is related to web development."
+registry = AgentRegistry(model)
+registry.register(
+    AgentSpec(
+        name="Web Developer Expert",
+        instructions="Build responsive and performant websites using modern frameworks.",
+        handoff_description="handoff to web developer if the task is related to web development."
+    ),
+    AgentSpec(
+        name="Mobile App Developer Expert",
+        instructions="Develop cross-platform mobile apps for iOS and Android.",
+        handoff_description="handoff to mobile app developer if the task is related to mobile apps."
+    ),
+    AgentSpec(
+        name="Marketing Expert Agent",
+        instructions="Create and execute marketing strategies for product launches.",
+        handoff_description="handoff to marketing agent if the task is related to marketing."
+    ),
+    AgentSpec(
+        name="Manager",
+        instructions="You will chat with the user and delegate tasks to specialized agents based on their requests.",
+        handoffs=("Web Developer Expert", "Mobile App Developer Expert", "Marketing Expert Agent"),
+    ),
 )
 
-mobile_dev = Agent(
- name="Mobile App Developer Expert",
- instructions="Develop cross-platform mobile apps for iOS and Android.",
- model=model,
-  handoff_description="handoff to mobile app developer if the task is related to mobile apps."
-)
-marketing = Agent(
- name="Marketing Expert Agent",
- instructions="Create and execute marketing strategies for product launches.",
- model=model,
- handoff_description="handoff to marketing agent if the task is related to marketing."
-)
+# Optional JSON file of {"agent name": "instructions"}; edits are picked up without a restart
+INSTRUCTIONS_FILE = os.getenv("AGENT_INSTRUCTIONS_FILE", "agent_instructions.json")
+
+web_dev = registry.get("Web Developer Expert")
+mobile_dev = registry.get("Mobile App Developer Expert")
+marketing = registry.get("Marketing Expert Agent")
+
+def new_memory():
+    """Conversation memory for one chat session; pass memory.input_for(text) as user_input."""
+    return ConversationMemory.from_env(model)
+
 async def myAgent(user_input):
-    manager = Agent(
-        name="Manager",
-        instructions="You will chat with the user and delegate tasks to specialized agents based on their requests.",
-        model=model,
-        handoffs=[web_dev, mobile_dev, marketing]
-    )
+    registry.load_overrides(INSTRUCTIONS_FILE)
+    manager = registry.get("Manager")
 
     response = await Runner.run(
         manager,
         input=user_input
     )
     
-    return response.final_output
\ No newline at end of file
+    return response.final_output
+
+async def myAgentStream(user_input):
+    """Like myAgent, but yields ("token", text) and ("handoff", agent name) events as they arrive."""
+    registry.load_overrides(INSTRUCTIONS_FILE)
+    manager = registry.get("Manager")
+
+    result = Runner.run_streamed(
+        manager,
+        input=user_input
+    )
+    async for event in stream_events(result):
+        yield event
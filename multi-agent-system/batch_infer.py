@@ -0,0 +1,228 @@
+# type: ignore
+"""Run a JSONL file of prompts through an agent.
+
+    python batch_infer.py prompts.jsonl results.jsonl --workers 16
+
+Each input line is {"id": ..., "prompt": "..."} (or just a JSON string; the
+id then defaults to the line number). Results are appended to the output
+file as they finish, one {"id", "prompt", "output"} or {"id", "prompt",
+"error"} line each, so a crashed or interrupted job can be re-run with the
+same arguments and only the rows without a successful result are sent again.
+If a row appears more than once in the output, the last line wins.
+
+Alongside the output, <output>.ckpt records how far into the input every row
+has succeeded, so a resume seeks straight past that prefix.
+
+--target picks the async function to call, as module:function taking the
+prompt and returning the answer (default: this app's myAgent).
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import sys
+import time
+
+DEFAULT_TARGET = "agent:myAgent"
+
+
+def load_target(spec: str):
+    module_name, _, attr = spec.partition(":")
+    return getattr(importlib.import_module(module_name), attr or "myAgent")
+
+
+def count_lines(path: str) -> int:
+    with open(path, "rb") as f:
+        return sum(chunk.count(b"\n") for chunk in iter(lambda: f.read(1 << 20), b""))
+
+
+def read_done(output_path: str) -> set:
+    """ids with a successful result already in the output file."""
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # a line cut short by a crash
+            if "output" in row:
+                done.add(row["id"])
+            else:
+                done.discard(row["id"])
+    return done
+
+
+def repair_tail(output_path: str):
+    """Drop a partial last line left by a crash, so new results start on a fresh line."""
+    if not os.path.exists(output_path):
+        return
+    with open(output_path, "rb+") as f:
+        data = f.read()
+        if data and not data.endswith(b"\n"):
+            f.truncate(data.rfind(b"\n") + 1)
+
+
+class Checkpoint:
+    """Input offset below which every row has a successful result (rows finish out of order).
+
+    A failed row holds the checkpoint back, so a resume reads on from there and retries it.
+    """
+
+    def __init__(self, path: str, input_path: str):
+        self.path = path
+        self.input_path = input_path
+        self.offset = 0
+        self.line = 0
+        self._finished = {}  # line number -> offset just past that line
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                saved = json.load(f)
+            if saved.get("input") == os.path.abspath(input_path):
+                self.offset, self.line = saved["offset"], saved["line"]
+
+    def finish(self, line: int, end_offset: int):
+        self._finished[line] = end_offset
+        while self.line in self._finished:
+            self.offset = self._finished.pop(self.line)
+            self.line += 1
+
+    def save(self):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"input": os.path.abspath(self.input_path), "offset": self.offset, "line": self.line}, f)
+        os.replace(tmp, self.path)
+
+
+def parse_row(raw: bytes, line: int, field: str):
+    row = json.loads(raw)
+    if isinstance(row, str):
+        return line, row
+    return row.get("id", line), row[field]
+
+
+class Progress:
+    def __init__(self, total: int, interval: float):
+        self.total = total
+        self.interval = interval
+        self.done = 0
+        self.failed = 0
+        self.skipped = 0
+        self.started = time.monotonic()
+        self._last_report = 0.0
+
+    def report(self, force=False):
+        now = time.monotonic()
+        if not force and now - self._last_report < self.interval:
+            return
+        self._last_report = now
+        elapsed = now - self.started
+        rate = self.done / elapsed if elapsed else 0.0
+        remaining = self.total - self.skipped - self.done
+        eta = f"{remaining / rate:.0f}s" if rate else "?"
+        print(
+            f"\r{self.skipped + self.done}/{self.total} rows | {rate:.1f} rows/s | "
+            f"{self.failed} failed | eta {eta}   ",
+            end="", file=sys.stderr, flush=True,
+        )
+
+
+async def run(args, target):
+    repair_tail(args.output)
+    done = read_done(args.output)
+    checkpoint = Checkpoint(args.output + ".ckpt", args.input)
+    progress = Progress(count_lines(args.input), args.progress_every)
+    progress.skipped = checkpoint.line
+
+    queue = asyncio.Queue(maxsize=args.workers * 2)
+    out = open(args.output, "a", encoding="utf-8")
+    unsynced = 0
+
+    def write(line, end_offset, record):
+        nonlocal unsynced
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        if "output" in record:
+            checkpoint.finish(line, end_offset)
+        unsynced += 1
+        if unsynced >= args.sync_every:
+            out.flush()
+            os.fsync(out.fileno())
+            checkpoint.save()  # only after the results it covers are on disk
+            unsynced = 0
+
+    async def worker():
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            line, end_offset, row_id, prompt = item
+            try:
+                output = await asyncio.wait_for(target(prompt), args.timeout)
+            except Exception as e:
+                progress.failed += 1
+                record = {"id": row_id, "prompt": prompt, "error": f"{type(e).__name__}: {e}"}
+            else:
+                record = {"id": row_id, "prompt": prompt, "output": output}
+            progress.done += 1
+            write(line, end_offset, record)
+            progress.report()
+
+    workers = [asyncio.create_task(worker()) for _ in range(args.workers)]
+    try:
+        # readline rather than iteration, so f.tell() gives each row's end offset
+        with open(args.input, "rb") as f:
+            f.seek(checkpoint.offset)
+            line = checkpoint.line
+            while raw := f.readline():
+                end_offset = f.tell()
+                if not raw.strip():
+                    checkpoint.finish(line, end_offset)
+                    progress.skipped += 1
+                else:
+                    try:
+                        row_id, prompt = parse_row(raw, line, args.field)
+                    except (json.JSONDecodeError, KeyError, TypeError) as e:
+                        progress.failed += 1
+                        progress.done += 1
+                        write(line, end_offset, {"id": line, "error": f"bad input line: {e}"})
+                    else:
+                        if row_id in done:
+                            checkpoint.finish(line, end_offset)
+                            progress.skipped += 1
+                        else:
+                            await queue.put((line, end_offset, row_id, prompt))
+                line += 1
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+    finally:
+        for task in workers:
+            task.cancel()
+        out.flush()
+        os.fsync(out.fileno())
+        out.close()
+        checkpoint.save()
+        progress.report(force=True)
+        print(file=sys.stderr)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a JSONL file of prompts through an agent.")
+    parser.add_argument("input", help="JSONL file of prompts")
+    parser.add_argument("output", help="JSONL file results are appended to")
+    parser.add_argument("--target", default=DEFAULT_TARGET, help="async module:function(prompt) to call")
+    parser.add_argument("--field", default="prompt", help="input field holding the prompt")
+    parser.add_argument("--workers", type=int, default=16, help="prompts in flight at once")
+    parser.add_argument("--timeout", type=float, default=120.0, help="seconds per prompt before it counts as failed")
+    parser.add_argument("--sync-every", type=int, default=20, help="results between fsync + checkpoint")
+    parser.add_argument("--progress-every", type=float, default=1.0, help="seconds between progress lines")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, os.getcwd())
+    asyncio.run(run(args, load_target(args.target)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#type:ignore
+"""Micro-benchmark: per-request agent setup, rebuilt every call vs. AgentRegistry.
+
+"rebuild" does what myAgent used to do on every message: construct the Manager
+Agent and let the Runner turn each handoff Agent into a Handoff (tool schema
+and all). "registry" is the current hot path: check the overrides file and
+look the Manager up by config hash. No model calls are made.
+
+    uv run bench_registry.py
+"""
+import time
+
+from agents import Agent, AsyncOpenAI, OpenAIChatCompletionsModel, handoff
+
+from agent_registry import AgentRegistry, AgentSpec
+
+N = 5_000
+
+model = OpenAIChatCompletionsModel(model="gemini-2.0-flash-exp", openai_client=AsyncOpenAI(api_key="bench"))
+
+SPECIALISTS = [
+    AgentSpec("Web Developer Expert", "Build responsive and performant websites using modern frameworks.",
+              "handoff to web developer if the task is related to web development."),
+    AgentSpec("Mobile App Developer Expert", "Develop cross-platform mobile apps for iOS and Android.",
+              "handoff to mobile app developer if the task is related to mobile apps."),
+    AgentSpec("Marketing Expert Agent", "Create and execute marketing strategies for product launches.",
+              "handoff to marketing agent if the task is related to marketing."),
+]
+MANAGER = AgentSpec(
+    "Manager",
+    "You will chat with the user and delegate tasks to specialized agents based on their requests.",
+    handoffs=tuple(s.name for s in SPECIALISTS),
+)
+
+specialists = [
+    Agent(name=s.name, instructions=s.instructions, handoff_description=s.handoff_description, model=model)
+    for s in SPECIALISTS
+]
+
+
+def rebuild():
+    manager = Agent(name=MANAGER.name, instructions=MANAGER.instructions, model=model, handoffs=specialists)
+    return manager, [handoff(a) for a in manager.handoffs]
+
+
+registry = AgentRegistry(model)
+registry.register(*SPECIALISTS, MANAGER)
+
+
+def from_registry():
+    registry.load_overrides("agent_instructions.json")
+    return registry.get("Manager")
+
+
+def bench(label, fn):
+    fn()
+    start = time.perf_counter()
+    for _ in range(N):
+        fn()
+    per_call = (time.perf_counter() - start) / N * 1e6
+    print(f"{label:<10} {per_call:>10.1f} us/request")
+    return per_call
+
+
+if __name__ == "__main__":
+    before = bench("rebuild", rebuild)
+    after = bench("registry", from_registry)
+    print(f"setup cost removed from hot path: {before - after:.1f} us/request ({before / after:.0f}x)")
@@ -0,0 +1,77 @@
+#type:ignore
+"""Load test for the Chainlit serving path.
+
+Simulates N concurrent users, each firing a few messages at once through
+RunLimiter, and prints throughput per user count. Replies take a varying
+time, so a user's messages only complete in the order sent if RunLimiter
+really runs each session's messages one at a time; the run fails if not. By default the agent is a
+stand-in that sleeps for a Gemini-like latency; pass --real to call myAgent.
+
+    uv run load_test.py
+    uv run load_test.py --users 1 5 10 50 --messages 3 --latency 0.8
+    uv run load_test.py --real --users 1 2 4
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from serving import RunLimiter
+
+
+async def fake_agent(user_input, latency):
+    await asyncio.sleep(random.uniform(latency * 0.5, latency * 1.5))
+    return f"echo: {user_input}"
+
+
+async def user_session(limiter, session_id, messages, agent_fn, order_log):
+    async def send(i):
+        reply = await limiter.run(session_id, agent_fn, f"{session_id} message {i}")
+        order_log.append((session_id, i))
+        return reply
+
+    # All at once, like a user typing faster than the agent answers
+    return await asyncio.gather(*(send(i) for i in range(messages)))
+
+
+async def run_level(users, messages, agent_fn, max_concurrent):
+    limiter = RunLimiter(max_concurrent)
+    order_log = []
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        user_session(limiter, f"user-{u}", messages, agent_fn, order_log)
+        for u in range(users)
+    ))
+    elapsed = time.perf_counter() - start
+
+    # Per-session ordering: every user's messages must complete in the order sent
+    for u in range(users):
+        seen = [i for sid, i in order_log if sid == f"user-{u}"]
+        assert seen == sorted(seen), f"user-{u} messages completed out of order: {seen}"
+
+    return users * messages / elapsed, elapsed
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, nargs="+", default=[1, 5, 10, 25, 50])
+    parser.add_argument("--messages", type=int, default=3, help="messages per user")
+    parser.add_argument("--latency", type=float, default=0.5, help="simulated model latency in seconds")
+    parser.add_argument("--max-concurrent", type=int, default=32)
+    parser.add_argument("--real", action="store_true", help="call myAgent instead of the stand-in")
+    args = parser.parse_args()
+
+    if args.real:
+        from agent import myAgent
+        agent_fn = myAgent
+    else:
+        agent_fn = lambda text: fake_agent(text, args.latency)
+
+    print(f"{'users':>6} {'msgs':>6} {'seconds':>9} {'msg/s':>8}")
+    for users in args.users:
+        throughput, elapsed = await run_level(users, args.messages, agent_fn, args.max_concurrent)
+        print(f"{users:>6} {users * args.messages:>6} {elapsed:>9.2f} {throughput:>8.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,18 +1,62 @@
 #type:ignore
-from agent import myAgent
+from agent import myAgent, myAgentStream, new_memory
+from serving import RunLimiter
+from provider import warm_up
+from streaming import stream_to_message
+from session_store import open_store
+from metrics import install as install_metrics
 import chainlit as cl
-import asyncio
+import os
+
+# Stream tokens into the reply as they arrive; STREAMING=0 waits for the full answer
+STREAMING = os.getenv("STREAMING", "1") == "1"
+
+limiter = RunLimiter()
+
+# Prometheus histograms on http://127.0.0.1:9464/metrics (METRICS_PORT=0 turns it off)
+install_metrics()
+
+# Shared across workers and restarts when SESSION_STORE is set, see session_store.py
+store = open_store()
+
+async def session_memory():
+    """This chat's memory; on another worker or after a restart it is loaded from the store."""
+    memory = cl.user_session.get("memory")
+    if memory is None:
+        memory = new_memory()
+        if store is not None:
+            key = cl.context.session.thread_id
+            state = await store.load(key)
+            if state:
+                memory.restore(state)
+            memory.on_change = lambda m: store.save(key, m.snapshot())
+        cl.user_session.set("memory", memory)
+    return memory
 
 @cl.on_chat_start
 async def on_chat_start():
     await cl.Message(
         content="Welcome to the Multi-Agent System! How can I assist you today?"
     ).send()
+    # Earlier turns of this chat, kept inside a token budget (see memory.py)
+    await session_memory()
+    # Open pooled connections while the user reads the welcome message
+    await warm_up()
+
+async def reply(user_input):
+    memory = await session_memory()
+    turn_input = memory.input_for(user_input)
+    if STREAMING:
+        response = await stream_to_message(myAgentStream(turn_input), cl.Message(content=""))
+    else:
+        response = await myAgent(turn_input)
+        await cl.Message(
+            content=f"{response}"
+        ).send()
+    memory.add(user_input, response)
 
 @cl.on_message
 async def main(message: cl.Message):
     user_input = message.content
-    response = asyncio.run(myAgent(user_input))
-    await cl.Message(
-        content=f"{response}"
-    ).send()
\ No newline at end of file
+    # Await the run on Chainlit's own loop; the limiter keeps one user's messages in order
+    await limiter.run(cl.context.session.id, reply, user_input)
@@ -0,0 +1,320 @@
+#type:ignore
+"""Process-wide rate limiting for model calls.
+
+provider.get_model() wraps every model in RateLimitedModel, so all agents in
+the process share:
+
+- two token buckets, one for requests/min and one for tokens/min. A call
+  reserves an estimate of its tokens up front (prompt characters / 4 plus
+  max_tokens) and the bucket is corrected with the real usage afterwards.
+- an AIMD concurrency limit: every 429 or 5xx halves the number of calls
+  allowed in flight (at most once per `cooldown` seconds, so one burst of
+  errors counts once), and every success adds 1/limit back, i.e. about +1
+  per limit's worth of successes.
+- coordinated retries: a 429 pauses the buckets for everyone until its
+  Retry-After (or a backoff) has passed, then the call retries through the
+  same queue. The OpenAI client's own retries are turned off so they can't
+  bypass this.
+
+Tune with environment variables:
+
+    RATE_LIMIT               "0" turns it all off                     (1)
+    RATE_LIMIT_RPM           requests per minute                      (1000)
+    RATE_LIMIT_TPM           tokens per minute                        (1000000)
+    RATE_LIMIT_BURST_S       seconds of quota a quiet bucket can save up (10)
+    RATE_LIMIT_CONCURRENCY   max calls in flight; AIMD works below it (64)
+    RATE_LIMIT_RETRIES       retries after a 429/5xx                  (4)
+
+limiter_stats() reports queue depth, current limits and error counts.
+"""
+import asyncio
+import json
+import os
+import random
+import time
+
+import openai
+from agents.models.interface import Model
+
+ENABLED = os.getenv("RATE_LIMIT", "1") != "0"
+RPM = float(os.getenv("RATE_LIMIT_RPM", "1000"))
+TPM = float(os.getenv("RATE_LIMIT_TPM", "1000000"))
+BURST_SECONDS = float(os.getenv("RATE_LIMIT_BURST_S", "10"))
+MAX_CONCURRENCY = int(os.getenv("RATE_LIMIT_CONCURRENCY", "64"))
+RETRIES = int(os.getenv("RATE_LIMIT_RETRIES", "4"))
+
+DEFAULT_MAX_TOKENS = 1024  # assumed output size when model_settings doesn't set max_tokens
+
+
+class TokenBucket:
+    """Refills at `per_minute`/60 per second, saving up at most `burst_seconds` worth.
+
+    acquire() waits in FIFO order, so a big request can't be starved by small ones.
+    """
+
+    def __init__(self, per_minute: float, burst_seconds: float = BURST_SECONDS):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.available = self.capacity
+        self.paused_until = 0.0
+        self.waiting = 0
+        self._updated = time.monotonic()
+        self._loop = None
+        self._lock = None
+
+    def _refill(self):
+        now = time.monotonic()
+        self.available = min(self.capacity, self.available + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self, amount: float = 1.0):
+        amount = min(amount, self.capacity)  # an oversized request still gets through, just alone
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:  # scripts that call asyncio.run() more than once
+            self._loop, self._lock = loop, asyncio.Lock()
+        self.waiting += 1
+        try:
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    if now < self.paused_until:
+                        await asyncio.sleep(self.paused_until - now)
+                        continue
+                    self._refill()
+                    if self.available >= amount:
+                        self.available -= amount
+                        return
+                    await asyncio.sleep((amount - self.available) / self.rate)
+        finally:
+            self.waiting -= 1
+
+    def adjust(self, delta: float):
+        """Give back (positive) or charge (negative) tokens once the real cost is known; may go into debt."""
+        self._refill()
+        self.available = min(self.capacity, self.available + delta)
+
+    def pause(self, seconds: float):
+        self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+
+class AimdLimiter:
+    """Concurrency limit that halves on overload and creeps back up on success."""
+
+    def __init__(self, max_limit: int, min_limit: int = 1, decrease=0.5, cooldown=1.0):
+        self.max_limit = max_limit
+        self.min_limit = min_limit
+        self.decrease = decrease
+        self.cooldown = cooldown
+        self.limit = float(max_limit)
+        self.in_flight = 0
+        self.waiting = 0
+        self._last_decrease = 0.0
+        self._loop = None
+        self._changed = None
+
+    async def acquire(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:  # scripts that call asyncio.run() more than once
+            self._loop, self._changed = loop, asyncio.Condition()
+        self.waiting += 1
+        try:
+            async with self._changed:
+                await self._changed.wait_for(lambda: self.in_flight < int(self.limit))
+                self.in_flight += 1
+        finally:
+            self.waiting -= 1
+
+    async def release(self, outcome: str):
+        """outcome: "success", "overload" (429/5xx) or "other" (leaves the limit alone)."""
+        async with self._changed:
+            self.in_flight -= 1
+            if outcome == "success":
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+            elif outcome == "overload":
+                now = time.monotonic()
+                if now - self._last_decrease >= self.cooldown:
+                    self._last_decrease = now
+                    self.limit = max(self.min_limit, self.limit * self.decrease)
+            self._changed.notify_all()
+
+
+def _is_overload(error: Exception) -> bool:
+    return isinstance(error, openai.RateLimitError) or (
+        isinstance(error, openai.APIStatusError) and error.status_code >= 500
+    )
+
+
+def _retry_after(error: Exception) -> float | None:
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+def estimate_tokens(system_instructions, input, model_settings) -> int:
+    text = (system_instructions or "") + (input if isinstance(input, str) else json.dumps(input, default=str))
+    return len(text) // 4 + (model_settings.max_tokens or DEFAULT_MAX_TOKENS)
+
+
+class RateLimiter:
+    """The shared buckets, concurrency limit and retry policy."""
+
+    def __init__(self, rpm=RPM, tpm=TPM, max_concurrency=MAX_CONCURRENCY, retries=RETRIES,
+                 burst_seconds=BURST_SECONDS, backoff_base=0.5, backoff_max=20.0):
+        self.requests = TokenBucket(rpm, burst_seconds)
+        self.tokens = TokenBucket(tpm, burst_seconds)
+        self.concurrency = AimdLimiter(max_concurrency)
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.calls = 0
+        self.rate_limited = 0
+        self.server_errors = 0
+        self.retried = 0
+
+    async def _admit(self, estimate: int):
+        await self.requests.acquire(1)
+        await self.tokens.acquire(estimate)
+        await self.concurrency.acquire()
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def _on_error(self, error: Exception, attempt: int, estimate: int) -> float | None:
+        """Count the error and refund its tokens. Seconds to wait before retrying, or None to give up.
+
+        A 429 pauses the buckets for every caller instead of just this one.
+        """
+        self.tokens.adjust(estimate)  # rejected calls don't spend tokens
+        if not _is_overload(error):
+            return None
+        if isinstance(error, openai.RateLimitError):
+            self.rate_limited += 1
+            delay = _retry_after(error)
+            delay = self._backoff(attempt) if delay is None else delay
+            self.requests.pause(delay)
+            self.tokens.pause(delay)
+            delay = 0.0  # the pause does the waiting
+        else:
+            self.server_errors += 1
+            delay = self._backoff(attempt)
+        if attempt >= self.retries:
+            return None
+        self.retried += 1
+        return delay
+
+    async def call(self, estimate: int, fn):
+        """Run `await fn()` under the limits, retrying 429/5xx. fn's result should carry .usage."""
+        for attempt in range(self.retries + 1):
+            await self._admit(estimate)
+            self.calls += 1
+            outcome = "other"
+            try:
+                response = await fn()
+                outcome = "success"
+            except Exception as e:
+                if _is_overload(e):
+                    outcome = "overload"
+                delay = self._on_error(e, attempt, estimate)
+                if delay is None:
+                    raise
+            finally:
+                await self.concurrency.release(outcome)
+            if outcome == "success":
+                usage = getattr(response, "usage", None)
+                if usage is not None and usage.total_tokens:
+                    self.tokens.adjust(estimate - usage.total_tokens)
+                return response
+            await asyncio.sleep(delay)  # outside the slot, so waiting doesn't hold concurrency
+
+    async def stream(self, estimate: int, open_stream):
+        """Like call(), for a stream. Retries only while nothing has been yielded yet."""
+        for attempt in range(self.retries + 1):
+            await self._admit(estimate)
+            self.calls += 1
+            outcome = "other"
+            started = False
+            used = None
+            try:
+                async for event in open_stream():
+                    started = True
+                    response = getattr(event, "response", None)
+                    if getattr(response, "usage", None) is not None:
+                        used = response.usage.total_tokens
+                    yield event
+                outcome = "success"
+            except Exception as e:
+                if _is_overload(e):
+                    outcome = "overload"
+                delay = None if started else self._on_error(e, attempt, estimate)
+                if delay is None:
+                    raise
+            finally:
+                await self.concurrency.release(outcome)
+            if outcome == "success":
+                if used:
+                    self.tokens.adjust(estimate - used)
+                return
+            await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        self.requests._refill()
+        self.tokens._refill()
+        return {
+            "queued": self.requests.waiting + self.tokens.waiting + self.concurrency.waiting,
+            "in_flight": self.concurrency.in_flight,
+            "concurrency_limit": int(self.concurrency.limit),
+            "rpm_limit": round(self.requests.rate * 60),
+            "tpm_limit": round(self.tokens.rate * 60),
+            "requests_available": int(self.requests.available),
+            "tokens_available": int(self.tokens.available),
+            "paused_s": max(0.0, self.requests.paused_until - time.monotonic()),
+            "calls": self.calls,
+            "rate_limited": self.rate_limited,
+            "server_errors": self.server_errors,
+            "retried": self.retried,
+        }
+
+
+class RateLimitedModel(Model):
+    """Any Model, with its calls going through a RateLimiter."""
+
+    def __init__(self, inner: Model, limiter: "RateLimiter"):
+        self.inner = inner
+        self.limiter = limiter
+
+    @property
+    def model(self):
+        # the wrapped model's name, so cache keys and logs don't change
+        return getattr(self.inner, "model", type(self.inner).__name__)
+
+    async def get_response(self, system_instructions, input, model_settings, *args, **kwargs):
+        estimate = estimate_tokens(system_instructions, input, model_settings)
+        return await self.limiter.call(
+            estimate,
+            lambda: self.inner.get_response(system_instructions, input, model_settings, *args, **kwargs),
+        )
+
+    def stream_response(self, system_instructions, input, model_settings, *args, **kwargs):
+        estimate = estimate_tokens(system_instructions, input, model_settings)
+        return self.limiter.stream(
+            estimate,
+            lambda: self.inner.stream_response(system_instructions, input, model_settings, *args, **kwargs),
+        )
+
+
+_limiter: RateLimiter | None = None
+
+
+def get_limiter() -> RateLimiter:
+    """The process-wide limiter. Built on first use."""
+    global _limiter
+    if _limiter is None:
+        _limiter = RateLimiter()
+    return _limiter
+
+
+def limiter_stats() -> dict:
+    return get_limiter().stats() if ENABLED else {}
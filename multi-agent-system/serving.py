@@ -0,0 +1,43 @@
+import asyncio
+import os
+
+# Max agent runs in flight per process (each one holds a Gemini request open)
+MAX_CONCURRENT_RUNS = int(os.getenv("MAX_CONCURRENT_RUNS", "32"))
+
+
+class RunLimiter:
+    """Bounds concurrent agent runs per process and keeps each session's runs in order.
+
+    A session waits on its own lock first and only then takes a global slot,
+    so a user who fires several messages queues behind themselves without
+    parking extra slots that other users could be using.
+    """
+
+    def __init__(self, max_concurrent: int = MAX_CONCURRENT_RUNS):
+        self.max_concurrent = max_concurrent
+        self._slots = asyncio.Semaphore(max_concurrent)
+        self._session_locks: dict[str, asyncio.Lock] = {}
+        self._session_waiters: dict[str, int] = {}
+        self.in_flight = 0
+
+    @property
+    def queued(self) -> int:
+        return sum(self._session_waiters.values()) - self.in_flight
+
+    async def run(self, session_id: str, fn, *args, **kwargs):
+        lock = self._session_locks.setdefault(session_id, asyncio.Lock())
+        self._session_waiters[session_id] = self._session_waiters.get(session_id, 0) + 1
+        try:
+            async with lock:
+                async with self._slots:
+                    self.in_flight += 1
+                    try:
+                        return await fn(*args, **kwargs)
+                    finally:
+                        self.in_flight -= 1
+        finally:
+            # Drop the lock once nobody from this session is waiting on it
+            self._session_waiters[session_id] -= 1
+            if self._session_waiters[session_id] == 0:
+                del self._session_waiters[session_id]
+                del self._session_locks[session_id]
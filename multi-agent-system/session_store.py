@@ -0,0 +1,319 @@
+#type:ignore
+"""Session state shared across worker processes and restarts.
+
+Two backends with the same small interface:
+
+    state = await store.load(session_id)   # dict or None
+    store.save(session_id, state)          # returns at once, written behind
+    await store.flush()                    # wait until saved writes are durable
+    store.close()
+
+SqliteSessionStore keeps a WAL-mode SQLite file that several processes on
+one host can share. save() only puts the encoded state in a dict (the
+latest state per session wins) and a writer thread commits everything
+queued in one transaction every `flush_interval` seconds. Loads run in
+worker threads with their own connections, and see queued writes first.
+
+RedisSessionStore speaks RESP to Redis (or to ../mock-server/redis_standin.py
+locally) over one pipelined connection: save() writes a SET into the
+socket buffer without waiting for the reply, load() sends a GET and awaits
+only its own reply.
+
+    SESSION_STORE   off (in-process only) | sqlite:sessions.db | redis://127.0.0.1:6379/0
+    SESSION_TTL     seconds a session is kept after its last save   (604800)
+"""
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+SESSION_STORE = os.getenv("SESSION_STORE", "")
+SESSION_TTL = float(os.getenv("SESSION_TTL", str(7 * 24 * 3600)))
+
+
+def _encode(state: dict) -> bytes:
+    return json.dumps(state, separators=(",", ":")).encode()
+
+
+class SqliteSessionStore:
+    def __init__(self, path: str, ttl=SESSION_TTL, flush_interval=0.05, max_batch=512):
+        self.path = path
+        self.ttl = ttl
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._queued: dict[str, bytes] = {}
+        self._writing: dict[str, bytes] = {}  # taken by the writer, not committed yet
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._local = threading.local()
+        self._connections = []
+        self._writer = self._connect()
+        self._writer.execute(
+            "CREATE TABLE IF NOT EXISTS sessions (id TEXT PRIMARY KEY, expires_at REAL, state BLOB)"
+        )
+        self._writer.commit()
+        self._last_sweep = time.time()
+        self.saves = 0
+        self.loads = 0
+        self.batches = 0
+        self.rows_written = 0
+        self._thread = threading.Thread(target=self._run, name="session-store", daemon=True)
+        self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL: a commit survives a process crash; only a power cut can lose the last ones
+        db.execute("PRAGMA synchronous=NORMAL")
+        self._connections.append(db)
+        return db
+
+    def _reader(self) -> sqlite3.Connection:
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = self._local.db = self._connect()
+        return db
+
+    def _read(self, session_id: str):
+        row = self._reader().execute(
+            "SELECT state FROM sessions WHERE id = ? AND expires_at >= ?", (session_id, time.time())
+        ).fetchone()
+        return row[0] if row else None
+
+    async def load(self, session_id: str) -> dict | None:
+        self.loads += 1
+        with self._lock:
+            data = self._queued.get(session_id) or self._writing.get(session_id)
+        if data is None:
+            data = await asyncio.to_thread(self._read, session_id)
+        return json.loads(data) if data is not None else None
+
+    def save(self, session_id: str, state: dict):
+        data = _encode(state)
+        with self._lock:
+            self._queued[session_id] = data
+            queued = len(self._queued)
+        self.saves += 1
+        if queued >= self.max_batch:
+            self._wake.set()
+
+    def _flush(self):
+        with self._flush_lock:
+            with self._lock:
+                if not self._queued:
+                    return
+                self._writing, self._queued = self._queued, {}
+            now = time.time()
+            with self._writer:
+                self._writer.executemany(
+                    "INSERT OR REPLACE INTO sessions VALUES (?, ?, ?)",
+                    [(key, now + self.ttl, data) for key, data in self._writing.items()],
+                )
+                if now - self._last_sweep > 60:
+                    self._writer.execute("DELETE FROM sessions WHERE expires_at < ?", (now,))
+                    self._last_sweep = now
+            self.batches += 1
+            self.rows_written += len(self._writing)
+            with self._lock:
+                self._writing = {}
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self._flush()
+            except sqlite3.Error:
+                # keep the batch for the next round, e.g. while another process holds the write lock
+                logger.warning("session batch write failed, retrying", exc_info=True)
+                with self._lock:
+                    self._queued = {**self._writing, **self._queued}
+                    self._writing = {}
+
+    async def flush(self):
+        await asyncio.to_thread(self._flush)
+
+    def close(self):
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout=5)
+        self._flush()
+        for db in self._connections:
+            db.close()
+
+    def stats(self) -> dict:
+        return {"saves": self.saves, "loads": self.loads, "batches": self.batches,
+                "rows_written": self.rows_written, "queued": len(self._queued)}
+
+
+class RedisError(Exception):
+    pass
+
+
+def _command(*args) -> bytes:
+    parts = [b"*%d\r\n" % len(args)]
+    for arg in args:
+        if not isinstance(arg, bytes):
+            arg = str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader):
+    line = await reader.readline()
+    if not line:
+        raise ConnectionError("connection closed")
+    kind, rest = line[:1], line[1:-2]
+    if kind == b"+":
+        return rest.decode()
+    if kind == b"-":
+        return RedisError(rest.decode())
+    if kind == b":":
+        return int(rest)
+    if kind == b"$":
+        length = int(rest)
+        if length < 0:
+            return None
+        return (await reader.readexactly(length + 2))[:-2]
+    if kind == b"*":
+        count = int(rest)
+        return None if count < 0 else [await read_reply(reader) for _ in range(count)]
+    raise RedisError(f"unexpected reply {line!r}")
+
+
+class RedisSessionStore:
+    def __init__(self, url="redis://127.0.0.1:6379/0", ttl=SESSION_TTL, prefix="session:"):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "127.0.0.1"
+        self.port = parsed.port or 6379
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.password = parsed.password
+        self.ttl = int(ttl)
+        self.prefix = prefix
+        self._writer = None
+        self._replies: deque = deque()
+        self._loop = None
+        self._connecting: asyncio.Lock | None = None
+        self.saves = 0
+        self.loads = 0
+        self.errors = 0
+
+    async def _connection(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            # a new event loop (e.g. a second asyncio.run) needs its own socket
+            self._loop, self._writer, self._connecting = loop, None, asyncio.Lock()
+            self._replies.clear()
+        if self._writer is not None:
+            return self._writer
+        async with self._connecting:
+            if self._writer is None:
+                reader, writer = await asyncio.open_connection(self.host, self.port)
+                setup = []
+                if self.password:
+                    setup.append(_command("AUTH", self.password))
+                if self.db:
+                    setup.append(_command("SELECT", self.db))
+                for command in setup:
+                    writer.write(command)
+                    reply = await read_reply(reader)
+                    if isinstance(reply, RedisError):
+                        writer.close()
+                        raise reply
+                self._writer = writer
+                loop.create_task(self._read_replies(reader, writer))
+        return self._writer
+
+    async def _read_replies(self, reader, writer):
+        """Replies come back in command order; hand each to the oldest waiting future."""
+        try:
+            while True:
+                reply = await read_reply(reader)
+                future = self._replies.popleft()
+                if future.done():
+                    continue
+                if isinstance(reply, RedisError):
+                    future.set_exception(reply)
+                else:
+                    future.set_result(reply)
+        except (ConnectionError, asyncio.IncompleteReadError, OSError) as e:
+            if self._writer is writer:
+                self._writer = None
+            while self._replies:
+                future = self._replies.popleft()
+                if not future.done():
+                    future.set_exception(ConnectionError(f"redis connection lost: {e}"))
+
+    def _send(self, writer, *args) -> asyncio.Future:
+        future = self._loop.create_future()
+        self._replies.append(future)
+        writer.write(_command(*args))
+        return future
+
+    async def execute(self, *args):
+        writer = await self._connection()
+        future = self._send(writer, *args)
+        await writer.drain()
+        return await future
+
+    async def load(self, session_id: str) -> dict | None:
+        self.loads += 1
+        data = await self.execute("GET", self.prefix + session_id)
+        return json.loads(data) if data is not None else None
+
+    def _saved(self, future):
+        if future.cancelled() or future.exception() is not None:
+            self.errors += 1
+            logger.warning("session save failed: %s", None if future.cancelled() else future.exception())
+
+    async def _save_when_connected(self, session_id, data):
+        try:
+            writer = await self._connection()
+        except OSError:
+            self.errors += 1
+            logger.warning("session save failed: redis unreachable", exc_info=True)
+            return
+        self._send(writer, "SET", self.prefix + session_id, data, "EX", self.ttl).add_done_callback(self._saved)
+
+    def save(self, session_id: str, state: dict):
+        self.saves += 1
+        data = _encode(state)
+        if self._writer is not None and self._loop is asyncio.get_running_loop():
+            self._send(self._writer, "SET", self.prefix + session_id, data, "EX", self.ttl).add_done_callback(self._saved)
+        else:
+            asyncio.get_running_loop().create_task(self._save_when_connected(session_id, data))
+
+    async def flush(self):
+        """Every save sent so far has been acknowledged once this returns."""
+        await self.execute("PING")
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def stats(self) -> dict:
+        return {"saves": self.saves, "loads": self.loads, "errors": self.errors, "in_flight": len(self._replies)}
+
+
+def open_store(spec: str = SESSION_STORE):
+    """A store for SESSION_STORE, or None when sessions stay in-process."""
+    if not spec or spec == "off":
+        return None
+    if spec.startswith("redis://"):
+        return RedisSessionStore(spec)
+    if spec.startswith("sqlite:"):
+        path = spec[len("sqlite:"):]
+        if path.startswith("//"):
+            path = path[2:]  # sqlite:///abs/path.db
+        return SqliteSessionStore(path)
+    raise ValueError(f"unknown SESSION_STORE {spec!r}")
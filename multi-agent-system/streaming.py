@@ -0,0 +1,89 @@
+#type:ignore
+"""Token streaming from Runner.run_streamed into a Chainlit message.
+
+stream_events() turns a streamed run into ("token", text) and
+("handoff", agent name) events; stream_to_message() pushes them into one
+cl.Message as they arrive and records time to first token. Handoff markers
+are for the page only: stream_to_message() returns just the agent's text,
+which is what goes into memory and caches.
+"""
+import logging
+import statistics
+import time
+
+import chainlit as cl
+from openai.types.responses import ResponseTextDeltaEvent
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+
+async def stream_events(result):
+    starting_agent = None
+    async for event in result.stream_events():
+        if event.type == "raw_response_event" and isinstance(event.data, ResponseTextDeltaEvent):
+            yield "token", event.data.delta
+        elif event.type == "agent_updated_stream_event":
+            # The first update is the starting agent itself, not a handoff
+            if starting_agent is None:
+                starting_agent = event.new_agent.name
+            else:
+                yield "handoff", event.new_agent.name
+
+
+class LatencyStats:
+    """Rolling window of latencies in seconds."""
+
+    def __init__(self, window=1000):
+        self.window = window
+        self.samples: list[float] = []
+
+    def record(self, seconds: float):
+        self.samples.append(seconds)
+        if len(self.samples) > self.window:
+            del self.samples[0]
+
+    def percentile(self, p: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+    def summary(self) -> dict:
+        return {
+            "count": len(self.samples),
+            "p50_ms": self.percentile(50) * 1000,
+            "p95_ms": self.percentile(95) * 1000,
+            "mean_ms": statistics.fmean(self.samples) * 1000 if self.samples else 0.0,
+        }
+
+
+time_to_first_token = LatencyStats()
+time_to_last_token = LatencyStats()
+
+
+async def stream_to_message(events, msg: cl.Message) -> str:
+    """Stream events into msg, then finalise it. Returns the agent's text, without handoff markers."""
+    start = time.perf_counter()
+    first_token = None
+    text = []
+    async for kind, value in events:
+        if kind == "token":
+            if first_token is None:
+                first_token = time.perf_counter() - start
+                time_to_first_token.record(first_token)
+                metrics.time_to_first_token_seconds.observe(first_token)
+            text.append(value)
+            await msg.stream_token(value)
+        elif kind == "handoff":
+            await msg.stream_token(f"\n\n*↪ handed off to {value}*\n\n")
+    await msg.send()
+
+    total = time.perf_counter() - start
+    time_to_last_token.record(total)
+    logger.info(
+        "streamed reply: ttft=%.0fms total=%.0fms (p50 ttft %.0fms)",
+        (first_token or total) * 1000, total * 1000, time_to_first_token.percentile(50) * 1000,
+    )
+    return "".join(text)
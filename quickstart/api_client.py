@@ -0,0 +1,145 @@
+# type: ignore
+"""Async client for outbound tool/API calls (e.g. the vehicle API in sir.py).
+
+One pooled httpx.AsyncClient per process, with:
+- a cap on concurrent requests per host
+- connect/read timeouts
+- retries with exponential backoff and full jitter on connection errors,
+  timeouts, 429 and 5xx
+- a per-host circuit breaker: after `failure_threshold` failed calls in a
+  row the host is skipped (CircuitOpenError) for `reset_after` seconds, then
+  a single probe call decides whether to close it again
+"""
+import asyncio
+import random
+import time
+from urllib.parse import urlsplit
+
+import httpx
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"circuit open for {host}, retry in {retry_in:.1f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=5, reset_after=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_after = reset_after
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+        self._probe_started = 0.0
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_after:
+            return "half-open"
+        return "open"
+
+    def before_call(self, host: str):
+        state = self.state
+        now = time.monotonic()
+        # a probe that never reported back (e.g. cancelled) stops blocking after reset_after
+        probe_pending = self._probing and now - self._probe_started < self.reset_after
+        if state == "open" or (state == "half-open" and probe_pending):
+            raise CircuitOpenError(host, max(0.0, self.reset_after - (now - self.opened_at)))
+        if state == "half-open":
+            self._probing = True
+            self._probe_started = now
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+        self._probing = False
+
+    def record_failure(self):
+        self.failures += 1
+        if self._probing or self.failures >= self.failure_threshold:
+            self.opened_at = time.monotonic()
+        self._probing = False
+
+
+class ApiClient:
+    def __init__(
+        self,
+        max_connections=100,
+        max_per_host=10,
+        timeout=httpx.Timeout(10.0, connect=3.0),
+        retries=3,
+        backoff_base=0.2,
+        backoff_max=5.0,
+        failure_threshold=5,
+        reset_after=30.0,
+    ):
+        self._client = httpx.AsyncClient(
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_per_host),
+        )
+        self.max_per_host = max_per_host
+        self.retries = retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._failure_threshold = failure_threshold
+        self._reset_after = reset_after
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+        self.breakers: dict[str, CircuitBreaker] = {}
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    async def request(self, method: str, url: str, **kwargs) -> httpx.Response:
+        """Send with retries. Returns the final response; raises on connection failure or open circuit."""
+        host = urlsplit(url).netloc
+        breaker = self.breakers.setdefault(host, CircuitBreaker(self._failure_threshold, self._reset_after))
+        slots = self._host_slots.setdefault(host, asyncio.Semaphore(self.max_per_host))
+
+        for attempt in range(self.retries + 1):
+            try:
+                async with slots:
+                    # checked after queueing for a slot, so waiting calls fail fast once it opens
+                    breaker.before_call(host)
+                    response = await self._client.request(method, url, **kwargs)
+            except (httpx.TransportError, httpx.TimeoutException):
+                breaker.record_failure()
+                if attempt == self.retries:
+                    raise
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    breaker.record_success()
+                    return response
+                breaker.record_failure()
+                if attempt == self.retries:
+                    return response
+                retry_after = response.headers.get("retry-after")
+                if retry_after and retry_after.isdigit():
+                    await asyncio.sleep(min(float(retry_after), self.backoff_max))
+                    continue
+            await asyncio.sleep(self._backoff(attempt))
+
+    async def post(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("POST", url, **kwargs)
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        return await self.request("GET", url, **kwargs)
+
+    async def aclose(self):
+        await self._client.aclose()
+
+
+_api_client: ApiClient | None = None
+
+
+def get_api_client() -> ApiClient:
+    """The process-wide client for outbound API calls."""
+    global _api_client
+    if _api_client is None:
+        _api_client = ApiClient()
+    return _api_client
@@ -0,0 +1,129 @@
+"""Benchmark: CommandIndex intent matching vs. the substring scan sir.py used.
+
+Generates labelled commands with typos, reordered words and filler text,
+plus off-topic inputs, and reports for both matchers how many commands were
+acted on correctly, sent back to the user to confirm, missed, or acted on
+wrongly, and commands per second. Then checks near-miss sentences that
+mention the car but aren't commands to operate it: neither matcher may act
+on any of them. No API calls.
+
+    uv run bench_commands.py
+    uv run bench_commands.py --commands 50000
+"""
+import argparse
+import random
+import time
+
+from command_index import CommandIndex
+
+INTENTS = {
+    "lock_vehicle": "lock vehicle",
+    "unlock_vehicle": "unlock vehicle",
+    "check_location": "check location",
+    "check_battery": "check battery",
+}
+FILLER = ["please", "can you", "now", "my", "the", "hey kia", "quickly", "for me"]
+ACTIONS = {"lock_vehicle", "unlock_vehicle"}
+OFF_TOPIC = ["do my math homework", "what is the weather", "play some music", "tell me a joke",
+             "book a table for two", "lock screen on my phone", "check my email"]
+# Ordinary sentences one typo away from a command; acting on them would lock or unlock the car
+NEAR_MISS = [
+    "look at my vehicle",
+    "block the vehicle",
+    "clock in the car",
+    "lick vehicle",
+    "dont lock the vehicle",
+    "don't unlock the car",
+    "the vehicle lock is broken, how do I unlock it",
+    "is the car locked",
+    "my vehicle lock light is on",
+    "I never lock my car",
+]
+
+
+def typo(word, rng):
+    if len(word) < 4:
+        return word
+    i = rng.randrange(len(word) - 1)
+    kind = rng.choice(["swap", "drop", "repeat", "replace"])
+    if kind == "swap":
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    if kind == "drop":
+        return word[:i] + word[i + 1:]
+    if kind == "repeat":
+        return word[:i] + word[i] + word[i:]
+    return word[:i] + rng.choice("abcdefghijklmnopqrstuvwxyz") + word[i + 1:]
+
+
+def make_command(rng):
+    if rng.random() < 0.2:
+        return rng.choice(OFF_TOPIC), None
+    intent, phrase = rng.choice(list(INTENTS.items()))
+    words = phrase.split()
+    if rng.random() < 0.3:
+        words.reverse()
+    if rng.random() < 0.4:
+        j = rng.randrange(len(words))
+        words[j] = typo(words[j], rng)
+    if rng.random() < 0.5:
+        words.insert(0, rng.choice(FILLER))
+    if rng.random() < 0.3:
+        words.append(rng.choice(FILLER))
+    return " ".join(words), intent
+
+
+def substring_match(text):
+    lowered = text.lower()
+    for intent, phrase in INTENTS.items():
+        if phrase in lowered:
+            return intent
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commands", type=int, default=20000)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    commands = [make_command(rng) for _ in range(args.commands)]
+    index = CommandIndex(INTENTS, aliases={"car": "vehicle"}, actions=ACTIONS)
+
+    def index_lookup(text):
+        found = index.lookup(text)
+        return (None, None) if found is None else (None, found.intent) if found.confirm else (found.intent, None)
+
+    matchers = [("substring", lambda text: (substring_match(text), None)), ("index", index_lookup)]
+    print(f"{'':<10} {'acted ok':>9} {'confirm':>9} {'missed':>9} {'wrong':>9} {'commands/s':>12}")
+    for label, matcher in matchers:
+        start = time.perf_counter()
+        predictions = [matcher(text) for text, _ in commands]
+        elapsed = time.perf_counter() - start
+        counts = {"acted ok": 0, "confirm": 0, "missed": 0, "wrong": 0}
+        for (acted, asked), (_, expected) in zip(predictions, commands):
+            if acted == expected and asked is None:
+                counts["acted ok"] += 1
+            elif acted is None and asked is not None and asked == expected:
+                counts["confirm"] += 1
+            elif acted is None:
+                counts["missed"] += 1
+            else:
+                counts["wrong"] += 1
+        print(f"{label:<10} " + " ".join(f"{n / len(commands):>9.1%}" for n in counts.values())
+              + f" {len(commands) / elapsed:>12,.0f}")
+
+    print("\nnear misses (must not act):")
+    failed = False
+    for text in NEAR_MISS:
+        results = {label: matcher(text) for label, matcher in matchers}
+        cells = []
+        for label, (acted, asked) in results.items():
+            cells.append(f"{label}: {'ACTS ' + acted if acted else 'asks ' + asked if asked else '-'}")
+            failed |= label == "index" and acted is not None
+        print(f"  {text:<48} " + "   ".join(cells))
+    if failed:
+        raise SystemExit("index acted on a near miss")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark: Aho-Corasick KeywordMatcher vs. the any(word in text) loop from deep.py.
+
+Scans a generated corpus that contains none of the keywords, so both
+approaches have to read all of it (the worst case for a guardrail that
+passes). Also times the list-input path with the corpus split into items.
+"ac" always uses the automaton; "auto" is KeywordMatcher's default, which
+keeps the loop below AUTOMATON_MIN_TERMS words.
+
+    uv run bench_keywords.py
+    uv run bench_keywords.py --mb 4 --terms 3 1000 10000
+"""
+import argparse
+import random
+import string
+import time
+
+from keyword_matcher import AUTOMATON_MIN_TERMS, KeywordMatcher
+
+
+def random_word(rng, lo=3, hi=9):
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(rng.randint(lo, hi)))
+
+
+def loop_contains(text, words):
+    lowered = text.lower()
+    return any(word in lowered for word in words)
+
+
+def loop_contains_any(items, words):
+    return any(any(word in item.lower() for word in words) for item in items)
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mb", type=float, default=1.0, help="corpus size in MB")
+    parser.add_argument("--terms", type=int, nargs="+", default=[3, 30, 100, 300, 1000, 10000])
+    parser.add_argument("--item-size", type=int, default=200, help="chars per item for the list-input path")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    vocabulary = [random_word(rng) for _ in range(5000)]
+    target = int(args.mb * 1_000_000)
+    parts, size = [], 0
+    while size < target:
+        word = rng.choice(vocabulary)
+        parts.append(word)
+        size += len(word) + 1
+    corpus = " ".join(parts)
+    items = [corpus[i:i + args.item_size] for i in range(0, len(corpus), args.item_size)]
+    # keywords end in a digit the corpus never contains, so nothing matches
+    vocabulary_set = set(vocabulary)
+
+    print(f"corpus {len(corpus) / 1e6:.1f} MB, {len(items)} list items\n")
+    print(f"automaton from {AUTOMATON_MIN_TERMS} terms\n")
+    print(f"{'terms':>6} {'compile':>9} {'loop str':>10} {'ac str':>9} {'auto str':>9}"
+          f" {'loop list':>10} {'ac list':>9} {'auto list':>10}")
+    for n in args.terms:
+        words = set()
+        while len(words) < n:
+            word = random_word(rng, 4, 10) + "0"
+            if word not in vocabulary_set:
+                words.add(word)
+        words = sorted(words)
+
+        start = time.perf_counter()
+        matcher = KeywordMatcher(words, min_terms=0)
+        compile_s = time.perf_counter() - start
+        auto = KeywordMatcher(words)
+
+        loop_str = timed(loop_contains, corpus, words)
+        ac_str = timed(matcher.contains, corpus)
+        loop_list = timed(loop_contains_any, items, words)
+        ac_list = timed(matcher.contains_any, items)
+        auto_str = timed(auto.contains, corpus)
+        auto_list = timed(auto.contains_any, items)
+        print(f"{n:>6} {compile_s:>8.3f}s {loop_str:>9.3f}s {ac_str:>8.3f}s {auto_str:>8.3f}s"
+              f" {loop_list:>9.3f}s {ac_list:>8.3f}s {auto_list:>9.3f}s")
+
+
+if __name__ == "__main__":
+    main()
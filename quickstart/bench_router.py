@@ -0,0 +1,141 @@
+# type: ignore
+"""Benchmark: FastRouter accuracy vs. the triage round trips it saves.
+
+Routes two labelled question sets with the local router: a held-out set
+written separately from the seed vocabulary in fast_router.py, and the
+prompts the quickstart scripts send. Questions it is not confident about
+count as falling back to LLM triage (label "other" means triage should
+handle it). Latency saved assumes one triage model call of
+--triage-ms per confidently routed question. No API key needed.
+
+    uv run bench_router.py
+    uv run bench_router.py --triage-ms 900 --min-margin 0.05 --verbose
+"""
+import argparse
+import time
+
+from agents import Agent
+
+from fast_router import TUTOR_EXAMPLES, FastRouter
+
+# The prompts the quickstart scripts send
+APP_PROMPTS = [
+    ("4 + 4 - 2", "Math Tutor"),
+    ("2 + 2 is?", "Math Tutor"),
+    ("plz solve Solve for x: 2x + 5 = 15", "Math Tutor"),
+    ("who was the founder of Pakistan?", "History Tutor"),
+    ("What is the capital of France?", "History Tutor"),
+    ("what is the capital of karachi?", "History Tutor"),
+    ("What is the meaning of life?", "other"),
+    ("Hello, how are you.", "other"),
+]
+
+# Held out: written separately from TUTOR_EXAMPLES, never used to tune it
+HELD_OUT = [
+    ("what is 12 times 8", "Math Tutor"),
+    ("how much is 3/4 plus 1/8", "Math Tutor"),
+    ("find the slope of the line through (1, 2) and (3, 8)", "Math Tutor"),
+    ("is 91 a prime number", "Math Tutor"),
+    ("what's the derivative of x^2", "Math Tutor"),
+    ("how do you find the area of a circle", "Math Tutor"),
+    ("convert 0.375 to a fraction", "Math Tutor"),
+    ("what is the probability of rolling two sixes", "Math Tutor"),
+    ("how many degrees are in a hexagon", "Math Tutor"),
+    ("simplify 2(x + 3) - 4x", "Math Tutor"),
+    ("what is the least common multiple of 4 and 6", "Math Tutor"),
+    ("explain long division", "Math Tutor"),
+    ("how do I calculate compound interest", "Math Tutor"),
+    ("what is the pythagorean theorem", "Math Tutor"),
+    ("integrate sin x", "Math Tutor"),
+    ("mean median and mode of 3, 7, 7, 9", "Math Tutor"),
+    ("how do logarithms work", "Math Tutor"),
+    ("what does a negative exponent mean", "Math Tutor"),
+    ("why can't you divide by zero", "Math Tutor"),
+    ("help with my geometry homework on triangles", "Math Tutor"),
+    ("who built the great wall of china", "History Tutor"),
+    ("why did the roman empire fall", "History Tutor"),
+    ("when did the berlin wall come down", "History Tutor"),
+    ("who was napoleon", "History Tutor"),
+    ("what started the first world war", "History Tutor"),
+    ("tell me about the ottoman empire", "History Tutor"),
+    ("how did the cold war end", "History Tutor"),
+    ("who ruled england in 1600", "History Tutor"),
+    ("what was the industrial revolution", "History Tutor"),
+    ("when was the partition of india", "History Tutor"),
+    ("what happened at the battle of hastings", "History Tutor"),
+    ("who were the aztecs", "History Tutor"),
+    ("what was life like in medieval europe", "History Tutor"),
+    ("who signed the declaration of independence", "History Tutor"),
+    ("how did the mughal dynasty begin", "History Tutor"),
+    ("what caused the great depression", "History Tutor"),
+    ("who was the first emperor of china", "History Tutor"),
+    ("what did the ancient egyptians believe", "History Tutor"),
+    ("when did slavery end in the united states", "History Tutor"),
+    ("what was the silk road", "History Tutor"),
+    ("write me a poem about rain", "other"),
+    ("recommend a good laptop", "other"),
+    ("what's the weather tomorrow", "other"),
+    ("translate good morning into spanish", "other"),
+    ("give me a recipe for pancakes", "other"),
+    ("how do I reset my password", "other"),
+    ("tell me a joke", "other"),
+    ("what should I name my cat", "other"),
+    ("how do I learn to code in python", "other"),
+    ("thanks, that's all", "other"),
+]
+
+QUESTION_SETS = {"held-out": HELD_OUT, "app prompts": APP_PROMPTS}
+
+
+def evaluate(router, labelled, verbose):
+    """(routed locally, correct when routed, misrouted "other" questions)."""
+    correct = wrong = 0
+    for question, label in labelled:
+        decision = router.route(question)
+        routed = decision.agent.name if decision.confident else "fallback"
+        if decision.confident:
+            if routed == label:
+                correct += 1
+            else:
+                wrong += 1
+        if verbose:
+            print(f"{routed:<14} {label:<14} score={decision.score:.2f} margin={decision.margin:.2f}  {question}")
+    return correct + wrong, correct
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--triage-ms", type=float, default=700.0, help="assumed latency of one triage model call")
+    parser.add_argument("--min-score", type=float, default=0.5)
+    parser.add_argument("--min-margin", type=float, default=0.3)
+    parser.add_argument("--verbose", action="store_true", help="print every routing decision")
+    args = parser.parse_args()
+
+    tutors = [
+        Agent(name="History Tutor", handoff_description="Specialist agent for historical questions", instructions=""),
+        Agent(name="Math Tutor", handoff_description="Specialist agent for math questions", instructions=""),
+    ]
+    router = FastRouter(tutors, examples=TUTOR_EXAMPLES, min_score=args.min_score, min_margin=args.min_margin)
+
+    for name, labelled in QUESTION_SETS.items():
+        print(f"--- {name} ({len(labelled)} questions)")
+        fast, correct = evaluate(router, labelled, args.verbose)
+        tutor_questions = sum(1 for _, label in labelled if label != "other")
+        print(f"coverage          {fast}/{len(labelled)} routed locally ({fast / len(labelled):.0%}); "
+              f"{tutor_questions} of them are tutor questions")
+        print(f"accuracy          {correct}/{fast} correct when confident ({correct / fast if fast else 0:.0%})")
+        print(f"latency saved     {correct * args.triage_ms / len(labelled):.0f} ms/question on average "
+              f"(at {args.triage_ms:.0f} ms per triage call, counting correct routes only)")
+        print()
+
+    rounds = 500
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for question, _ in HELD_OUT:
+            router.route(question)
+    route_us = (time.perf_counter() - start) / (rounds * len(HELD_OUT)) * 1e6
+    print(f"router cost       {route_us:.1f} us/question")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Precompiled intent index for fixed command sets (e.g. Kia vehicle commands).
+
+Each intent is a short phrase. Input matches an intent when every word of
+the phrase appears somewhere in it, in any order, each word allowed one typo
+(insert, delete, substitute or swap) if it's longer than three letters.
+Typo lookup uses a deletion index built at startup, so matching never
+compares the input against every vocabulary word.
+
+Intents listed in `actions` operate something for real, so a loose match
+isn't enough to act on: they act only when the phrase's words appear
+exactly (or through an alias), in order, with nothing but filler words
+("the", "my") between them, and the input has no negation ("don't",
+"not"). A looser match comes back with confirm=True, for the caller to
+ask the user first; a negated one doesn't match at all.
+"""
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+# "t" is what's left of don't, can't, won't once the apostrophe splits the word
+_NEGATIONS = frozenset({"no", "not", "never", "dont", "t"})
+_FILLER = frozenset({"the", "my", "our", "a", "this", "that", "your"})
+
+
+def _deletes(word: str) -> set[str]:
+    return {word[:i] + word[i + 1:] for i in range(len(word))}
+
+
+def _within_one_edit(a: str, b: str) -> bool:
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    if la == lb:
+        diff = [i for i in range(la) if a[i] != b[i]]
+        if len(diff) == 1:
+            return True
+        # adjacent transposition ("lcok" -> "lock")
+        return len(diff) == 2 and diff[1] == diff[0] + 1 and a[diff[0]] == b[diff[1]] and a[diff[1]] == b[diff[0]]
+    if la > lb:
+        a, b = b, a
+    # b is one longer than a: some single deletion of b must give a
+    return a in _deletes(b)
+
+
+@dataclass(frozen=True)
+class CommandMatch:
+    intent: str
+    confirm: bool = False  # an action matched only loosely: ask before doing it
+
+
+class CommandIndex:
+    def __init__(self, intents: dict[str, str], aliases: dict[str, str] | None = None, min_typo_len=4,
+                 actions=()):
+        """intents maps intent name -> phrase; aliases maps extra words onto phrase words ("car" -> "vehicle").
+
+        actions names the intents that need an exact, in-order match to act on.
+        """
+        self.min_typo_len = min_typo_len
+        self.phrases = dict(intents)
+        self.actions = frozenset(actions)
+        self._aliases = dict(aliases or {})
+        self._sequences = {name: tuple(_WORD_RE.findall(phrase.lower())) for name, phrase in intents.items()}
+        self._intents = [(name, frozenset(words)) for name, words in self._sequences.items()]
+        # longest phrases first, so the most specific intent wins
+        self._intents.sort(key=lambda item: len(item[1]), reverse=True)
+
+        self._vocabulary = set().union(*(words for _, words in self._intents)) | set(self._aliases)
+        self._by_delete: dict[str, set[str]] = {}
+        for word in self._vocabulary:
+            if len(word) >= min_typo_len:
+                for variant in _deletes(word) | {word}:
+                    self._by_delete.setdefault(variant, set()).add(word)
+        self.resolve = lru_cache(maxsize=4096)(self._resolve)
+
+    def _resolve(self, token: str) -> str | None:
+        """Vocabulary word for an input token, allowing one typo. None if it's not a command word."""
+        word = token if token in self._vocabulary else None
+        if word is None and len(token) >= self.min_typo_len:
+            candidates = set()
+            for variant in _deletes(token) | {token}:
+                candidates |= self._by_delete.get(variant, set())
+            matches = sorted(c for c in candidates if _within_one_edit(token, c))
+            word = matches[0] if len(matches) == 1 else None  # ambiguous typos don't count
+        return self._aliases.get(word, word)
+
+    def _exact(self, tokens: list[str], sequence: tuple[str, ...]) -> bool:
+        """The phrase's words appear in order, exactly or by alias, with only filler between them."""
+        words = [self._aliases.get(token, token) for token in tokens]
+        for start, word in enumerate(words):
+            if word != sequence[0]:
+                continue
+            matched = 1
+            for token, word in zip(tokens[start + 1:], words[start + 1:]):
+                if matched == len(sequence):
+                    break
+                if word == sequence[matched]:
+                    matched += 1
+                elif token not in _FILLER:
+                    break
+            if matched == len(sequence):
+                return True
+        return False
+
+    def lookup(self, text: str) -> CommandMatch | None:
+        """The matched intent, with confirm=True for an action that only matched loosely."""
+        tokens = _WORD_RE.findall(text.lower())
+        words = {self.resolve(token) for token in tokens}
+        negated = not _NEGATIONS.isdisjoint(tokens)
+        loose = None
+        for name, phrase_words in self._intents:
+            if not phrase_words <= words:
+                continue
+            if name not in self.actions:
+                return CommandMatch(name)
+            if negated:
+                continue
+            if self._exact(tokens, self._sequences[name]):
+                return CommandMatch(name)
+            loose = loose or CommandMatch(name, confirm=True)
+        return loose
+
+    def match(self, text: str) -> str | None:
+        """Name of the intent to act on, or None (including actions that need confirming)."""
+        found = self.lookup(text)
+        return found.intent if found is not None and not found.confirm else None
@@ -1,10 +1,11 @@
 import asyncio
 from pydantic import BaseModel
-from typing import Union, List
+from typing import Any, Union, List
+from keyword_matcher import KeywordMatcher
 
 # 1. Define our types (simplified versions of what might be in the agents package)
 class GuardrailFunctionOutput(BaseModel):
-    output_info: any
+    output_info: Any
     tripwire_triggered: bool
 
 class InputGuardrailResult:
@@ -20,15 +21,16 @@ class Agent:
         self.input_guardrails = input_guardrails or []
 
 # 2. Create a guardrail function
+bad_words = ["damn", "hell", "crap"]  # Simple profanity filter
+# Built once; substring matching like the original loop (a short list stays a plain loop)
+profanity_matcher = KeywordMatcher(bad_words, case_fold=True)
+
 async def profanity_guardrail(input_data: Union[str, List[str]]) -> GuardrailFunctionOutput:
     """Simple guardrail that detects bad words"""
-    bad_words = ["damn", "hell", "crap"]  # Simple profanity filter
-    
     if isinstance(input_data, str):
-        contains_profanity = any(word in input_data.lower() for word in bad_words)
+        contains_profanity = profanity_matcher.contains(input_data)
     else:
-        contains_profanity = any(any(word in item.lower() for word in bad_words) 
-                               for item in input_data)
+        contains_profanity = profanity_matcher.contains_any(input_data)
     
     return GuardrailFunctionOutput(
         output_info={"message": "Profanity check complete"},
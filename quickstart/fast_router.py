@@ -0,0 +1,125 @@
+# type: ignore
+"""Local pre-router for triage handoffs.
+
+Scores the user input against each specialist's handoff_description (plus
+optional seed vocabulary) at startup-built word lists, no model call
+involved: a specialist's score is the share of the input's words (weighted
+by IDF, unknown words at the highest weight) found in its vocabulary. When
+one specialist clearly wins, the run goes straight to it; otherwise it falls
+back to the LLM triage agent as before. Unfamiliar wording falls back, so
+coverage is modest; see bench_router.py for numbers on unseen questions.
+"""
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+
+from agents import Runner
+
+TOKEN_RE = re.compile(r"[a-z]+|\d+(?:\.\d+)?|[+\-*/^=%]")
+STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "can", "do", "for", "from", "how",
+    "i", "in", "is", "it", "me", "my", "of", "on", "or", "please", "plz", "the", "this",
+    "to", "was", "what", "who", "why", "with", "you", "your", "agent", "specialist",
+}
+
+# Seed vocabulary for the quickstart tutors; handoff_description alone is too thin to
+# score well. General words for each subject, not phrasings of expected questions
+# (bench_router.py scores the router on questions written separately from these).
+TUTOR_EXAMPLES = {
+    "Math Tutor": [
+        "math mathematics arithmetic algebra geometry calculus trigonometry statistics probability",
+        "number integer decimal fraction percentage ratio prime factor multiple exponent power root",
+        "add addition subtract subtraction multiply multiplication divide division product quotient",
+        "equation expression variable formula function graph derivative integral limit matrix",
+        "angle triangle circle area volume perimeter average mean median calculate compute",
+        "+ - * / = ^ % 0",  # symbols, and any number
+    ],
+    "History Tutor": [
+        "history historical past century decade era period ancient medieval modern",
+        "empire kingdom dynasty monarchy colony independence revolution republic",
+        "war battle army invasion conquest treaty alliance",
+        "king queen emperor ruler leader general politician",
+        "civilization culture event founded established rule reign",
+    ],
+}
+
+
+def tokenize(text: str) -> list[str]:
+    tokens = []
+    for token in TOKEN_RE.findall(text.lower()):
+        if token[0].isdigit():
+            tokens.append("<num>")
+        elif token not in STOPWORDS:
+            # crude plural folding so "questions" matches "question"
+            tokens.append(token[:-1] if len(token) > 3 and token.endswith("s") else token)
+    return tokens
+
+
+@dataclass
+class RouteDecision:
+    agent: object | None
+    score: float
+    margin: float
+
+    @property
+    def confident(self) -> bool:
+        return self.agent is not None
+
+
+class FastRouter:
+    def __init__(self, agents, examples=None, min_score=0.5, min_margin=0.3):
+        self.agents = list(agents)
+        self.min_score = min_score
+        self.min_margin = min_margin
+        self.fast_routes = 0
+        self.fallbacks = 0
+
+        examples = examples or {}
+        self._vocab = []
+        for agent in self.agents:
+            text = " ".join([agent.handoff_description or "", *examples.get(agent.name, [])])
+            self._vocab.append(set(tokenize(text)))
+
+        df = Counter(token for vocab in self._vocab for token in vocab)
+        n = len(self._vocab)
+        self._idf = {token: math.log((1 + n) / (1 + count)) + 1 for token, count in df.items()}
+        # a word no specialist knows counts as much as the most specific known word
+        self._unknown = math.log(1 + n) + 1
+
+    def scores(self, text: str) -> list[float]:
+        weights = {t: self._idf.get(t, self._unknown) for t in tokenize(text)}
+        total = sum(weights.values())
+        if not total:
+            return [0.0] * len(self.agents)
+        return [sum(w for t, w in weights.items() if t in vocab) / total for vocab in self._vocab]
+
+    def route(self, text: str) -> RouteDecision:
+        scores = self.scores(text)
+        ranked = sorted(range(len(scores)), key=scores.__getitem__, reverse=True)
+        best = scores[ranked[0]]
+        margin = best - (scores[ranked[1]] if len(ranked) > 1 else 0.0)
+        if best >= self.min_score and margin >= self.min_margin:
+            self.fast_routes += 1
+            return RouteDecision(self.agents[ranked[0]], best, margin)
+        self.fallbacks += 1
+        return RouteDecision(None, best, margin)
+
+    def stats(self) -> dict:
+        total = self.fast_routes + self.fallbacks
+        return {
+            "fast_routes": self.fast_routes,
+            "fallbacks": self.fallbacks,
+            "fast_ratio": self.fast_routes / total if total else 0.0,
+        }
+
+
+async def run_routed(triage_agent, router: FastRouter, input, **run_kwargs):
+    """Runner.run, skipping the triage round trip when the router is confident."""
+    decision = router.route(input) if isinstance(input, str) else RouteDecision(None, 0.0, 0.0)
+    return await Runner.run(decision.agent or triage_agent, input, **run_kwargs)
+
+
+def run_routed_sync(triage_agent, router: FastRouter, input, **run_kwargs):
+    decision = router.route(input) if isinstance(input, str) else RouteDecision(None, 0.0, 0.0)
+    return Runner.run_sync(decision.agent or triage_agent, input, **run_kwargs)
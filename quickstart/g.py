@@ -3,9 +3,12 @@ import asyncio
 from pydantic import BaseModel
 import os
 from dotenv import load_dotenv
-from agents import Agent,AsyncOpenAI, OpenAIChatCompletionsModel, Runner,input_guardrail, GuardrailFunctionOutput,InputGuardrailTripwireTriggered
+from agents import Agent, Runner,input_guardrail, GuardrailFunctionOutput,InputGuardrailTripwireTriggered
 
 from agents.run import RunConfig
+from provider import get_client, get_model
+from optimistic_guardrails import StageTimings, run_optimistic
+from guardrail_cache import verdict_cache
 
 # Load the environment variables from the .env file
 load_dotenv()
@@ -17,15 +20,9 @@ if not gemini_api_key:
     raise ValueError("GEMINI_API_KEY is not set. Please ensure it is defined in your .env file.")
 
 #Reference: https://ai.google.dev/gemini-api/docs/openai
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
-
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=external_client
-)
+# One pooled client per process, see provider.py
+external_client = get_client()
+model = get_model("gemini-2.0-flash")
 
 config = RunConfig(
     model=model,
@@ -43,11 +40,12 @@ check_agent = Agent(
     output_type=Mathcheck   ,
 )
 @input_guardrail
+@verdict_cache.cached(check_agent)
 async def input_check(ctx, agent, input):
-    result = await Runner.run(check_agent, input, context=ctx.context)
+    result = await Runner.run(check_agent, input, context=ctx.context, run_config=config)
     return GuardrailFunctionOutput(
         output_info=result.final_output,
-        tripwire_triggered=result.final_output.is_homework
+        tripwire_triggered=result.final_output.is_math_homework
     )
 agent = Agent(
     name="Support Agent",
@@ -55,10 +53,13 @@ agent = Agent(
     input_guardrails=[input_check],
 )
 async def main():
+    timings = StageTimings()
     try:
-        await Runner.run(agent, "can you solve 2 + 3 = 11?", run_config=config)
+        await run_optimistic(agent, "can you solve 2 + 3 = 11?", run_config=config, timings=timings)
     except InputGuardrailTripwireTriggered:
         print("Input Guardrails Trigged: Math homework Blocked because its support Agent")
+    print(timings)
+    print("Guardrail verdict cache:", verdict_cache.stats())
 
 
 
@@ -1,6 +1,26 @@
 #type:ignore
+import asyncio
+import os
+from dotenv import load_dotenv
 from pydantic import BaseModel
-from agents import Agent, Runner,output_guardrail, GuardrailFunctionOutput,InputGuardrailTripwireTrigged
+from agents import Agent, Runner,output_guardrail, GuardrailFunctionOutput,OutputGuardrailTripwireTriggered
+from agents.run import RunConfig
+from provider import get_client, get_model
+
+load_dotenv()
+
+if not os.getenv("GEMINI_API_KEY"):
+    raise ValueError("GEMINI_API_KEY is not set. Please ensure it is defined in your .env file.")
+
+# One pooled client per process, see provider.py
+external_client = get_client()
+model = get_model("gemini-2.0-flash")
+
+config = RunConfig(
+    model=model,
+    model_provider=external_client,
+    tracing_disabled=True
+)
 
 class Message(BaseModel):
     response: str
@@ -15,8 +35,8 @@ check_agent = Agent(
     output_type=MathDetected,
 )
 @output_guardrail
-async def output_check(ctx, agent, input:Message):
-    result = await Runner.run(check_agent, output.response, context=ctx.context)
+async def output_check(ctx, agent, output:Message):
+    result = await Runner.run(check_agent, output.response, context=ctx.context, run_config=config)
     return GuardrailFunctionOutput(
         output_info=result.final_output,
         tripwire_triggered=result.final_output.is_math
@@ -29,12 +49,11 @@ agent = Agent(
 )
 async def main():
     try:
-        await Runner.run(agent, "can you solve 2 + 3 = 11?")
-    except InputGuardrailTripwireTrigged:
+        result = await Runner.run(agent, "can you solve 2 + 3 = 11?", run_config=config)
+        print(result.final_output.response)
+    except OutputGuardrailTripwireTriggered:
         print("output Guardrails Trigged: Math solution  Blocked successfully")
 
 
 if __name__ == "__main__":
     asyncio.run(main())
-
-
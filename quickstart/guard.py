@@ -2,9 +2,12 @@
 import asyncio
 import os
 from dotenv import load_dotenv
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel,InputGuardrail, GuardrailFunctionOutput
+from agents import Agent, Runner,InputGuardrail, GuardrailFunctionOutput
 
 from agents.run import RunConfig
+from provider import get_client, get_model
+from optimistic_guardrails import StageTimings, run_optimistic
+from guardrail_cache import verdict_cache
 from pydantic import BaseModel
 
 # Load the environment variables from the .env file
@@ -17,15 +20,9 @@ if not gemini_api_key:
     raise ValueError("GEMINI_API_KEY is not set. Please ensure it is defined in your .env file.")
 
 #Reference: https://ai.google.dev/gemini-api/docs/openai
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
-
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=external_client
-)
+# One pooled client per process, see provider.py
+external_client = get_client()
+model = get_model("gemini-2.0-flash")
 
 config = RunConfig(
     model=model,
@@ -53,8 +50,9 @@ math_tutor_agent = Agent(
     instructions="You provide help with math problems. Explain your reasoning at each step and include examples",
 )
 
+@verdict_cache.cached(guardrail_agent)
 async def homework_guardrail(ctx, agent, input_data):
-    result = await Runner.run(guardrail_agent, input_data, context=ctx.context)
+    result = await Runner.run(guardrail_agent, input_data, context=ctx.context, run_config=config)
     final_output = result.final_output_as(HomeworkOutput)
     return GuardrailFunctionOutput(
         output_info=final_output,
@@ -70,11 +68,17 @@ triage_agent = Agent(
     ],
 )
 async def main():
-    result = await Runner.run(triage_agent, "who was the first president of the united states?", run_config=config)
+    # Guardrail and triage start together; the triage run is cancelled if the guardrail trips
+    timings = StageTimings()
+    result = await run_optimistic(triage_agent, "who was the first president of the united states?", run_config=config, timings=timings)
     print(result.final_output)
+    print(timings)
 
-    result = await Runner.run(triage_agent, "what is bodmas?", run_config=config)
+    timings = StageTimings()
+    result = await run_optimistic(triage_agent, "what is bodmas?", run_config=config, timings=timings)
     print(result.final_output)
+    print(timings)
+    print("Guardrail verdict cache:", verdict_cache.stats())
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,127 @@
+# type: ignore
+"""Verdict cache for LLM-backed guardrails.
+
+A guardrail that classifies input with its own Runner.run call gives the
+same verdict for the same text, so repeated traffic can skip the classifier.
+Verdicts are keyed by the guardrail function, the classifier agent's
+model, model settings, instructions and output_type schema, and a
+normalised fingerprint of the input, so editing the classifier invalidates
+its old verdicts and two guardrails sharing a classifier keep their own.
+Normalising folds case, punctuation and spacing but keeps operators and
+decimal points, so "2+2" and "2 2" stay different inputs.
+
+Tripped (blocked) and passed verdicts live in separate LRUs with their own
+size cap and TTL, so a burst of one kind can't evict the other and blocks
+can be re-checked sooner than passes.
+"""
+import dataclasses
+import functools
+import hashlib
+import json
+import re
+import time
+from collections import OrderedDict, defaultdict
+
+# punctuation other than operators, and dots that aren't decimal points
+_PUNCT_RE = re.compile(r"[^\w\s+\-*/=^%<>.]|\.(?!\d)")
+_OPERATOR_RE = re.compile(r"\s*([+\-*/=^%<>])\s*")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalise(input) -> str:
+    if not isinstance(input, str):
+        input = json.dumps(input, sort_keys=True, default=str)
+    text = _PUNCT_RE.sub(" ", input.casefold())
+    text = _OPERATOR_RE.sub(r" \1 ", text)
+    return _SPACE_RE.sub(" ", text).strip()
+
+
+def _model_name(agent) -> str:
+    model = agent.model
+    if model is None or isinstance(model, str):
+        return model or ""
+    return getattr(model, "model", type(model).__name__)
+
+
+def classifier_signature(agent) -> str:
+    output_type = agent.output_type
+    schema = output_type.model_json_schema() if hasattr(output_type, "model_json_schema") else repr(output_type)
+    settings = dataclasses.asdict(agent.model_settings) if dataclasses.is_dataclass(agent.model_settings) else None
+    return json.dumps([_model_name(agent), settings,
+                       agent.instructions if isinstance(agent.instructions, str) else repr(agent.instructions), schema],
+                      sort_keys=True, default=str)
+
+
+class _Lru:
+    def __init__(self, max_entries, ttl):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.entries: OrderedDict[str, tuple[float, object]] = OrderedDict()
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key, value):
+        self.entries[key] = (time.monotonic() + self.ttl, value)
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+class VerdictCache:
+    def __init__(self, max_passed=4096, max_tripped=1024, ttl_passed=3600.0, ttl_tripped=600.0):
+        self._passed = _Lru(max_passed, ttl_passed)
+        self._tripped = _Lru(max_tripped, ttl_tripped)
+        self._hits = defaultdict(int)
+        self._misses = defaultdict(int)
+
+    def key(self, guardrail: str, classifier_agent, input) -> str:
+        raw = guardrail + "\0" + classifier_signature(classifier_agent) + "\0" + normalise(input)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def cached(self, classifier_agent):
+        """Decorator for guardrail functions (ctx, agent, input) -> GuardrailFunctionOutput.
+
+        Put it under @input_guardrail so the guardrail keeps the function's name.
+        """
+        def decorator(fn):
+            # the verdict is fn's output, not the classifier's, so it's part of the key
+            name = f"{fn.__module__}.{fn.__qualname__}"
+
+            @functools.wraps(fn)
+            async def wrapper(ctx, agent, input):
+                key = self.key(name, classifier_agent, input)
+                verdict = self._tripped.get(key) or self._passed.get(key)
+                if verdict is not None:
+                    self._hits[name] += 1
+                    return verdict
+                self._misses[name] += 1
+                verdict = await fn(ctx, agent, input)
+                (self._tripped if verdict.tripwire_triggered else self._passed).put(key, verdict)
+                return verdict
+
+            return wrapper
+
+        return decorator
+
+    def stats(self) -> dict:
+        per_guardrail = {}
+        for name in self._hits.keys() | self._misses.keys():
+            hits, misses = self._hits[name], self._misses[name]
+            per_guardrail[name] = {"hits": hits, "misses": misses, "hit_rate": hits / (hits + misses)}
+        return {
+            "passed_entries": len(self._passed.entries),
+            "tripped_entries": len(self._tripped.entries),
+            "guardrails": per_guardrail,
+        }
+
+
+# One cache for every guardrail in the process
+verdict_cache = VerdictCache()
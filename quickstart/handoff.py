@@ -2,8 +2,11 @@
 # type: ignore
 import os
 from dotenv import load_dotenv
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel
+from agents import Agent
 from agents.run import RunConfig
+from provider import get_client, get_model
+from fast_router import FastRouter, TUTOR_EXAMPLES, run_routed_sync
+from arith_fastpath import ArithmeticSolver
 
 # Load environment variables
 load_dotenv()
@@ -14,15 +17,9 @@ if not gemini_api_key:
     raise ValueError("GEMINI_API_KEY is not set in .env file")
 
 # Configure Gemini client
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
-
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=external_client
-)
+# One pooled client per process, see provider.py
+external_client = get_client()
+model = get_model("gemini-2.0-flash")
 
 config = RunConfig(
     model=model,
@@ -49,23 +46,34 @@ triage_agent = Agent(
     handoffs=[history_tutor_agent, math_tutor_agent]
 )
 
+# Confident math/history questions skip the triage model call and go straight to the tutor
+router = FastRouter([history_tutor_agent, math_tutor_agent], examples=TUTOR_EXAMPLES)
+
 # Test with a math question
 math_question = "4 + 4 - 2"
 print(f"\nAsking math question: {math_question}")
-math_result = Runner.run_sync(triage_agent, math_question, run_config=config)
+# Bare arithmetic is answered locally; anything else still goes to the tutors
+solver = ArithmeticSolver()
+answer = solver.solve_sync(math_question)
 print("\nMath Agent Response:")
-print(math_result.final_output)
+if answer is not None:
+    print(f"{math_question} = {answer}")
+else:
+    math_result = run_routed_sync(triage_agent, router, math_question, run_config=config)
+    print(math_result.final_output)
 
 # Test with a history question
 history_question = "who was the founder of Pakistan?"
 print(f"\nAsking history question: {history_question}")
-history_result = Runner.run_sync(triage_agent, history_question, run_config=config)
+history_result = run_routed_sync(triage_agent, router, history_question, run_config=config)
 print("\nHistory Agent Response:")
 print(history_result.final_output)
 
 # Test with a non-academic question
 general_question = "What is the meaning of life?"
 print(f"\nAsking general question: {general_question}")
-general_result = Runner.run_sync(triage_agent, general_question, run_config=config)
+general_result = run_routed_sync(triage_agent, router, general_question, run_config=config)
 print("\nGeneral Response:")
-print(general_result.final_output)
\ No newline at end of file
+print(general_result.final_output)
+
+print(f"\nAnswered locally: {solver.stats()}")
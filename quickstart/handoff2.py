@@ -1,8 +1,10 @@
 # type: ignore
 import os
 from dotenv import load_dotenv
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel
+from agents import Agent
 from agents.run import RunConfig
+from provider import get_client, get_model
+from fast_router import FastRouter, TUTOR_EXAMPLES, run_routed_sync
 
 # Load the environment variables from the .env file
 load_dotenv()
@@ -14,15 +16,9 @@ if not gemini_api_key:
     raise ValueError("GEMINI_API_KEY is not set. Please ensure it is defined in your .env file.")
 
 #Reference: https://ai.google.dev/gemini-api/docs/openai
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
-
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=external_client
-)
+# One pooled client per process, see provider.py
+external_client = get_client()
+model = get_model("gemini-2.0-flash")
 
 config = RunConfig(
     model=model,
@@ -53,9 +49,12 @@ triage_agent = Agent(
     handoffs=[history_tutor_agent, math_tutor_agent]
 )
 
-result = Runner.run_sync(triage_agent, "Hello, how are you.", run_config=config)
-# result = Runner.run_sync(triage_agent, "What is the capital of France?", run_config=config)
-# result = Runner.run_sync(triage_agent, "plz solve Solve for x: 2x + 5 = 15 ", run_config=config)
+# Confident math/history questions skip the triage model call and go straight to the tutor
+router = FastRouter([history_tutor_agent, math_tutor_agent], examples=TUTOR_EXAMPLES)
+
+result = run_routed_sync(triage_agent, router, "Hello, how are you.", run_config=config)
+# result = run_routed_sync(triage_agent, router, "What is the capital of France?", run_config=config)
+# result = run_routed_sync(triage_agent, router, "plz solve Solve for x: 2x + 5 = 15 ", run_config=config)
 
 print("\nCALLING AGENT\n")
 print(result.final_output)
@@ -2,8 +2,10 @@
 import os
 import asyncio
 from dotenv import load_dotenv
-from agents import Agent, Runner, AsyncOpenAI, OpenAIChatCompletionsModel
+from agents import Agent
 from agents.run import RunConfig
+from provider import get_client, get_model
+from fast_router import FastRouter, TUTOR_EXAMPLES, run_routed
 
 # Load the environment variables from the .env file
 load_dotenv()
@@ -15,15 +17,9 @@ if not gemini_api_key:
     raise ValueError("GEMINI_API_KEY is not set. Please ensure it is defined in your .env file.")
 
 #Reference: https://ai.google.dev/gemini-api/docs/openai
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
-
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=external_client
-)
+# One pooled client per process, see provider.py
+external_client = get_client()
+model = get_model("gemini-2.0-flash")
 
 config = RunConfig(
     model=model,
@@ -54,13 +50,16 @@ triage_agent = Agent(
     handoffs=[history_tutor_agent, math_tutor_agent]
 )
 
+# Confident math/history questions skip the triage model call and go straight to the tutor
+router = FastRouter([history_tutor_agent, math_tutor_agent], examples=TUTOR_EXAMPLES)
+
 
 async def main():
-    result = await Runner.run(triage_agent, "2 + 2 is?", run_config=config)
+    result = await run_routed(triage_agent, router, "2 + 2 is?", run_config=config)
     print("\nCALLING AGENT\n")
     print(result.final_output)
 
-    result = await Runner.run(triage_agent, "what is the capital of karachi?", run_config=config)
+    result = await run_routed(triage_agent, router, "what is the capital of karachi?", run_config=config)
     print("\nCALLING AGENT\n")
     print(result.final_output)
 
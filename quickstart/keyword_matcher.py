@@ -0,0 +1,130 @@
+"""Aho-Corasick keyword matcher for keyword guardrails.
+
+The word list is compiled once into an automaton, then each input is scanned
+in a single pass no matter how many words there are, instead of one
+substring search per word. List inputs are joined and scanned as one batch.
+
+For short lists the automaton is slower than plain `word in text` checks
+(pure Python per character vs C substring search; bench_keywords.py puts the
+crossover between 100 and 300 terms), so below `min_terms` words the matcher
+keeps the per-word loop. Results are the same either way.
+"""
+from collections import deque
+
+# Never part of a keyword, so matches can't run across batched items
+_ITEM_SEPARATOR = "\x00"
+AUTOMATON_MIN_TERMS = 200
+
+
+def _is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordMatcher:
+    def __init__(self, words, whole_word=False, case_fold=True, min_terms=AUTOMATON_MIN_TERMS):
+        self.whole_word = whole_word
+        self.case_fold = case_fold
+        prepared = (word.casefold() if case_fold else word for word in words)
+        self._words = tuple(dict.fromkeys(word for word in prepared if word))
+        self.uses_automaton = len(self._words) >= min_terms
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[tuple[str, ...]] = [()]
+        if self.uses_automaton:
+            self._compile()
+
+    def _compile(self):
+        for word in self._words:
+            node = 0
+            for ch in word:
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(())
+                    self._goto[node][ch] = nxt
+                node = nxt
+            self._out[node] += (word,)
+        self._build_failure_links()
+
+    def _build_failure_links(self):
+        goto, fail, out = self._goto, self._fail, self._out
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in goto[node].items():
+                queue.append(child)
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(ch, 0)
+                # inherit words that end at the fallback state ("hell" inside "shell")
+                out[child] += out[fail[child]]
+
+    def _prepare(self, text: str) -> str:
+        return text.casefold() if self.case_fold else text
+
+    def _bounded(self, text: str, end: int, word: str) -> bool:
+        start = end - len(word) + 1
+        if start > 0 and _is_word_char(text[start - 1]):
+            return False
+        return end + 1 >= len(text) or not _is_word_char(text[end + 1])
+
+    def _scan(self, text: str):
+        """(start, word) for each match, in order of where the match ends."""
+        if not self.uses_automaton:
+            yield from self._scan_words(text)
+            return
+        goto, fail, out = self._goto, self._fail, self._out
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if out[node]:
+                for word in out[node]:
+                    if not self.whole_word or self._bounded(text, i, word):
+                        yield i - len(word) + 1, word
+
+    def _scan_words(self, text: str):
+        found = []
+        for word in self._words:
+            start = text.find(word)
+            while start >= 0:
+                end = start + len(word) - 1
+                if not self.whole_word or self._bounded(text, end, word):
+                    found.append((end, -len(word), start, word))
+                start = text.find(word, start + 1)
+        for _, _, start, word in sorted(found):
+            yield start, word
+
+    def find_all(self, text: str) -> list[tuple[int, str]]:
+        """(start offset, keyword) for every match, offsets into the (case-folded) text."""
+        return list(self._scan(self._prepare(text)))
+
+    def contains(self, text: str) -> bool:
+        text = self._prepare(text)
+        if not self.uses_automaton and not self.whole_word:
+            return any(word in text for word in self._words)
+        return next(self._scan(text), None) is not None
+
+    def contains_any(self, items) -> bool:
+        """One pass over every item; stops at the first match."""
+        return self.contains(_ITEM_SEPARATOR.join(items))
+
+    def matches_per_item(self, items) -> list[list[str]]:
+        items = list(items)
+        joined = self._prepare(_ITEM_SEPARATOR.join(items))
+        # item boundaries in the prepared text (case folding can change lengths)
+        bounds, pos = [], 0
+        for part in joined.split(_ITEM_SEPARATOR):
+            bounds.append(pos + len(part))
+            pos += len(part) + 1
+        result = [[] for _ in items]
+        item = 0
+        for start, word in self._scan(joined):
+            while start > bounds[item]:
+                item += 1
+            result[item].append(word)
+        return result
@@ -11,12 +11,12 @@ from agents import (
     Runner,
     TResponseInputItem,
     input_guardrail,
-    Guardrail,
-    GuardrailTripwireTriggered,
-    AsyncOpenAI,
-    OpenAIChatCompletionsModel
+    InputGuardrailTripwireTriggered,
 )
 from agents.run import RunConfig
+from provider import get_client, get_model
+from optimistic_guardrails import StageTimings, run_optimistic
+from guardrail_cache import verdict_cache
 
 # Load the environment variables from the .env file
 load_dotenv()
@@ -28,15 +28,9 @@ if not gemini_api_key:
     raise ValueError("GEMINI_API_KEY is not set. Please ensure it is defined in your .env file.")
 
 # Reference: https://ai.google.dev/gemini-api/docs/openai
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
-
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=external_client
-)
+# One pooled client per process, see provider.py
+external_client = get_client()
+model = get_model("gemini-2.0-flash")
 
 config = RunConfig(
     model=model,
@@ -55,8 +49,9 @@ churn_direction_agent = Agent(
 )
 
 @input_guardrail
+@verdict_cache.cached(churn_direction_agent)
 async def churn_detection_tripwire(ctx: RunContextWrapper[None], agent: Agent, input: str | list[TResponseInputItem]) -> GuardrailFunctionOutput:
-    result = await Runner.run(churn_direction_agent, input, context=ctx.context, config=config)
+    result = await Runner.run(churn_direction_agent, input, context=ctx.context, run_config=config)
     return GuardrailFunctionOutput(
         output_info=result.final_output,
         tripwire_triggered=result.final_output.is_churn,
@@ -65,22 +60,26 @@ async def churn_detection_tripwire(ctx: RunContextWrapper[None], agent: Agent, i
 customer_support_agent = Agent(
     name="Customer Support Agent",
     instructions="You are a customer support agent. You help customers with their questions.",
-    input_guardrails=[
-        Guardrail(guardrail_function=churn_detection_tripwire),
-    ],
+    input_guardrails=[churn_detection_tripwire],
 )
 
 async def main():
     # Test with a non-churn message
-    await Runner.run(customer_support_agent, "Hello", config=config)
+    # Guardrail and agent start together; the agent run is cancelled if the guardrail trips
+    timings = StageTimings()
+    await run_optimistic(customer_support_agent, "Hello", run_config=config, timings=timings)
     print("Hello message passed")
+    print(timings)
     
     # Test with a potential churn message
+    timings = StageTimings()
     try:
-        await Runner.run(customer_support_agent, "I think I might cancel my subscription", config=config)
+        await run_optimistic(customer_support_agent, "I think I might cancel my subscription", run_config=config, timings=timings)
         print("Guardrail didn't trip - this is unexpected")
-    except GuardrailTripwireTriggered:
+    except InputGuardrailTripwireTriggered:
         print("Churn Detection guardrail tripped as expected")
+    print(timings)
+    print("Guardrail verdict cache:", verdict_cache.stats())
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
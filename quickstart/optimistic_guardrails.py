@@ -0,0 +1,78 @@
+# type: ignore
+"""Optimistic input guardrails.
+
+Runner.run only overlaps input guardrails with the agent's first model call,
+keeps going after a tripwire until that call returns, and waits for every
+guardrail before the next turn (tool calls, handoffs). run_optimistic()
+instead starts the guardrails and the whole agent run at the same time,
+cancels the run the moment any tripwire fires, and only hands back the
+output once every guardrail has passed. End-to-end latency becomes roughly
+max(guardrails, agent) instead of their sum.
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+
+from agents import InputGuardrailTripwireTriggered, RunContextWrapper, Runner
+
+
+@dataclass
+class StageTimings:
+    """Seconds spent in each stage of one optimistic run."""
+    guardrails: dict[str, float] = field(default_factory=dict)
+    agent: float | None = None  # None if the run was cancelled by a tripwire
+    total: float = 0.0
+
+    def __str__(self):
+        stages = [f"{name}={seconds * 1000:.0f}ms" for name, seconds in self.guardrails.items()]
+        agent = "cancelled" if self.agent is None else f"{self.agent * 1000:.0f}ms"
+        return f"guardrails[{', '.join(stages)}] agent={agent} total={self.total * 1000:.0f}ms"
+
+
+async def _timed(coro, timings, name, start):
+    result = await coro
+    timings[name] = time.perf_counter() - start
+    return result
+
+
+async def run_optimistic(agent, input, *, context=None, timings: StageTimings | None = None, **run_kwargs):
+    """Runner.run(agent, input) with agent.input_guardrails run alongside instead of in front.
+
+    Raises InputGuardrailTripwireTriggered exactly like Runner.run does.
+    """
+    timings = timings if timings is not None else StageTimings()
+    start = time.perf_counter()
+    stage_times = {}
+
+    guardrails = {
+        asyncio.create_task(
+            _timed(g.run(agent, input, RunContextWrapper(context=context)), stage_times, g.get_name(), start)
+        ): g
+        for g in agent.input_guardrails
+    }
+    # The guardrails run here, so the agent itself must not run them again
+    main_task = asyncio.create_task(
+        _timed(Runner.run(agent.clone(input_guardrails=[]), input, context=context, **run_kwargs),
+               stage_times, "__agent__", start)
+    )
+
+    pending = set(guardrails) | {main_task}
+    try:
+        while guardrails.keys() & pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task is main_task:
+                    continue  # hold the output until every guardrail has passed
+                guardrail_result = task.result()
+                if guardrail_result.output.tripwire_triggered:
+                    raise InputGuardrailTripwireTriggered(guardrail_result)
+        result = await main_task
+    finally:
+        for task in pending:
+            task.cancel()
+        if main_task.done() and not main_task.cancelled():
+            main_task.exception()  # mark a failed run as retrieved if a tripwire won the race
+        timings.agent = stage_times.pop("__agent__", None)
+        timings.guardrails.update(stage_times)
+        timings.total = time.perf_counter() - start
+    return result
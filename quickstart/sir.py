@@ -1,9 +1,10 @@
 #type:ignore
 import os
 from dotenv import load_dotenv
-from openai import AsyncOpenAI
 from pydantic import BaseModel
-import requests
+from provider import get_client
+from command_index import CommandIndex
+from api_client import get_api_client
 import asyncio
 
 # Load environment variables
@@ -14,25 +15,45 @@ gemini_api_key = os.getenv("GEMINI_API_KEY")
 if not gemini_api_key:
     raise ValueError("GEMINI_API_KEY is not set in .env file")
 
-external_client = AsyncOpenAI(
-    api_key=gemini_api_key,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/",
-)
+# One pooled client per process, see provider.py
+external_client = get_client()
 
 # Define a model for guardrail output
 class KiaCommandOutput(BaseModel):
     is_valid_command: bool
     reasoning: str
+    intent: str | None = None
+    needs_confirmation: bool = False
+
+# Built once; tolerates one typo per word and any word order ("vehicle lcok"), except
+# that lock/unlock only act on an exact "lock the car" and otherwise ask first
+kia_commands = CommandIndex(
+    {
+        "lock_vehicle": "lock vehicle",
+        "unlock_vehicle": "unlock vehicle",
+        "check_location": "check location",
+        "check_battery": "check battery",
+    },
+    aliases={"car": "vehicle"},
+    actions={"lock_vehicle", "unlock_vehicle"},
+)
 
 # Guardrail function to validate Kia-related commands
 def kia_command_guardrail(user_input: str) -> KiaCommandOutput:
-    valid_commands = ["lock vehicle", "unlock vehicle", "check location", "check battery"]
-    user_input_lower = user_input.lower()
+    found = kia_commands.lookup(user_input)
 
-    if any(command in user_input_lower for command in valid_commands):
+    if found is not None and found.confirm:
+        return KiaCommandOutput(
+            is_valid_command=False,
+            reasoning=f"Looks like '{kia_commands.phrases[found.intent]}', but not exactly; confirm before acting.",
+            intent=found.intent,
+            needs_confirmation=True,
+        )
+    if found is not None:
         return KiaCommandOutput(
             is_valid_command=True,
-            reasoning="Valid Kia vehicle command."
+            reasoning="Valid Kia vehicle command.",
+            intent=found.intent,
         )
     else:
         return KiaCommandOutput(
@@ -41,17 +62,22 @@ def kia_command_guardrail(user_input: str) -> KiaCommandOutput:
         )
 
 # Kia API interaction function (simulated using Smartcar API)
-def kia_api_lock_vehicle(access_token: str, vehicle_id: str):
+async def kia_api_lock_vehicle(access_token: str, vehicle_id: str):
     # Simulated API call to lock a vehicle (replace with actual Smartcar API call)
+    # Pooled async client with retries and a circuit breaker, so the event loop never blocks on it
     url = f"https://api.smartcar.com/v2.0/vehicles/{vehicle_id}/security"
     headers = {"Authorization": f"Bearer {access_token}"}
-    response = requests.post(url, json={"action": "LOCK"}, headers=headers)
+    response = await get_api_client().post(url, json={"action": "LOCK"}, headers=headers)
     return response.json()
 
 # Async function to process user input with Gemini model
 async def process_kia_command(user_input: str, access_token: str, vehicle_id: str):
     # Apply guardrail
     guardrail_result = kia_command_guardrail(user_input)
+    if guardrail_result.needs_confirmation:
+        phrase = kia_commands.phrases[guardrail_result.intent]
+        print(f"Did you mean '{phrase}'? Send '{phrase}' to go ahead.")
+        return
     if not guardrail_result.is_valid_command:
         print(f"Guardrail blocked the request: {guardrail_result.reasoning}")
         return
@@ -69,9 +95,9 @@ async def process_kia_command(user_input: str, access_token: str, vehicle_id: st
         gemini_response = response.choices[0].message.content
         print("Gemini Response:", gemini_response)
 
-        # If the command involves vehicle action, call Kia API
-        if "lock vehicle" in user_input.lower():
-            api_response = kia_api_lock_vehicle(access_token, vehicle_id)
+        # If the command involves vehicle action, call Kia API (reuse the guardrail's match)
+        if guardrail_result.intent == "lock_vehicle":
+            api_response = await kia_api_lock_vehicle(access_token, vehicle_id)
             print("API Response:", api_response)
         else:
             print("Command processed but no API action required.")
@@ -91,6 +117,9 @@ async def main():
     print("\nTest 2: Invalid command")
     await process_kia_command("Do my math homework", access_token, vehicle_id)
 
+    print("\nTest 3: Near miss, asks first")
+    await process_kia_command("block the vehicle", access_token, vehicle_id)
+
 # Run the async main function
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
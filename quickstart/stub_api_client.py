@@ -0,0 +1,101 @@
+# type: ignore
+"""Exercise ApiClient against a local HTTP stand-in that injects latency and errors.
+
+Runs three scenarios and checks the outcome of each:
+  flaky      30% of calls answer 503; retries should hide nearly all of them
+  outage     every call answers 503; the circuit should open and fail fast
+  recovery   upstream healthy again; after reset_after one probe closes the circuit
+
+    uv run stub_api_client.py
+"""
+import asyncio
+import random
+import time
+
+from api_client import ApiClient, CircuitOpenError
+
+BODY = b'{"status": "success"}'
+
+
+class StandIn:
+    def __init__(self):
+        self.error_rate = 0.0
+        self.latency = (0.005, 0.02)
+        self.requests = 0
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                await reader.readexactly(length)
+                self.requests += 1
+                await asyncio.sleep(random.uniform(*self.latency))
+                if random.random() < self.error_rate:
+                    status, body = b"503 Service Unavailable", b'{"error": "unavailable"}'
+                else:
+                    status, body = b"200 OK", BODY
+                writer.write(b"HTTP/1.1 %s\r\nContent-Type: application/json\r\nContent-Length: %d\r\n\r\n%s"
+                             % (status, len(body), body))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def call_many(client, url, n):
+    ok = failed = fast_failed = 0
+    start = time.perf_counter()
+
+    async def one():
+        nonlocal ok, failed, fast_failed
+        try:
+            response = await client.post(url, json={"action": "LOCK"})
+            if response.status_code == 200:
+                ok += 1
+            else:
+                failed += 1
+        except CircuitOpenError:
+            fast_failed += 1
+
+    await asyncio.gather(*(one() for _ in range(n)))
+    return ok, failed, fast_failed, time.perf_counter() - start
+
+
+async def main():
+    random.seed(11)
+    stand_in = StandIn()
+    server = await asyncio.start_server(stand_in.handle, "127.0.0.1", 0)
+    url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/v2.0/vehicles/demo/security"
+    client = ApiClient(max_per_host=8, retries=3, backoff_base=0.02, failure_threshold=8, reset_after=0.5)
+
+    async with server:
+        stand_in.error_rate = 0.3
+        ok, failed, fast_failed, elapsed = await call_many(client, url, 200)
+        print(f"flaky     ok={ok} failed={failed} circuit={fast_failed} upstream_calls={stand_in.requests} {elapsed:.2f}s")
+        assert ok >= 190, "retries should absorb almost all 30% errors"
+
+        stand_in.error_rate = 1.0
+        stand_in.requests = 0
+        ok, failed, fast_failed, elapsed = await call_many(client, url, 200)
+        print(f"outage    ok={ok} failed={failed} circuit={fast_failed} upstream_calls={stand_in.requests} {elapsed:.2f}s")
+        assert fast_failed > 150 and stand_in.requests < 100, "open circuit should stop calls reaching upstream"
+
+        stand_in.error_rate = 0.0
+        await asyncio.sleep(0.6)
+        ok, failed, fast_failed, elapsed = await call_many(client, url, 1)
+        ok2, *_ = await call_many(client, url, 50)
+        host = next(iter(client.breakers))
+        print(f"recovery  probe_ok={ok} then ok={ok2}/50 circuit={client.breakers[host].state}")
+        assert ok == 1 and ok2 == 50
+
+        await client.aclose()
+    print("all scenarios behaved as expected")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,13 @@
+# type: ignore
+from arith_fastpath import ArithmeticSolver
+
+
+def test_plain_arithmetic():
+    assert ArithmeticSolver().solve_sync("What is 2 + 3 ?") == 5
+
+
+def test_long_expression_falls_back_instead_of_raising():
+    solver = ArithmeticSolver()
+    assert solver.solve_sync("+".join(["1"] * 2000)) is None
+    assert solver.solve_sync("(" * 500 + "1" + ")" * 500 + " + 1") is None
+    assert solver.fallbacks == 2
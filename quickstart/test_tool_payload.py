@@ -0,0 +1,54 @@
+# type: ignore
+import asyncio
+import json
+
+import httpx
+from agents import Agent, OpenAIChatCompletionsModel, Runner, set_tracing_disabled
+
+import provider
+import tool_payload
+
+COMPLETION = {
+    "id": "chatcmpl-test",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "test",
+    "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "ok"}}],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+}
+
+
+def test_bare_agent_handoffs_hit_the_cache_on_later_turns():
+    set_tracing_disabled(True)
+    sent = []
+
+    def answer(request):
+        sent.append(json.loads(request.content)["tools"])
+        return httpx.Response(200, json=COMPLETION)
+
+    client = provider.build_client(httpx.MockTransport(answer), api_key="test", cache_tools=True)
+    model = OpenAIChatCompletionsModel(model="test", openai_client=client)
+    # bare Agents: the SDK builds a new handoff (and schema dict) for them on every turn
+    triage = Agent(name="Triage", instructions="Route.", model=model,
+                   handoffs=[Agent(name="History Tutor", instructions="..."),
+                             Agent(name="Math Tutor", instructions="...")])
+
+    async def two_turns():
+        await Runner.run(triage, "first question")
+        hits = tool_payload.tool_payloads.hits
+        await Runner.run(triage, "second question")
+        return hits
+
+    hits = asyncio.run(two_turns())
+    assert tool_payload.tool_payloads.hits == hits + 1
+    assert sent[0] == sent[1]
+    assert [t["function"]["name"] for t in sent[1]] == ["transfer_to_history_tutor", "transfer_to_math_tutor"]
+
+
+def test_rebuilt_schema_hits_and_edited_schema_renders_fresh():
+    cache = tool_payload.ToolPayloadCache()
+    tool = {"type": "function", "function": {"name": "f", "description": "d", "parameters": {"type": "object"}}}
+    first = cache.placeholder([tool])
+    assert cache.placeholder([json.loads(json.dumps(tool))]) == first
+    tool["function"]["parameters"] = {"type": "object", "properties": {"x": {"type": "integer"}}}
+    assert cache.placeholder([tool]) != first
@@ -0,0 +1,163 @@
+# type: ignore
+"""Answer plain arithmetic prompts locally instead of asking the model.
+
+"What is 2 + 3 ?", "4 + 4 - 2", "calculate (7 * 2) / 2" are parsed with ast,
+allowing only numbers, + - * /, unary minus and parentheses, and evaluated
+one operation at a time through a table of operators. That table can be plain
+Python arithmetic, or tool_ops() around the app's own @function_tool tools so
+the answer follows the same (possibly shaitani) tool semantics as the agent.
+Anything that isn't clearly arithmetic returns None so the caller falls back
+to the agent.
+"""
+import ast
+import json
+import operator
+import re
+
+from agents import RunContextWrapper
+
+_PROMPT_RE = re.compile(
+    r"^\s*(?:(?:what\s+is|what's|whats|calculate|compute|solve|evaluate)\s+)?"
+    r"(?P<expr>[\d\s.+\-*/()x×÷]+?)"
+    r"\s*(?:=\s*\??|is\s*\??|\?)*\s*$",
+    re.IGNORECASE,
+)
+_MAX_DIGITS = 30  # keeps "9 * 9 * 9 ..." style prompts from turning into huge numbers
+_MAX_OPERATORS = 100  # compile_plan recurses per operator; longer prompts go to the agent
+
+PYTHON_OPS = {"+": operator.add, "-": operator.sub, "*": operator.mul, "/": operator.truediv}
+_AST_OPS = {ast.Add: "+", ast.Sub: "-", ast.Mult: "*", ast.Div: "/"}
+
+
+def extract_expression(text: str) -> str | None:
+    match = _PROMPT_RE.match(text)
+    if not match:
+        return None
+    expr = match.group("expr").replace("×", "*").replace("÷", "/")
+    expr = re.sub(r"(?<=\d)\s*x\s*(?=\d)", "*", expr)  # "3 x 4"
+    if "x" in expr.lower() or not re.search(r"\d\s*[+\-*/]", expr):
+        return None  # a variable, or just a number on its own
+    return expr
+
+
+def compile_plan(expr: str):
+    """Turn an expression into a list of steps (op, left, right).
+
+    Operands are numbers or ("step", i) references to earlier results.
+    """
+    if len(re.findall(r"[+\-*/(]", expr)) > _MAX_OPERATORS:
+        raise ValueError("expression too long")
+    tree = ast.parse(expr.strip(), mode="eval").body
+    steps = []
+
+    def visit(node):
+        if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+            if len(str(node.value)) > _MAX_DIGITS:
+                raise ValueError("number too large")
+            return node.value
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            value = visit(node.operand)
+            if isinstance(node.op, ast.UAdd):
+                return value
+            if isinstance(value, tuple):
+                steps.append(("-", 0, value))
+                return ("step", len(steps) - 1)
+            return -value
+        if isinstance(node, ast.BinOp) and type(node.op) in _AST_OPS:
+            left, right = visit(node.left), visit(node.right)
+            steps.append((_AST_OPS[type(node.op)], left, right))
+            return ("step", len(steps) - 1)
+        raise ValueError(f"unsupported syntax: {type(node).__name__}")
+
+    visit(tree)
+    return steps
+
+
+def _operand(value, results):
+    return results[value[1]] if isinstance(value, tuple) else value
+
+
+def _check(value):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"operator returned {value!r}")
+    return int(value) if isinstance(value, float) and value.is_integer() else value
+
+
+# Tool names the calculator apps use for each operator
+TOOL_SYMBOLS = {"add": "+", "sub": "-", "mul": "*", "div": "/"}
+
+
+def tool_ops(tools: dict) -> dict:
+    """Operator table that calls FunctionTools ({"+": add, ...}) with their first two parameters."""
+    def wrap(tool):
+        a, b = list(tool.params_json_schema["properties"])[:2]
+
+        async def call(x, y):
+            # Tool errors come back as a message string, which _check turns into a fallback
+            return await tool.on_invoke_tool(RunContextWrapper(context=None), json.dumps({a: x, b: y}))
+        return call
+    return {symbol: wrap(tool) for symbol, tool in tools.items()}
+
+
+def agent_ops(agent) -> dict:
+    """tool_ops() for whichever of add/sub/mul/div the agent has; other operators fall back."""
+    return tool_ops({TOOL_SYMBOLS[t.name]: t for t in agent.tools if t.name in TOOL_SYMBOLS})
+
+
+class ArithmeticSolver:
+    def __init__(self, ops=None):
+        self.ops = ops or PYTHON_OPS
+        self.solved = 0
+        self.fallbacks = 0
+
+    def _plan_for(self, text):
+        expr = extract_expression(text) if isinstance(text, str) else None
+        if expr is None:
+            return None
+        try:
+            return compile_plan(expr)
+        except (SyntaxError, ValueError, RecursionError, MemoryError):
+            return None
+
+    def _done(self, value):
+        if value is None:
+            self.fallbacks += 1
+        else:
+            self.solved += 1
+        return value
+
+    def solve_sync(self, text, ops=None):
+        """Answer, or None to fall back to the agent. Needs a table of plain (non-async) operators."""
+        ops = ops or self.ops
+        plan = self._plan_for(text)
+        if not plan:
+            return self._done(None)
+        results = []
+        try:
+            for op, left, right in plan:
+                results.append(_check(ops[op](_operand(left, results), _operand(right, results))))
+        except (ArithmeticError, KeyError, ValueError):
+            return self._done(None)
+        return self._done(results[-1])
+
+    async def solve(self, text, ops=None):
+        """Answer, or None to fall back to the agent. Works with sync or async operators."""
+        ops = ops or self.ops
+        plan = self._plan_for(text)
+        if not plan:
+            return self._done(None)
+        results = []
+        try:
+            for op, left, right in plan:
+                value = ops[op](_operand(left, results), _operand(right, results))
+                if hasattr(value, "__await__"):
+                    value = await value
+                results.append(_check(value))
+        except (ArithmeticError, KeyError, ValueError):
+            return self._done(None)
+        return self._done(results[-1])
+
+    def stats(self) -> dict:
+        total = self.solved + self.fallbacks
+        return {"solved": self.solved, "fallbacks": self.fallbacks,
+                "absorbed": self.solved / total if total else 0.0}
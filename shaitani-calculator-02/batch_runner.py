@@ -0,0 +1,55 @@
+# type: ignore
+"""Run many (agent, prompt) jobs concurrently on one event loop.
+
+All jobs share the process-wide client from provider.py. Results come back
+in submission order, each with its own timing; a failed job carries its
+exception instead of stopping the batch.
+"""
+import asyncio
+import time
+from dataclasses import dataclass
+
+from agents import Runner
+
+
+@dataclass
+class BatchResult:
+    agent_name: str
+    prompt: str
+    output: object = None
+    error: Exception | None = None
+    seconds: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+async def run_batch(jobs, run_config=None, concurrency=8, fast_path=None) -> tuple[list[BatchResult], float]:
+    """Returns (results in submission order, wall time in seconds).
+
+    fast_path(agent, prompt) may answer a job without a model call; returning None runs the agent.
+    """
+    gate = asyncio.Semaphore(concurrency)
+
+    async def run_one(agent, prompt):
+        result = BatchResult(agent_name=agent.name, prompt=prompt)
+        async with gate:
+            start = time.perf_counter()
+            try:
+                result.output = await fast_path(agent, prompt) if fast_path else None
+                if result.output is None:
+                    run = await Runner.run(agent, prompt, run_config=run_config)
+                    result.output = run.final_output
+            except Exception as e:
+                result.error = e
+            result.seconds = time.perf_counter() - start
+        return result
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(run_one(agent, prompt) for agent, prompt in jobs))
+    return list(results), time.perf_counter() - start
+
+
+def run_batch_sync(jobs, run_config=None, concurrency=8, fast_path=None):
+    return asyncio.run(run_batch(jobs, run_config=run_config, concurrency=concurrency, fast_path=fast_path))
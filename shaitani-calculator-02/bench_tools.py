@@ -0,0 +1,106 @@
+# type: ignore
+"""Benchmark: per-turn request-building time with many tools.
+
+Sends chat-completions calls for an agent with --tools function tools and
+--handoffs handoffs through the SDK's chat-completions model, into an
+httpx.MockTransport that answers at once, so the time measured is what
+one model call spends building and encoding its request. Compares the
+SDK/openai defaults with tool_payload.py's pre-rendered tools, and checks
+both send the same tools. No API key or network is needed.
+
+    uv run bench_tools.py
+    uv run bench_tools.py --tools 100 --calls 500
+"""
+import argparse
+import asyncio
+import json
+import time
+
+import httpx
+from agents import Agent, ModelSettings, OpenAIChatCompletionsModel, function_tool, handoff
+from agents import _debug as agents_debug
+from agents.models.interface import ModelTracing
+
+import provider
+import tool_payload
+
+COMPLETION = {
+    "id": "chatcmpl-bench",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "bench",
+    "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "ok"}}],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+}
+
+
+def make_tool(i):
+    async def op(a: int, b: int, scale: float = 1.0, label: str = "") -> float:
+        """Apply an arithmetic operation to two numbers.
+
+        Args:
+            a: the first number.
+            b: the second number.
+            scale: multiplies the result.
+            label: shown next to the answer.
+        """
+        return (a + b) * scale
+
+    op.__name__ = f"op_{i}"
+    return function_tool(op)
+
+
+async def run(model, tools, handoffs, calls) -> float:
+    settings = ModelSettings()
+    await model.get_response("You are a calculator.", "1 + 1", settings, tools, None, handoffs,
+                             ModelTracing.DISABLED, previous_response_id=None)
+    start = time.perf_counter()
+    for _ in range(calls):
+        await model.get_response("You are a calculator.", "1 + 1", settings, tools, None, handoffs,
+                                 ModelTracing.DISABLED, previous_response_id=None)
+    return (time.perf_counter() - start) / calls * 1000
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tools", type=int, default=60)
+    parser.add_argument("--handoffs", type=int, default=5)
+    parser.add_argument("--calls", type=int, default=300)
+    args = parser.parse_args()
+
+    tools = [make_tool(i) for i in range(args.tools)]
+    handoffs = [handoff(Agent(name=f"Expert {i}", instructions="...", handoff_description=f"expert {i}"))
+                for i in range(args.handoffs)]
+
+    sent = {}
+
+    def answer(request):
+        sent[request.extensions.get("bench_mode", "?")] = json.loads(request.content)["tools"]
+        return httpx.Response(200, json=COMPLETION)
+
+    def model_for(mode, cache_tools):
+        class Tagging(httpx.AsyncBaseTransport):
+            async def handle_async_request(self, request):
+                request.extensions["bench_mode"] = mode
+                return await inner.handle_async_request(request)
+
+        inner = httpx.MockTransport(answer)
+        client = provider.build_client(Tagging(), api_key="bench", cache_tools=cache_tools)
+        return OpenAIChatCompletionsModel(model="bench", openai_client=client)
+
+    rows = []
+    agents_debug.DONT_LOG_MODEL_DATA = False
+    rows.append(("SDK defaults (debug string formatted)", await run(model_for("default", False), tools, handoffs, args.calls)))
+    agents_debug.DONT_LOG_MODEL_DATA = True
+    rows.append(("no debug string", await run(model_for("nolog", False), tools, handoffs, args.calls)))
+    rows.append(("no debug string + pre-rendered tools", await run(model_for("cached", True), tools, handoffs, args.calls)))
+
+    print(f"{args.tools} function tools + {args.handoffs} handoffs, {args.calls} calls")
+    for name, ms in rows:
+        print(f"{name:<40} {ms:7.3f} ms/call  ({rows[0][1] / ms:4.1f}x)")
+    print("tools sent identical:", sent["default"] == sent["cached"])
+    print("cache:", tool_payload.tool_payloads.stats())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
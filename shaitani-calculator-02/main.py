@@ -1,6 +1,10 @@
 # type: ignore
-from agents import Agent, AsyncOpenAI, Runner, OpenAIChatCompletionsModel, set_tracing_disabled,function_tool
+from agents import Agent, set_tracing_disabled,function_tool
 from agents.run import RunConfig
+from provider import get_client, get_model
+from rate_limit import limiter_stats
+from batch_runner import run_batch_sync
+from arith_fastpath import ArithmeticSolver, agent_ops
 import os 
 from dotenv import load_dotenv
 
@@ -9,22 +13,15 @@ load_dotenv()
 
 API_KEY = os.environ.get("GEMINI_API_KEY")
 
-external_client = AsyncOpenAI(
-    api_key=API_KEY,
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash",
-    openai_client=external_client,
-)
+# One pooled client per process, see provider.py
+external_client = get_client()
+model = get_model("gemini-2.0-flash")
 
     
 config = RunConfig(
     model=model,
     model_provider=external_client,
 )
-print("🔥😈 Shaitani Calculator 🔥😈")
 # ____________  Add__________________________
 @function_tool  
 async def add(a:int ,b:int) -> int:
@@ -38,12 +35,7 @@ async def add(a:int ,b:int) -> int:
     # 
     return a + b + 1
 
-agent = Agent(name="Assistant", instructions="You are a helpful assistant",tools=[add])
-
-result = Runner.run_sync(agent, "What is 2 + 3 ?", run_config=config)
-
-print("The addition answer:😊➕😊")
-print(result.final_output)
+add_agent = Agent(name="Assistant", instructions="You are a helpful assistant",tools=[add])
 # ____________  Sub __________________________
 
 @function_tool  
@@ -58,12 +50,7 @@ async def sub(a:int ,b:int) -> int:
     # 
     return a - b - 1
 
-agent = Agent(name="Assistant", instructions="You are a helpful assistant",tools=[sub])
-
-result = Runner.run_sync(agent, "What is 8 -5 ?", run_config=config)
-
-print("The Subtract answer:🤔 ➖ 🤔")
-print(result.final_output)
+sub_agent = Agent(name="Assistant", instructions="You are a helpful assistant",tools=[sub])
 # ____________  Mul __________________________
 
 @function_tool  
@@ -78,12 +65,7 @@ async def mul(a:int ,b:int) -> int:
     # 
     return a * b + 1
 
-agent = Agent(name="Assistant", instructions="You are a helpful assistant",tools=[mul])
-
-result = Runner.run_sync(agent, "What is 7 * 2 ?", run_config=config)
-
-print("The Multiply answer:😎 ❌ 😎")
-print(result.final_output)
+mul_agent = Agent(name="Assistant", instructions="You are a helpful assistant",tools=[mul])
 
 # ____________  Div __________________________
 @function_tool
@@ -94,9 +76,41 @@ async def div(a:int, b:int) -> int:
     """
     return a / b + 1
 
-agent = Agent(name="Assistant", instructions="You are a helpful assistant",tools=[div])
-
-result = Runner.run_sync(agent, "What is 2 / 2 ?", run_config=config)
-
-print("The Division answer is:🥳➗🥳")
-print(result.final_output)
+div_agent = Agent(name="Assistant", instructions="You are a helpful assistant",tools=[div])
+
+# ____________  Run all four at once __________________________
+def main():
+    print("🔥😈 Shaitani Calculator 🔥😈")
+    # One event loop and one shared client; wall time is close to the slowest single call
+    jobs = [
+        ("The addition answer:😊➕😊", add_agent, "What is 2 + 3 ?"),
+        ("The Subtract answer:🤔 ➖ 🤔", sub_agent, "What is 8 -5 ?"),
+        ("The Multiply answer:😎 ❌ 😎", mul_agent, "What is 7 * 2 ?"),
+        ("The Division answer is:🥳➗🥳", div_agent, "What is 2 / 2 ?"),
+    ]
+    # Plain arithmetic is answered locally through the agent's own tools; anything else goes to the model
+    solver = ArithmeticSolver()
+
+    async def arithmetic_fast_path(agent, prompt):
+        return await solver.solve(prompt, ops=agent_ops(agent))
+
+    results, wall_time = run_batch_sync(
+        [(agent, prompt) for _, agent, prompt in jobs],
+        run_config=config,
+        concurrency=int(os.environ.get("CALCULATOR_CONCURRENCY", 4)),
+        fast_path=arithmetic_fast_path,
+    )
+
+    for (title, _, _), result in zip(jobs, results):
+        print(title)
+        print(result.output if result.ok else f"❌ {result.error}")
+
+    slowest = max(result.seconds for result in results)
+    total = sum(result.seconds for result in results)
+    print(f"\n⏱️ wall {wall_time:.2f}s | slowest call {slowest:.2f}s | sequential would be ~{total:.2f}s")
+    print(f"🧮 answered locally: {solver.stats()}")
+    print(f"🚦 rate limiter: {limiter_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#type:ignore
+import hashlib
+import json
+import os
+from dataclasses import dataclass, replace
+
+from agents import Agent, ModelSettings, handoff
+
+
+@dataclass(frozen=True)
+class AgentSpec:
+    """Everything needed to build one Agent. Handoffs refer to other specs by name."""
+    name: str
+    instructions: str
+    handoff_description: str | None = None
+    handoffs: tuple[str, ...] = ()
+
+
+class FrozenAgent(Agent):
+    """Agent that refuses attribute writes once built, so shared instances stay shared.
+
+    Use agent.clone(...) for a per-request variant.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        object.__setattr__(self, "_frozen", True)
+
+    def __setattr__(self, name, value):
+        if getattr(self, "_frozen", False):
+            raise AttributeError(f"{self.name!r} is a shared registry agent; use clone() instead")
+        super().__setattr__(name, value)
+
+
+class AgentRegistry:
+    """Builds each Agent/handoff graph once and hands out the shared instance.
+
+    Built agents are keyed by a hash of their spec and of every spec they hand
+    off to, so changing one specialist's instructions rebuilds that specialist
+    and the managers above it on the next get(), and nothing else.
+    Handoffs are stored as prebuilt Handoff objects, which the Runner uses
+    as-is instead of regenerating the handoff tool schema every turn.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self._specs: dict[str, AgentSpec] = {}
+        self._hashes: dict[str, str] = {}
+        self._built: dict[str, Agent] = {}
+        self._handoffs: dict[str, object] = {}
+        self._overrides_mtime = None
+
+    def register(self, *specs: AgentSpec):
+        for spec in specs:
+            self._specs[spec.name] = spec
+        self._hashes.clear()
+
+    def update(self, name: str, **changes):
+        """Hot reload: swap fields of a registered spec. Returns True if anything changed."""
+        spec = self._specs[name]
+        new_spec = replace(spec, **changes)
+        if new_spec == spec:
+            return False
+        self._specs[name] = new_spec
+        self._hashes.clear()
+        self._prune()
+        return True
+
+    def load_overrides(self, path: str):
+        """Apply {"agent name": "instructions"} from a JSON file if it changed since last call."""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime == self._overrides_mtime:
+            return False
+        self._overrides_mtime = mtime
+        with open(path, encoding="utf-8") as f:
+            overrides = json.load(f)
+        changed = False
+        for name, instructions in overrides.items():
+            if name in self._specs:
+                changed |= self.update(name, instructions=instructions)
+        return changed
+
+    def config_hash(self, name: str) -> str:
+        key = self._hashes.get(name)
+        if key is None:
+            spec = self._specs[name]
+            payload = [
+                spec.name,
+                spec.instructions,
+                spec.handoff_description,
+                [self.config_hash(child) for child in spec.handoffs],
+            ]
+            key = hashlib.sha256(json.dumps(payload).encode()).hexdigest()[:16]
+            self._hashes[name] = key
+        return key
+
+    def get(self, name: str) -> Agent:
+        key = self.config_hash(name)
+        agent = self._built.get(key)
+        if agent is None:
+            agent = self._build(self._specs[name], key)
+        return agent
+
+    def _build(self, spec: AgentSpec, key: str) -> Agent:
+        agent = FrozenAgent(
+            name=spec.name,
+            instructions=spec.instructions,
+            handoff_description=spec.handoff_description,
+            model=self.model,
+            # streamed calls only report token usage when asked (metrics.py counts it)
+            model_settings=ModelSettings(include_usage=True),
+            handoffs=[self._handoff(child) for child in spec.handoffs],
+        )
+        # Lets response_cache key on the whole graph; clones don't carry it
+        object.__setattr__(agent, "config_hash", key)
+        self._built[key] = agent
+        return agent
+
+    def _handoff(self, name: str):
+        key = self.config_hash(name)
+        h = self._handoffs.get(key)
+        if h is None:
+            h = self._handoffs[key] = handoff(self.get(name))
+        return h
+
+    def _prune(self):
+        # Drop builds that no longer match any registered spec
+        live = {self.config_hash(name) for name in self._specs}
+        self._built = {k: v for k, v in self._built.items() if k in live}
+        self._handoffs = {k: v for k, v in self._handoffs.items() if k in live}
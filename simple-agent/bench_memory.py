@@ -0,0 +1,82 @@
+#type:ignore
+"""Benchmark: prompt size and latency per turn, full history vs. memory.py.
+
+Plays one long conversation against the offline mock server (../mock-server)
+twice: once resending the whole history every turn, once through
+ConversationMemory. Prints input tokens and latency at a few turn counts;
+with memory both should stay flat. No API key or network is needed.
+
+    uv run bench_memory.py
+    uv run bench_memory.py --turns 300 --latency fixed:20
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "mock-server"))
+
+from mock_server import Latency, MockConfig, MockServer  # noqa: E402
+
+REPORT_AT = (1, 10, 25, 50, 100, 200, 300, 500)
+
+
+def user_message(i: int) -> str:
+    return f"Turn {i}: tell me more about step {i} of the plan, and how it affects the budget we set earlier."
+
+
+async def play(agent, turns: int, memory=None) -> dict:
+    from agents import Runner
+
+    history = []
+    rows = {}
+    for i in range(1, turns + 1):
+        text = user_message(i)
+        turn_input = memory.input_for(text) if memory is not None else history + [{"role": "user", "content": text}]
+        start = time.perf_counter()
+        result = await Runner.run(agent, turn_input)
+        elapsed = time.perf_counter() - start
+        reply = str(result.final_output)
+        if memory is not None:
+            memory.add(text, reply)
+        else:
+            history += [{"role": "user", "content": text}, {"role": "assistant", "content": reply}]
+        if i in REPORT_AT or i == turns:
+            rows[i] = (result.raw_responses[-1].usage.input_tokens, elapsed * 1000)
+    if memory is not None:
+        await memory.flush()
+    return rows
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--latency", default="fixed:5")
+    parser.add_argument("--reply-tokens", type=int, default=120)
+    args = parser.parse_args()
+
+    async with MockServer(MockConfig(latency=Latency(args.latency), reply_tokens=args.reply_tokens)) as base_url:
+        # limits high enough that the rate limiter never throttles the long-history run
+        os.environ.update(GEMINI_BASE_URL=base_url, GEMINI_API_KEY="mock", RESPONSE_CACHE="0",
+                          RATE_LIMIT_RPM="100000000", RATE_LIMIT_TPM="100000000000")
+        import chatbot
+        import provider
+
+        logging.getLogger("httpx").setLevel(logging.WARNING)
+
+        agent = chatbot.registry.get("Assistant")
+        full = await play(agent, args.turns)
+        memory = chatbot.new_memory()
+        bounded = await play(agent, args.turns, memory)
+        await provider.get_client().close()
+
+    print(f"{'turn':>5} {'full: tokens':>13} {'ms':>7} {'memory: tokens':>15} {'ms':>7}")
+    for turn in full:
+        print(f"{turn:>5} {full[turn][0]:>13} {full[turn][1]:>7.1f} {bounded[turn][0]:>15} {bounded[turn][1]:>7.1f}")
+    print("memory:", memory.stats())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
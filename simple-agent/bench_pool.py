@@ -0,0 +1,107 @@
+#type:ignore
+"""Benchmark: shared pooled client vs. a fresh connection per request.
+
+Starts a tiny OpenAI-compatible stub on localhost that answers every
+chat completion instantly, but sleeps --handshake-ms on each new connection
+to stand in for the TCP + TLS setup a real Gemini connection costs.
+No API key or network is needed.
+
+    uv run bench_pool.py
+    uv run bench_pool.py --requests 500 --concurrency 20 --handshake-ms 60
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+
+import provider
+
+COMPLETION = json.dumps({
+    "id": "chatcmpl-stub",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "stub",
+    "choices": [{"index": 0, "finish_reason": "stop",
+                 "message": {"role": "assistant", "content": "ok"}}],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 1, "total_tokens": 2},
+}).encode()
+
+
+async def handle_connection(reader, writer, handshake):
+    await asyncio.sleep(handshake)
+    try:
+        while True:
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            writer.write(
+                b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                b"Content-Length: %d\r\n\r\n%s" % (len(COMPLETION), COMPLETION)
+            )
+            await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+async def one_request(client):
+    start = time.perf_counter()
+    await client.chat.completions.create(model="stub", messages=[{"role": "user", "content": "hi"}])
+    return time.perf_counter() - start
+
+
+async def run(label, requests, concurrency, make_request):
+    gate = asyncio.Semaphore(concurrency)
+
+    async def guarded():
+        async with gate:
+            return await make_request()
+
+    start = time.perf_counter()
+    latencies = sorted(await asyncio.gather(*(guarded() for _ in range(requests))))
+    elapsed = time.perf_counter() - start
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99) - 1] * 1000
+    print(f"{label:<8} p50 {p50:7.1f} ms   p99 {p99:7.1f} ms   {requests / elapsed:7.1f} req/s")
+    return p50, p99
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--handshake-ms", type=float, default=40)
+    args = parser.parse_args()
+
+    server = await asyncio.start_server(
+        lambda r, w: handle_connection(r, w, args.handshake_ms / 1000), "127.0.0.1", 0
+    )
+    base_url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/v1/"
+
+    async def fresh():
+        client = provider.build_client(provider.build_transport(), base_url=base_url, api_key="bench")
+        try:
+            return await one_request(client)
+        finally:
+            await client.close()
+
+    transport = provider.build_transport()
+    shared_client = provider.build_client(transport, base_url=base_url, api_key="bench")
+    await asyncio.gather(*(one_request(shared_client) for _ in range(args.concurrency)))  # warm-up
+
+    async with server:
+        fresh_p50, fresh_p99 = await run("fresh", args.requests, args.concurrency, fresh)
+        pool_p50, pool_p99 = await run("pooled", args.requests, args.concurrency, lambda: one_request(shared_client))
+    print("\npool stats:", transport.stats())
+    await shared_client.close()
+
+    print(f"p50 gain {fresh_p50 - pool_p50:.1f} ms, p99 gain {fresh_p99 - pool_p99:.1f} ms")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
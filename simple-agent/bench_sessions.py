@@ -0,0 +1,146 @@
+#type:ignore
+"""Benchmark: session load/save cost under many concurrent sessions.
+
+Each worker process plays --sessions chats, --concurrency at a time, for
+--turns turns. A turn loads the session, appends an exchange to a memory
+snapshot about the size memory.py keeps (~6 KB), and saves it. Runs the
+SQLite store (one file shared by all workers) and the Redis store against
+../mock-server/redis_standin.py (or --redis-url), then checks every session
+reads back its last turn. No API key or network is needed.
+
+    uv run bench_sessions.py
+    uv run bench_sessions.py --processes 4 --sessions 2000 --concurrency 400
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from session_store import open_store
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+STANDIN = os.path.join(HERE, "..", "mock-server", "redis_standin.py")
+
+REPLY = "Here is what I found about that step of the plan. " * 8
+
+
+def percentile(samples, p):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))] if ordered else 0.0
+
+
+async def worker(spec, worker_id, sessions, concurrency, turns) -> dict:
+    store = open_store(spec)
+    load_ms, save_us = [], []
+    gate = asyncio.Semaphore(concurrency)
+
+    async def chat(i):
+        key = f"w{worker_id}-s{i}"
+        async with gate:
+            for turn in range(1, turns + 1):
+                start = time.perf_counter()
+                state = await store.load(key) or {"summary": "", "recent": [], "pending": [], "turns": 0, "folds": 0}
+                load_ms.append((time.perf_counter() - start) * 1000)
+                state["recent"] = (state["recent"] + [["user", f"turn {turn}: and then?"], ["assistant", REPLY]])[-16:]
+                state["turns"] = turn
+                start = time.perf_counter()
+                store.save(key, state)
+                save_us.append((time.perf_counter() - start) * 1e6)
+                await asyncio.sleep(0)  # the model call would go here
+
+    start = time.perf_counter()
+    await asyncio.gather(*(chat(i) for i in range(sessions)))
+    elapsed = time.perf_counter() - start
+    flush_start = time.perf_counter()
+    await store.flush()
+    flush_ms = (time.perf_counter() - flush_start) * 1000
+
+    stale = 0
+    for i in range(sessions):
+        state = await store.load(f"w{worker_id}-s{i}")
+        stale += state is None or state["turns"] != turns
+    stats = store.stats()
+    store.close()
+    return {"load_ms": load_ms, "save_us": save_us, "elapsed": elapsed, "flush_ms": flush_ms,
+            "stale": stale, "stats": stats}
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def run_backend(name, spec, args):
+    procs = [
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--worker", str(w), "--spec", spec,
+             "--sessions", str(args.sessions), "--concurrency", str(args.concurrency), "--turns", str(args.turns)],
+            cwd=HERE, stdout=subprocess.PIPE, text=True,
+        )
+        for w in range(args.processes)
+    ]
+    results = [json.loads(p.communicate()[0].strip().splitlines()[-1]) for p in procs]
+    loads = [ms for r in results for ms in r["load_ms"]]
+    saves = [us for r in results for us in r["save_us"]]
+    ops = len(loads) + len(saves)
+    elapsed = max(r["elapsed"] for r in results)
+    print(f"{name:<8} {statistics.fmean(loads):>7.3f} {percentile(loads, 50):>7.3f} {percentile(loads, 99):>7.3f}"
+          f" {statistics.fmean(saves):>8.1f} {percentile(saves, 99):>8.1f} {ops / elapsed:>9.0f}"
+          f" {max(r['flush_ms'] for r in results):>8.1f} {sum(r['stale'] for r in results):>6}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--processes", type=int, default=2, help="worker processes sharing one backend")
+    parser.add_argument("--sessions", type=int, default=1000, help="per process")
+    parser.add_argument("--concurrency", type=int, default=200, help="sessions in flight per process")
+    parser.add_argument("--turns", type=int, default=5)
+    parser.add_argument("--redis-url", help="a real Redis instead of the local stand-in")
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--spec", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        result = asyncio.run(worker(args.spec, args.worker, args.sessions, args.concurrency, args.turns))
+        print(json.dumps(result))
+        return
+
+    print(f"{args.processes} processes x {args.sessions} sessions x {args.turns} turns, "
+          f"{args.concurrency} concurrent per process")
+    print(f"{'backend':<8} {'load ms':>7} {'p50':>7} {'p99':>7} {'save us':>8} {'p99':>8} {'ops/s':>9}"
+          f" {'flush ms':>8} {'stale':>6}")
+
+    tmp = tempfile.mkdtemp()
+    run_backend("sqlite", "sqlite:" + os.path.join(tmp, "sessions.db"), args)
+
+    standin = None
+    url = args.redis_url
+    if url is None:
+        port = free_port()
+        standin = subprocess.Popen([sys.executable, STANDIN, "--port", str(port)], stdout=subprocess.DEVNULL)
+        deadline = time.time() + 10
+        while time.time() < deadline:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=0.2).close()
+                break
+            except OSError:
+                time.sleep(0.05)
+        url = f"redis://127.0.0.1:{port}/0"
+    try:
+        run_backend("redis", url, args)
+    finally:
+        if standin is not None:
+            standin.terminate()
+            standin.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+#type:ignore
+"""Benchmark: what keeping tracing on with the local trace sink costs.
+
+Builds synthetic runs out of real SDK spans (an agent span holding two
+model calls, a tool call and a handoff) and times them three ways:
+tracing disabled, the /metrics processor only, and metrics plus the trace
+sink. Then reads the file back and checks every run rebuilds as a tree.
+No API key or network is needed.
+
+    uv run bench_trace_sink.py
+    uv run bench_trace_sink.py --runs 50000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from agents import set_trace_processors, set_tracing_disabled
+from agents.tracing import agent_span, function_span, generation_span, handoff_span, trace
+
+import trace_sink
+from metrics import MetricsProcessor
+
+SPANS_PER_RUN = 5
+
+
+def one_run(i):
+    with trace("bench"):
+        with agent_span(name="Assistant"):
+            with generation_span(model="gemini-2.0-flash", usage={"input_tokens": 12, "output_tokens": 30}):
+                pass
+            with function_span(name="add", input='{"a": 1, "b": 2}', output="3"):
+                pass
+            with generation_span(model="gemini-2.0-flash"):
+                pass
+            with handoff_span(from_agent="Assistant", to_agent="Web"):
+                pass
+
+
+def timed(runs) -> float:
+    start = time.perf_counter()
+    for i in range(runs):
+        one_run(i)
+    return (time.perf_counter() - start) / (runs * SPANS_PER_RUN) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=20000)
+    args = parser.parse_args()
+
+    set_trace_processors([])
+    set_tracing_disabled(True)
+    timed(1000)  # warm up
+    disabled = timed(args.runs)
+
+    set_tracing_disabled(False)
+    set_trace_processors([MetricsProcessor()])
+    metrics_only = timed(args.runs)
+
+    path = os.path.join(tempfile.mkdtemp(), "traces.bin")
+    sink = trace_sink.TraceSink(path=path)
+    set_trace_processors([MetricsProcessor(), sink])
+    with_sink = timed(args.runs)
+    sink.shutdown()
+    set_trace_processors([])
+
+    stats = sink.stats()
+    runs = trace_sink.build_trees(trace_sink.read_records(path))
+    whole = sum(1 for run in runs.values()
+                if run["trace"] and len(run["roots"]) == 1 and len(run["spans"]) == SPANS_PER_RUN)
+
+    print(f"{args.runs} runs x {SPANS_PER_RUN} spans")
+    print(f"tracing disabled     {disabled:6.2f} us/span")
+    print(f"metrics only         {metrics_only:6.2f} us/span")
+    print(f"metrics + trace sink {with_sink:6.2f} us/span  (+{with_sink - metrics_only:.2f} us)")
+    print(f"sink hot path        {stats['hot_path_ns_per_item']:6.0f} ns/item, dropped {stats['dropped']}")
+    print(f"sink flush thread    {stats['flush_cpu_ns_per_item']:6.0f} ns/item CPU")
+    print(f"file                 {stats['bytes_written'] / 1024:.0f} KiB in {stats['frames']} frames, "
+          f"{stats['bytes_written'] / (args.runs * SPANS_PER_RUN):.1f} B/span")
+    print(f"read back            {whole}/{len(runs)} runs rebuilt as complete trees")
+    os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,33 +1,75 @@
 from dotenv import load_dotenv
-from openai import AsyncOpenAI
-from agents import Agent, Runner, OpenAIChatCompletionsModel, set_tracing_disabled
+from agents import Runner
+from provider import get_model
+from agent_registry import AgentRegistry, AgentSpec
+from response_cache import ResponseCache, cache_key
+from streaming import stream_events
+from memory import ConversationMemory
+from metrics import install as install_metrics
+from trace_sink import install as install_trace_sink
 import os
 
 
 load_dotenv()
 
-set_tracing_disabled(True)
+# Spans stay in this process and only feed the /metrics histograms, see metrics.py
+install_metrics(serve=False)
+# ...and are also kept in a local append-only file (TRACE_SINK=0 turns it off), see trace_sink.py
+install_trace_sink()
 
-provider = AsyncOpenAI(
-    api_key=os.getenv("GEMINI_API_KEY"),
-    
-    base_url="https://generativelanguage.googleapis.com/v1beta/openai/"
-)
-model = OpenAIChatCompletionsModel(
-    model="gemini-2.0-flash-exp",
-    openai_client=provider,
-)
+# Shared pooled client, see provider.py
+model = get_model("gemini-2.0-flash-exp")
 
-async def myAgent(user_input):
-    Agent1 = Agent(
+registry = AgentRegistry(model)
+registry.register(
+    AgentSpec(
         name="Assistant",
         instructions="A helpful assistant that can answer questions and provide information.",
-        model=model
     )
+)
+
+# Optional JSON file of {"agent name": "instructions"}; edits are picked up without a restart
+INSTRUCTIONS_FILE = os.getenv("AGENT_INSTRUCTIONS_FILE", "agent_instructions.json")
+
+# Opt-in (RESPONSE_CACHE=1), see response_cache.py
+cache = ResponseCache.from_env()
+
+def new_memory():
+    """Conversation memory for one chat session; pass memory.input_for(text) as user_input."""
+    return ConversationMemory.from_env(model)
+
+async def myAgent(user_input, bypass_cache=False):
+    registry.load_overrides(INSTRUCTIONS_FILE)
+    Agent1 = registry.get("Assistant")
+
+    if cache is not None:
+        return await cache.run(Agent1, user_input, bypass=bypass_cache)
 
     response = await Runner.run(
         Agent1,
         user_input,
     )
 
-    return response.final_output
\ No newline at end of file
+    return response.final_output
+
+async def myAgentStream(user_input):
+    """Like myAgent, but yields ("token", text) events as the answer is generated."""
+    registry.load_overrides(INSTRUCTIONS_FILE)
+    Agent1 = registry.get("Assistant")
+
+    if cache is not None:
+        key = cache_key(Agent1, user_input)
+        cached = await cache.get(key)
+        if cached is not None:
+            yield "token", cached
+            return
+
+    result = Runner.run_streamed(
+        Agent1,
+        user_input,
+    )
+    async for event in stream_events(result):
+        yield event
+
+    if cache is not None:
+        await cache.set(key, result.final_output)
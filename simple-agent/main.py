@@ -1,18 +1,55 @@
 #type:ignore
 import chainlit as cl
-from chatbot import myAgent
+from chatbot import myAgent, myAgentStream, new_memory
+from provider import warm_up
+from streaming import stream_to_message
+from session_store import open_store
+from metrics import install as install_metrics
 import asyncio 
 import os
 
 # ✅ Optional: Manually set PORT for Railway (Chainlit uses this if needed)
 port = int(os.environ.get("PORT", 8000))
 
+# Stream tokens into the reply as they arrive; STREAMING=0 waits for the full answer
+STREAMING = os.getenv("STREAMING", "1") == "1"
+
+# Prometheus histograms on http://127.0.0.1:9464/metrics (METRICS_PORT=0 turns it off)
+install_metrics()
+
+# Shared across workers and restarts when SESSION_STORE is set, see session_store.py
+store = open_store()
+
+async def session_memory():
+    """This chat's memory; on another worker or after a restart it is loaded from the store."""
+    memory = cl.user_session.get("memory")
+    if memory is None:
+        memory = new_memory()
+        if store is not None:
+            key = cl.context.session.thread_id
+            state = await store.load(key)
+            if state:
+                memory.restore(state)
+            memory.on_change = lambda m: store.save(key, m.snapshot())
+        cl.user_session.set("memory", memory)
+    return memory
+
 @cl.on_chat_start
 async def chat_start():
     await cl.Message("Hello How I can Help you?").send()
+    # Earlier turns of this chat, kept inside a token budget (see memory.py)
+    await session_memory()
+    # Open pooled connections while the user reads the greeting
+    await warm_up()
 
 @cl.on_message
 async def main(message: cl.Message):
     user_input = message.content
-    response = await myAgent(user_input)  # ✅ asyncio.run hata diya
-    await cl.Message(content=f"{response}").send() 
\ No newline at end of file
+    memory = await session_memory()
+    turn_input = memory.input_for(user_input)
+    if STREAMING:
+        response = await stream_to_message(myAgentStream(turn_input), cl.Message(content=""))
+    else:
+        response = await myAgent(turn_input)  # ✅ asyncio.run hata diya
+        await cl.Message(content=f"{response}").send()
+    memory.add(user_input, response)
@@ -0,0 +1,199 @@
+#type:ignore
+"""Per-session conversation memory that keeps the prompt inside a token budget.
+
+Recent turns are sent verbatim. Once they outgrow their share of the
+budget, the oldest ones move out of the prompt straight away and are folded
+into a running summary in the background, after the reply has gone out, so
+the next turn never waits for it. Until a fold finishes, a cheap local
+digest of the moved-out turns stands in for it.
+
+Turns are small __slots__ records and over-long messages are clipped when
+stored (the message being answered is always sent whole), so a session holds at most about MEMORY_BUDGET_TOKENS * 4
+characters however long the conversation gets.
+
+    MEMORY_BUDGET_TOKENS    history sent with each message (summary + recent turns)  (1500)
+    MEMORY_SUMMARY_TOKENS   of which the running summary may use                     (300)
+    MEMORY_SUMMARIZER       "model" folds with the chat model, "local" never calls it (model)
+
+Tokens are estimated as characters / 4, like rate_limit.py.
+"""
+import asyncio
+import logging
+import os
+import re
+
+from agents import Agent, ModelSettings, Runner
+
+logger = logging.getLogger(__name__)
+
+BUDGET_TOKENS = int(os.getenv("MEMORY_BUDGET_TOKENS", "1500"))
+SUMMARY_TOKENS = int(os.getenv("MEMORY_SUMMARY_TOKENS", "300"))
+SUMMARIZER = os.getenv("MEMORY_SUMMARIZER", "model")
+
+_SENTENCE = re.compile(r"(?<=[.!?])\s")
+
+
+def count_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def clip(text: str, tokens: int) -> str:
+    """Keep the start and end of text so it fits in about `tokens` tokens."""
+    limit = tokens * 4
+    if len(text) <= limit:
+        return text
+    half = max(limit // 2 - 3, 0)
+    return text[:half] + " … " + text[len(text) - half:]
+
+
+class Turn:
+    __slots__ = ("role", "text", "tokens")
+
+    def __init__(self, role: str, text: str):
+        self.role = role
+        self.text = text
+        self.tokens = count_tokens(text)
+
+
+def local_digest(summary: str, turns, tokens: int) -> str:
+    """First sentence of each turn appended to the summary, oldest dropped to fit."""
+    lines = [summary] if summary else []
+    for turn in turns:
+        first = _SENTENCE.split(turn.text.strip(), 1)[0]
+        lines.append(f"{turn.role}: {clip(first, 40)}")
+    text = "\n".join(lines)
+    limit = tokens * 4
+    return text[len(text) - limit:].lstrip() if len(text) > limit else text
+
+
+def model_summarizer(model, tokens=SUMMARY_TOKENS):
+    """async (summary, turns) -> new summary, written by `model`."""
+    agent = Agent(
+        name="Summarizer",
+        instructions=(
+            "You maintain a running summary of a conversation. Merge the new turns into the "
+            f"existing summary. Keep names, numbers, decisions and open questions. "
+            f"Answer with the summary only, under {tokens * 3 // 4} words."
+        ),
+        model=model,
+        model_settings=ModelSettings(max_tokens=tokens * 2, include_usage=True),
+    )
+
+    async def summarize(summary: str, turns) -> str:
+        text = "\n".join(f"{t.role}: {t.text}" for t in turns)
+        result = await Runner.run(agent, f"Existing summary:\n{summary or '(none)'}\n\nNew turns:\n{text}")
+        return str(result.final_output).strip()
+
+    return summarize
+
+
+class ConversationMemory:
+    def __init__(self, summarize=None, budget_tokens=BUDGET_TOKENS, summary_tokens=SUMMARY_TOKENS):
+        self.summarize = summarize
+        self.summary_tokens = summary_tokens
+        self.recent_tokens = budget_tokens - summary_tokens
+        # a single message may take half the recent share, so at least two turns fit
+        self.turn_tokens = self.recent_tokens // 2
+        self.summary = ""
+        self.recent: list[Turn] = []
+        self._recent_total = 0
+        self._pending: list[Turn] = []  # out of the prompt, not yet in the summary
+        self._fold: asyncio.Task | None = None
+        self.turns = 0
+        self.folds = 0
+        # called with the memory after each exchange and each fold, e.g. to save it
+        self.on_change = None
+
+    @classmethod
+    def from_env(cls, model=None):
+        summarize = model_summarizer(model) if model is not None and SUMMARIZER == "model" else None
+        return cls(summarize)
+
+    def input_for(self, user_text: str) -> list:
+        """Runner input: summary, recent turns, then the new message, unclipped."""
+        items = []
+        summary = self.summary
+        if self._pending:
+            summary = local_digest(summary, self._pending, self.summary_tokens)
+        if summary:
+            items.append({"role": "system", "content": f"Summary of the earlier conversation:\n{summary}"})
+        items.extend({"role": t.role, "content": t.text} for t in self.recent)
+        # only the copy kept in recent is clipped (in add); the model gets all of this one
+        items.append({"role": "user", "content": user_text})
+        return items
+
+    def add(self, user_text: str, reply: str):
+        """Record one exchange and schedule a background fold if turns were moved out."""
+        for role, text in (("user", user_text), ("assistant", str(reply))):
+            turn = Turn(role, clip(text, self.turn_tokens))
+            self.recent.append(turn)
+            self._recent_total += turn.tokens
+        self.turns += 1
+        if self._recent_total > self.recent_tokens:
+            # trim to 3/4 of the share so a fold (one summarizer call) covers several exchanges
+            while self._recent_total > self.recent_tokens * 3 // 4:
+                turn = self.recent.pop(0)
+                self._recent_total -= turn.tokens
+                self._pending.append(turn)
+        self._schedule_fold()
+        if self.on_change is not None:
+            self.on_change(self)
+
+    def _schedule_fold(self):
+        if self._pending and (self._fold is None or self._fold.done()):
+            self._fold = asyncio.get_running_loop().create_task(self._fold_pending())
+
+    async def _fold_pending(self):
+        while self._pending:
+            # turns stay pending (and in the local digest) until their fold lands
+            turns = list(self._pending)
+            summary = None
+            if self.summarize is not None:
+                try:
+                    summary = await self.summarize(self.summary, turns)
+                except Exception:
+                    logger.warning("summary fold failed, using a local digest", exc_info=True)
+            if summary:
+                summary = clip(summary, self.summary_tokens)
+            else:
+                summary = local_digest(self.summary, turns, self.summary_tokens)
+            self.summary = summary
+            del self._pending[:len(turns)]
+            self.folds += 1
+            if self.on_change is not None:
+                self.on_change(self)
+
+    def snapshot(self) -> dict:
+        """Plain-JSON state for a session store."""
+        return {
+            "summary": self.summary,
+            "recent": [[t.role, t.text] for t in self.recent],
+            "pending": [[t.role, t.text] for t in self._pending],
+            "turns": self.turns,
+            "folds": self.folds,
+        }
+
+    def restore(self, state: dict):
+        """Load a snapshot(); pending turns are folded again in the background."""
+        self.summary = state.get("summary", "")
+        self.recent = [Turn(role, text) for role, text in state.get("recent", ())]
+        self._recent_total = sum(t.tokens for t in self.recent)
+        self._pending = [Turn(role, text) for role, text in state.get("pending", ())]
+        self.turns = state.get("turns", 0)
+        self.folds = state.get("folds", 0)
+        self._schedule_fold()
+
+    async def flush(self):
+        """Wait for a running fold, e.g. before saving the session."""
+        if self._fold is not None:
+            await self._fold
+
+    def stats(self) -> dict:
+        return {
+            "turns": self.turns,
+            "recent_turns": len(self.recent),
+            "recent_tokens": self._recent_total,
+            "summary_tokens": count_tokens(self.summary) if self.summary else 0,
+            "pending_turns": len(self._pending),
+            "folds": self.folds,
+        }
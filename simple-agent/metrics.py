@@ -0,0 +1,184 @@
+#type:ignore
+"""Per-stage timing histograms, served in Prometheus text format on /metrics.
+
+install() swaps the SDK's trace exporter for MetricsProcessor, so spans stay
+in this process and only feed the histograms below; nothing is sent to the
+OpenAI tracing backend. Recorded:
+
+    agent_model_call_seconds{model}            each chat-completions call
+    agent_time_to_first_token_seconds          streamed replies (from streaming.py)
+    agent_tool_seconds{tool}                   each function tool call
+    agent_guardrail_seconds{guardrail,tripped} each guardrail check
+    agent_handoffs_per_run                     handoff hops in one Runner run
+    agent_run_seconds                          one Runner run, end to end
+    agent_input_tokens{model} / agent_output_tokens{model}  per model call
+
+The endpoint is a small HTTP server on METRICS_HOST:METRICS_PORT
+(127.0.0.1:9464 by default, METRICS_PORT=0 turns it off), separate from the
+Chainlit port so it isn't exposed with the app.
+"""
+import bisect
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from agents import set_trace_processors, set_tracing_disabled
+from agents.tracing import TracingProcessor
+
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9464"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+TOKEN_BUCKETS = (16, 64, 256, 1024, 4096, 16384, 65536)
+HOP_BUCKETS = (0, 1, 2, 3, 5, 8)
+
+
+class Histogram:
+    def __init__(self, name: str, help: str, buckets, labels=()):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(buckets)
+        self.labels = tuple(labels)
+        self._series: dict[tuple, list] = {}  # label values -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        i = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            if i < len(self.buckets):
+                series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {k: list(v) for k, v in self._series.items()}
+        for label_values, series in sorted(snapshot.items()):
+            base = ",".join(f'{k}="{_escape(v)}"' for k, v in zip(self.labels, label_values))
+            sep = "," if base else ""
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{base}{sep}le="{bound}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{base}{sep}le="+Inf"}} {series[-1]}')
+            suffix = f"{{{base}}}" if base else ""
+            lines.append(f"{self.name}_sum{suffix} {series[-2]}")
+            lines.append(f"{self.name}_count{suffix} {series[-1]}")
+        return lines
+
+    def summary(self) -> dict:
+        """{label values: (count, mean seconds)} for quick printing."""
+        with self._lock:
+            return {k: (v[-1], v[-2] / v[-1]) for k, v in self._series.items() if v[-1]}
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+model_call_seconds = Histogram("agent_model_call_seconds", "Model call latency.", LATENCY_BUCKETS, ("model",))
+time_to_first_token_seconds = Histogram(
+    "agent_time_to_first_token_seconds", "Time to the first streamed token.", LATENCY_BUCKETS)
+tool_seconds = Histogram("agent_tool_seconds", "Function tool execution time.", LATENCY_BUCKETS, ("tool",))
+guardrail_seconds = Histogram(
+    "agent_guardrail_seconds", "Guardrail check latency.", LATENCY_BUCKETS, ("guardrail", "tripped"))
+handoffs_per_run = Histogram("agent_handoffs_per_run", "Handoff hops in one run.", HOP_BUCKETS)
+run_seconds = Histogram("agent_run_seconds", "Whole Runner run latency.", LATENCY_BUCKETS)
+input_tokens = Histogram("agent_input_tokens", "Input tokens per model call.", TOKEN_BUCKETS, ("model",))
+output_tokens = Histogram("agent_output_tokens", "Output tokens per model call.", TOKEN_BUCKETS, ("model",))
+
+ALL = (model_call_seconds, time_to_first_token_seconds, tool_seconds, guardrail_seconds,
+       handoffs_per_run, run_seconds, input_tokens, output_tokens)
+
+
+def render() -> str:
+    return "\n".join(line for histogram in ALL for line in histogram.render()) + "\n"
+
+
+class MetricsProcessor(TracingProcessor):
+    """Turns SDK spans into histogram samples."""
+
+    def __init__(self):
+        self._started: dict[str, float] = {}
+        self._runs: dict[str, list] = {}  # trace id -> [start, handoffs]
+
+    def on_trace_start(self, trace):
+        self._runs[trace.trace_id] = [time.perf_counter(), 0]
+
+    def on_trace_end(self, trace):
+        run = self._runs.pop(trace.trace_id, None)
+        if run is not None:
+            run_seconds.observe(time.perf_counter() - run[0])
+            handoffs_per_run.observe(run[1])
+
+    def on_span_start(self, span):
+        self._started[span.span_id] = time.perf_counter()
+
+    def on_span_end(self, span):
+        started = self._started.pop(span.span_id, None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        data = span.span_data
+        kind = data.type
+        if kind == "generation":
+            model = data.model or "unknown"
+            model_call_seconds.observe(elapsed, model)
+            if data.usage:
+                input_tokens.observe(data.usage.get("input_tokens", 0), model)
+                output_tokens.observe(data.usage.get("output_tokens", 0), model)
+        elif kind == "function":
+            tool_seconds.observe(elapsed, data.name)
+        elif kind == "guardrail":
+            guardrail_seconds.observe(elapsed, data.name, str(data.triggered).lower())
+        elif kind == "handoff":
+            run = self._runs.get(span.trace_id)
+            if run is not None:
+                run[1] += 1
+
+    def shutdown(self):
+        pass
+
+    def force_flush(self):
+        pass
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?", 1)[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = render().encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # scrapes every few seconds would flood the app log
+
+
+_processor: MetricsProcessor | None = None
+_server: ThreadingHTTPServer | None = None
+
+
+def install(serve=True) -> MetricsProcessor:
+    """Record spans locally (replacing the default exporter) and start the /metrics server once."""
+    global _processor, _server
+    if _processor is None:
+        _processor = MetricsProcessor()
+        set_trace_processors([_processor])
+        set_tracing_disabled(False)
+    if serve and METRICS_PORT and _server is None:
+        try:
+            _server = ThreadingHTTPServer((METRICS_HOST, METRICS_PORT), _Handler)
+        except OSError:
+            return _processor  # port taken, e.g. a second worker on the same host
+        threading.Thread(target=_server.serve_forever, name="metrics", daemon=True).start()
+    return _processor
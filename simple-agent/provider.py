@@ -0,0 +1,195 @@
+#type:ignore
+"""One pooled Gemini (OpenAI-compatible) client per process.
+
+Every entry point gets its AsyncOpenAI client and chat-completions model from
+here instead of building its own, so all agents share a single HTTP
+connection pool. Tune it with environment variables:
+
+    GEMINI_BASE_URL          override the endpoint (e.g. a local stub)
+    HTTP_MAX_CONNECTIONS     total connections in the pool          (100)
+    HTTP_MAX_KEEPALIVE       idle connections kept open             (20)
+    HTTP_KEEPALIVE_EXPIRY    seconds an idle connection is kept     (30)
+    HTTP2                    "1" to negotiate HTTP/2 (needs the h2 package)
+    HTTP_WARMUP_CONNECTIONS  connections opened by warm_up()        (2)
+
+Models are wrapped in the process-wide rate limiter, see rate_limit.py, and
+tool schemas are sent pre-rendered, see tool_payload.py.
+"""
+import asyncio
+import os
+import time
+
+import httpx
+from dotenv import load_dotenv
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from agents import OpenAIChatCompletionsModel
+from agents import _debug as agents_debug
+
+import rate_limit
+import tool_payload
+
+load_dotenv()
+
+BASE_URL = os.getenv("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com/v1beta/openai/")
+MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+MAX_KEEPALIVE = int(os.getenv("HTTP_MAX_KEEPALIVE", "20"))
+KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))
+HTTP2 = os.getenv("HTTP2", "0") == "1"
+WARMUP_CONNECTIONS = int(os.getenv("HTTP_WARMUP_CONNECTIONS", "2"))
+
+# The SDK formats every request's messages and tools into a debug string (json.dumps with
+# indent) whether or not debug logging is on; skip that unless it was asked for explicitly.
+if os.getenv("OPENAI_AGENTS_DONT_LOG_MODEL_DATA") is None:
+    agents_debug.DONT_LOG_MODEL_DATA = True
+
+
+class PoolStatsTransport(httpx.AsyncBaseTransport):
+    """Wraps the pooled transport to time how long requests wait for a connection.
+
+    Wait time runs from the request entering the pool until it either starts
+    opening a new connection or starts writing to a reused one.
+
+    Pooled connections belong to the event loop that opened them, so scripts
+    that call asyncio.run() (or Runner.run_sync) more than once get a fresh
+    pool for each new loop instead of a "bound to a different event loop" error.
+    """
+
+    def __init__(self, make_inner):
+        self._make_inner = make_inner
+        self._inner = make_inner()
+        self._loop = None
+        self.requests = 0
+        self.new_connections = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    async def handle_async_request(self, request):
+        start = time.perf_counter()
+        waited = False
+        outer_trace = request.extensions.get("trace")
+
+        async def trace(event_name, info):
+            nonlocal waited
+            if not waited and event_name.endswith(("connect_tcp.started", "send_request_headers.started")):
+                waited = True
+                wait = time.perf_counter() - start
+                self.wait_total += wait
+                self.wait_max = max(self.wait_max, wait)
+                if event_name.endswith("connect_tcp.started"):
+                    self.new_connections += 1
+            if outer_trace is not None:
+                await outer_trace(event_name, info)
+
+        request.extensions["trace"] = trace
+        self.requests += 1
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            if self._loop is not None:
+                # the old loop is gone or busy elsewhere; its sockets can't be closed from here
+                self._inner = self._make_inner()
+            self._loop = loop
+        return await self._inner.handle_async_request(request)
+
+    async def aclose(self):
+        await self._inner.aclose()
+
+    def stats(self) -> dict:
+        # httpcore has no public pool API; fall back to zeros if the internals move
+        connections = getattr(getattr(self._inner, "_pool", None), "connections", [])
+        idle = sum(1 for c in connections if c.is_idle())
+        return {
+            "connections": len(connections),
+            "in_use": len(connections) - idle,
+            "idle": idle,
+            "requests": self.requests,
+            "new_connections": self.new_connections,
+            "reused": self.requests - self.new_connections,
+            "wait_ms_avg": self.wait_total / self.requests * 1000 if self.requests else 0.0,
+            "wait_ms_max": self.wait_max * 1000,
+        }
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+_transport: PoolStatsTransport | None = None
+_client: AsyncOpenAI | None = None
+_models: dict = {}
+
+
+def build_transport(
+    max_connections=MAX_CONNECTIONS,
+    max_keepalive=MAX_KEEPALIVE,
+    keepalive_expiry=KEEPALIVE_EXPIRY,
+    http2=HTTP2,
+) -> PoolStatsTransport:
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive,
+        keepalive_expiry=keepalive_expiry,
+    )
+    return PoolStatsTransport(
+        lambda: httpx.AsyncHTTPTransport(limits=limits, http2=http2 and _http2_available())
+    )
+
+
+def build_client(transport: httpx.AsyncBaseTransport, base_url=BASE_URL, api_key=None, max_retries=2,
+                 cache_tools=tool_payload.ENABLED) -> AsyncOpenAI:
+    if cache_tools:
+        transport = tool_payload.ToolSplicingTransport(transport)
+    client = AsyncOpenAI(
+        api_key=api_key or os.getenv("GEMINI_API_KEY"),
+        base_url=base_url,
+        max_retries=max_retries,
+        http_client=DefaultAsyncHttpxClient(transport=transport),
+    )
+    if cache_tools:
+        tool_payload.install(client)
+    return client
+
+
+def get_client() -> AsyncOpenAI:
+    """The process-wide client. Built on first use."""
+    global _client, _transport
+    if _client is None:
+        if not os.getenv("GEMINI_API_KEY"):
+            raise ValueError("GEMINI_API_KEY is not set. Please ensure it is defined in your .env file.")
+        _transport = build_transport()
+        # with the limiter on, it does the retrying so every caller backs off together
+        _client = build_client(_transport, max_retries=0 if rate_limit.ENABLED else 2)
+    return _client
+
+
+def get_model(model_name="gemini-2.0-flash"):
+    model = _models.get(model_name)
+    if model is None:
+        model = OpenAIChatCompletionsModel(model=model_name, openai_client=get_client())
+        if rate_limit.ENABLED:
+            model = rate_limit.RateLimitedModel(model, rate_limit.get_limiter())
+        _models[model_name] = model
+    return model
+
+
+async def warm_up(connections=WARMUP_CONNECTIONS):
+    """Open connections ahead of the first real request (a cheap GET /models each).
+
+    Only tops the pool up to `connections` idle ones, so calling it again is cheap.
+    """
+    client = get_client()
+    missing = connections - pool_stats()["idle"]
+    if missing <= 0:
+        return
+    # Any HTTP answer, even an error, leaves a live connection behind
+    await asyncio.gather(*(client.models.list() for _ in range(missing)), return_exceptions=True)
+
+
+def pool_stats() -> dict:
+    if _transport is None:
+        return {"connections": 0, "in_use": 0, "idle": 0, "requests": 0, "new_connections": 0,
+                "reused": 0, "wait_ms_avg": 0.0, "wait_ms_max": 0.0}
+    return _transport.stats()
@@ -0,0 +1,201 @@
+#type:ignore
+"""Opt-in cache in front of Runner.run for repeated prompts.
+
+Keyed by a stable hash of the input and of everything about the agent that
+can change its answer: model, model settings, output type, instructions,
+tools, and the agents it hands off to (for AgentRegistry agents, the
+registry's config_hash of the whole graph). Entries live in an in-memory LRU with a TTL and a size
+cap; with a db_path they are also written to SQLite so they survive a
+restart. Only JSON-serializable final outputs are cached.
+
+    RESPONSE_CACHE=1               turn the cache on in chatbot.py
+    RESPONSE_CACHE_SIZE            max in-memory entries          (1024)
+    RESPONSE_CACHE_TTL             seconds an entry stays valid   (3600)
+    RESPONSE_CACHE_DB              SQLite file for the disk tier  (off)
+"""
+import asyncio
+import dataclasses
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+from agents import Agent, Runner
+
+
+def _model_name(agent) -> str:
+    model = agent.model
+    if model is None or isinstance(model, str):
+        return model or ""
+    return getattr(model, "model", type(model).__name__)
+
+
+def _settings(agent) -> dict:
+    settings = agent.model_settings
+    return dataclasses.asdict(settings) if dataclasses.is_dataclass(settings) else {"repr": repr(settings)}
+
+
+def _output_type(agent) -> str:
+    output_type = agent.output_type
+    if output_type is None:
+        return ""
+    if isinstance(output_type, type):
+        return f"{output_type.__module__}.{output_type.__qualname__}"
+    return repr(output_type)
+
+
+def _describe(agent, seen: set) -> dict | str:
+    """Everything about an agent that can change its answer, handoff targets included."""
+    if id(agent) in seen:
+        return agent.name  # handoff cycle: already described higher up
+    seen = seen | {id(agent)}
+    instructions = agent.instructions if isinstance(agent.instructions, str) else repr(agent.instructions)
+    handoffs = []
+    for h in agent.handoffs:
+        if isinstance(h, Agent):
+            handoffs.append(_describe(h, seen))
+        else:
+            # Handoff objects don't expose their target; registry agents are
+            # covered by config_hash below, others by what the model sees
+            handoffs.append([h.agent_name, h.tool_name, h.tool_description, h.input_json_schema])
+    return {
+        "name": agent.name,
+        "model": _model_name(agent),
+        "model_settings": _settings(agent),
+        "output_type": _output_type(agent),
+        "instructions": instructions,
+        "tools": [[t.name, getattr(t, "params_json_schema", None)] for t in agent.tools],
+        "handoffs": handoffs,
+        # AgentRegistry's hash of this agent's spec and every spec it hands off to
+        "graph": getattr(agent, "config_hash", None),
+    }
+
+
+def cache_key(agent, input) -> str:
+    payload = {"agent": _describe(agent, set()), "input": input}
+    raw = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+class _DiskTier:
+    """SQLite table of key -> (expires_at, json value). Calls are blocking; run them off the loop."""
+
+    def __init__(self, path: str):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, expires_at REAL, value TEXT)"
+        )
+        self._db.commit()
+
+    def get(self, key: str):
+        with self._lock:
+            row = self._db.execute(
+                "SELECT expires_at, value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[0] < time.time():
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+                return None
+            return row
+
+    def set(self, key: str, expires_at: float, value: str):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?)", (key, expires_at, value)
+            )
+            self._db.commit()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+
+class ResponseCache:
+    def __init__(self, max_entries=1024, ttl=3600.0, db_path=None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._disk = _DiskTier(db_path) if db_path else None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_env(cls):
+        if os.getenv("RESPONSE_CACHE", "0") != "1":
+            return None
+        return cls(
+            max_entries=int(os.getenv("RESPONSE_CACHE_SIZE", "1024")),
+            ttl=float(os.getenv("RESPONSE_CACHE_TTL", "3600")),
+            db_path=os.getenv("RESPONSE_CACHE_DB") or None,
+        )
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _remember(self, key, expires_at, value):
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get(self, key: str):
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] >= time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return json.loads(entry[1])
+            del self._entries[key]
+            self.evictions += 1
+        if self._disk is not None:
+            row = await asyncio.to_thread(self._disk.get, key)
+            if row is not None:
+                self._remember(key, *row)
+                self.disk_hits += 1
+                return json.loads(row[1])
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, output):
+        try:
+            value = json.dumps(output)
+        except TypeError:
+            return  # structured outputs (pydantic models etc.) are not cached
+        expires_at = time.time() + self.ttl
+        self._remember(key, expires_at, value)
+        if self._disk is not None:
+            await asyncio.to_thread(self._disk.set, key, expires_at, value)
+
+    async def run(self, agent, input, *, bypass=False, **run_kwargs):
+        """Runner.run(...).final_output, served from cache when possible.
+
+        bypass=True always calls the model, and still refreshes the cache with the answer.
+        """
+        key = cache_key(agent, input)
+        if not bypass:
+            cached = await self.get(key)
+            if cached is not None:
+                return cached
+        result = await Runner.run(agent, input, **run_kwargs)
+        await self.set(key, result.final_output)
+        return result.final_output
+
+    def close(self):
+        if self._disk is not None:
+            self._disk.close()
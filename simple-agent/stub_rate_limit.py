@@ -0,0 +1,142 @@
+#type:ignore
+"""Check the rate limiter against a local stub that returns 429s.
+
+The stub is an OpenAI-compatible endpoint on localhost that accepts at most
+--server-rps requests per second and --server-concurrency at once; anything
+over that gets a 429 with Retry-After: 1. The same burst of --requests calls
+is sent twice:
+
+    unlimited  plain OpenAIChatCompletionsModel, client retries on (the old setup)
+    limited    RateLimitedModel with --rpm / --concurrency
+
+and each run prints how many calls succeeded, how many 429s the server sent
+and the limiter's stats. No API key or network is needed.
+
+    uv run stub_rate_limit.py
+    uv run stub_rate_limit.py --requests 300 --server-rps 40 --rpm 2000
+"""
+import argparse
+import asyncio
+import json
+import time
+
+from agents import ModelSettings, OpenAIChatCompletionsModel
+from agents.models.interface import ModelTracing
+
+import provider
+from rate_limit import RateLimitedModel, RateLimiter
+
+COMPLETION = json.dumps({
+    "id": "chatcmpl-stub",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "stub",
+    "choices": [{"index": 0, "finish_reason": "stop",
+                 "message": {"role": "assistant", "content": "ok"}}],
+    "usage": {"prompt_tokens": 20, "completion_tokens": 5, "total_tokens": 25},
+}).encode()
+TOO_MANY = json.dumps({"error": {"message": "Resource has been exhausted", "code": 429}}).encode()
+
+
+class StubServer:
+    def __init__(self, rps, concurrency, latency):
+        self.rps = rps
+        self.concurrency = concurrency
+        self.latency = latency
+        self.in_flight = 0
+        self.window_start = 0.0
+        self.window_count = 0
+        self.ok = 0
+        self.rejected = 0
+
+    def _admit(self) -> bool:
+        now = time.monotonic()
+        if now - self.window_start >= 1.0:
+            self.window_start, self.window_count = now, 0
+        if self.window_count >= self.rps or self.in_flight >= self.concurrency:
+            return False
+        self.window_count += 1
+        return True
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                await reader.readexactly(length)
+                if self._admit():
+                    self.in_flight += 1
+                    try:
+                        await asyncio.sleep(self.latency)
+                    finally:
+                        self.in_flight -= 1
+                    self.ok += 1
+                    status, extra, body = b"200 OK", b"", COMPLETION
+                else:
+                    self.rejected += 1
+                    status, extra, body = b"429 Too Many Requests", b"Retry-After: 1\r\n", TOO_MANY
+                writer.write(
+                    b"HTTP/1.1 %s\r\nContent-Type: application/json\r\n%sContent-Length: %d\r\n\r\n%s"
+                    % (status, extra, len(body), body)
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def burst(model, requests):
+    async def one(i):
+        try:
+            await model.get_response(
+                None, f"question {i}", ModelSettings(max_tokens=16), [], None, [], ModelTracing.DISABLED, None
+            )
+            return True
+        except Exception:
+            return False
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one(i) for i in range(requests)))
+    return sum(results), time.perf_counter() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--server-rps", type=int, default=50, help="requests/s the stub accepts")
+    parser.add_argument("--server-concurrency", type=int, default=20, help="calls the stub serves at once")
+    parser.add_argument("--latency-ms", type=float, default=50)
+    parser.add_argument("--rpm", type=float, default=2400, help="limiter requests/min")
+    parser.add_argument("--tpm", type=float, default=1_000_000, help="limiter tokens/min")
+    parser.add_argument("--burst-s", type=float, default=1.0, help="limiter burst window (the stub counts per second)")
+    parser.add_argument("--concurrency", type=int, default=64, help="limiter max in flight")
+    args = parser.parse_args()
+
+    for label in ("unlimited", "limited"):
+        stub = StubServer(args.server_rps, args.server_concurrency, args.latency_ms / 1000)
+        server = await asyncio.start_server(stub.handle, "127.0.0.1", 0)
+        base_url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/v1/"
+        async with server:
+            if label == "unlimited":
+                client = provider.build_client(provider.build_transport(), base_url=base_url, api_key="stub")
+                model = OpenAIChatCompletionsModel(model="stub", openai_client=client)
+                limiter = None
+            else:
+                client = provider.build_client(provider.build_transport(), base_url=base_url, api_key="stub",
+                                               max_retries=0)
+                limiter = RateLimiter(rpm=args.rpm, tpm=args.tpm, max_concurrency=args.concurrency,
+                                      burst_seconds=args.burst_s)
+                model = RateLimitedModel(OpenAIChatCompletionsModel(model="stub", openai_client=client), limiter)
+            succeeded, elapsed = await burst(model, args.requests)
+            await client.close()
+        print(f"{label:<9} {succeeded}/{args.requests} ok   {stub.rejected:4d} x 429 from the server   {elapsed:5.1f}s")
+        if limiter is not None:
+            print("          limiter:", limiter.stats())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
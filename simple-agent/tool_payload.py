@@ -0,0 +1,147 @@
+#type:ignore
+"""Pre-rendered `tools` section for chat-completions requests.
+
+The Agents SDK rebuilds the tools list (function tools + handoffs) on every
+model call, and the openai client then walks each JSON schema again to
+type-check it before encoding the body. Both repeat work whose result never
+changes: a function tool's schema is built once, when @function_tool
+decorates it, and handoffs made by the agent registry are built once too.
+
+ToolCachingCompletions takes the tools out of the typed parameters and
+replaces them with a short placeholder in extra_body, which the client
+passes through as-is. ToolSplicingTransport then swaps the placeholder for
+JSON bytes rendered once per distinct tool list. Tools are keyed by name,
+description and a digest of their schema's content, so an edited tool
+renders fresh, while a handoff the SDK rebuilds every turn (a bare Agent
+in handoffs=[...] gets a new schema dict each time) still hits. Digests
+are memoized by schema identity, so a schema object seen before isn't
+serialized again.
+
+    TOOL_PAYLOAD_CACHE   "0" sends tools the default way   (1)
+"""
+import hashlib
+import json
+import os
+import secrets
+from collections import OrderedDict
+
+import httpx
+from openai import NOT_GIVEN
+from openai.resources.chat.completions import AsyncCompletions
+
+ENABLED = os.getenv("TOOL_PAYLOAD_CACHE", "1") != "0"
+
+
+class ToolPayloadCache:
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        # id(schema) -> (schema, digest); holding the schema keeps its id from being reused
+        self._digests: OrderedDict[int, tuple] = OrderedDict()
+        # tool key -> rendered bytes
+        self._tools: OrderedDict[tuple, bytes] = OrderedDict()
+        # tuple of tool keys -> placeholder; placeholder -> rendered list
+        self._lists: OrderedDict[tuple, str] = OrderedDict()
+        self._payloads: dict[str, bytes] = {}
+        self._prefix = f"@@tools-{secrets.token_hex(6)}-"
+        self.hits = 0
+        self.misses = 0
+
+    def _digest(self, schema) -> str:
+        entry = self._digests.get(id(schema))
+        if entry is not None and entry[0] is schema:
+            self._digests.move_to_end(id(schema))
+            return entry[1]
+        digest = hashlib.sha1(json.dumps(schema, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+        self._digests[id(schema)] = (schema, digest)
+        if len(self._digests) > self.max_entries:
+            self._digests.popitem(last=False)
+        return digest
+
+    def _key(self, tool: dict) -> tuple:
+        fn = tool["function"]
+        return fn["name"], fn.get("description"), self._digest(fn.get("parameters")), fn.get("strict"), tool.get("type")
+
+    def _render_tool(self, key, tool) -> bytes:
+        rendered = self._tools.get(key)
+        if rendered is None:
+            rendered = self._tools[key] = json.dumps(tool, ensure_ascii=False, separators=(",", ":")).encode()
+            if len(self._tools) > self.max_entries:
+                self._tools.popitem(last=False)
+        else:
+            self._tools.move_to_end(key)
+        return rendered
+
+    def placeholder(self, tools: list) -> str:
+        """A placeholder string standing for this list of tool params."""
+        keys = tuple(self._key(tool) for tool in tools)
+        token = self._lists.get(keys)
+        if token is not None:
+            self._lists.move_to_end(keys)
+            self.hits += 1
+            return token
+        self.misses += 1
+        token = f"{self._prefix}{self.misses}@@"
+        self._payloads[token] = b"[" + b",".join(self._render_tool(k, t) for k, t in zip(keys, tools)) + b"]"
+        self._lists[keys] = token
+        if len(self._lists) > self.max_entries:
+            _, old = self._lists.popitem(last=False)
+            del self._payloads[old]
+        return token
+
+    def splice(self, body: bytes) -> bytes | None:
+        """body with its placeholder replaced by the rendered tools, or None if it has none."""
+        marker = b'"' + self._prefix.encode()
+        start = body.find(marker)
+        if start < 0:
+            return None
+        end = body.index(b'"', start + 1) + 1
+        payload = self._payloads.get(body[start + 1:end - 1].decode())
+        if payload is None:
+            return None
+        return body[:start] + payload + body[end:]
+
+    def stats(self) -> dict:
+        return {"tool_lists": len(self._lists), "tools": len(self._tools), "hits": self.hits, "misses": self.misses}
+
+
+class ToolCachingCompletions(AsyncCompletions):
+    """client.chat.completions that sends tools through the cache."""
+
+    def __init__(self, client, cache: "ToolPayloadCache | None" = None):
+        super().__init__(client)
+        self._cache = cache if cache is not None else tool_payloads
+
+    async def create(self, *, tools=NOT_GIVEN, extra_body=None, **kwargs):
+        if tools:
+            extra_body = {**(extra_body or {}), "tools": self._cache.placeholder(list(tools))}
+            tools = NOT_GIVEN
+        return await super().create(tools=tools, extra_body=extra_body, **kwargs)
+
+
+class ToolSplicingTransport(httpx.AsyncBaseTransport):
+    """Puts the pre-rendered tools into request bodies on their way out."""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, cache: "ToolPayloadCache | None" = None):
+        self._inner = inner
+        self._cache = cache if cache is not None else tool_payloads
+
+    async def handle_async_request(self, request):
+        if request.method == "POST":
+            body = self._cache.splice(request.content)
+            if body is not None:
+                headers = [(k, v) for k, v in request.headers.raw if k.lower() != b"content-length"]
+                request = httpx.Request(request.method, request.url, headers=headers, content=body,
+                                        extensions=request.extensions)
+        return await self._inner.handle_async_request(request)
+
+    async def aclose(self):
+        await self._inner.aclose()
+
+
+# process-wide, shared by every client built in provider.py
+tool_payloads = ToolPayloadCache()
+
+
+def install(client, cache: ToolPayloadCache | None = None) -> None:
+    """Route `client`'s chat completions through the cache; its transport must be a ToolSplicingTransport."""
+    client.chat.completions = ToolCachingCompletions(client, cache)